@@ -0,0 +1,4 @@
+"""
+Benchmarks of Devnet internals.
+Run with `poetry run python -m benchmark.<module_name>`.
+"""
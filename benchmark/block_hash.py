@@ -0,0 +1,111 @@
+"""
+Measures the block hash calculation of blocks with many events.
+Compares hashing the events one by one on the event loop (as cairo-lang does)
+with the batched calculation on the hashing pool, which should keep the event loop responsive.
+"""
+
+import asyncio
+import os
+import time
+
+from starkware.starknet.core.os.block_hash.block_hash import (
+    calculate_block_hash as cairo_lang_calculate_block_hash,
+)
+from starkware.starknet.core.os.block_hash.block_hash import calculate_event_hash
+from starkware.starknet.definitions.general_config import StarknetGeneralConfig
+from starkware.starknet.services.api.feeder_gateway.response_objects import Event
+
+from starknet_devnet.block_hash import calculate_block_hash
+
+N_EVENTS = [1_000, 10_000]
+EVENTS_PER_TX = 10
+TICK_INTERVAL = 0.01
+
+TRANSFER_SELECTOR = 0x99CD8BDE557814842A3121E8DDFD433A539B8C9F14BF31EBF108D12E6196E9
+FEE_TOKEN_ADDRESS = 0x49D36570D4E46F48E99674BD3FCC84644DDD6B96F7C741B1562B82F9E004DC7
+
+
+def _create_block_info(n_events: int):
+    n_txs = n_events // EVENTS_PER_TX
+    events = [
+        Event(
+            from_address=FEE_TOKEN_ADDRESS,
+            keys=[TRANSFER_SELECTOR],
+            data=[0x1000 + i, 0x2000 + i, i, 0],
+        )
+        for i in range(n_events)
+    ]
+    block_info = {
+        "general_config": StarknetGeneralConfig(),
+        "parent_hash": 0x42,
+        "block_number": 1,
+        "global_state_root": bytes(32),
+        "sequencer_address": 0x123,
+        "block_timestamp": 1_000_000,
+        "tx_hashes": [0x5000 + i for i in range(n_txs)],
+        "tx_signatures": [[i, i + 1] for i in range(n_txs)],
+    }
+    return block_info, events
+
+
+async def _cairo_lang_block_hash(block_info, events):
+    event_hashes = [
+        calculate_event_hash(
+            from_address=event.from_address, keys=event.keys, data=event.data
+        )
+        for event in events
+    ]
+    return await cairo_lang_calculate_block_hash(
+        **block_info, event_hashes=event_hashes
+    )
+
+
+async def _batched_block_hash(block_info, events):
+    return await calculate_block_hash(**block_info, events=events)
+
+
+async def _measure(calculate, block_info, events):
+    """Return the calculation time and the longest event loop stall (in seconds)"""
+    max_stall = 0.0
+
+    async def tick():
+        nonlocal max_stall
+        while True:
+            before = time.perf_counter()
+            await asyncio.sleep(TICK_INTERVAL)
+            max_stall = max(max_stall, time.perf_counter() - before - TICK_INTERVAL)
+
+    ticker = asyncio.create_task(tick())
+    await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    block_hash = await calculate(block_info, events)
+    duration = time.perf_counter() - start
+
+    ticker.cancel()
+    return block_hash, duration, max_stall
+
+
+async def main():
+    """Calculate the hash of blocks with each number of events, both ways"""
+    print(f"cpu count: {os.cpu_count()}")
+    print("events | implementation | time [s] | max event loop stall [ms]")
+    for n_events in N_EVENTS:
+        block_info, events = _create_block_info(n_events)
+        hashes = set()
+        for name, calculate in [
+            ("cairo-lang", _cairo_lang_block_hash),
+            ("batched", _batched_block_hash),
+        ]:
+            block_hash, duration, max_stall = await _measure(
+                calculate, block_info, events
+            )
+            hashes.add(block_hash)
+            print(
+                f"{n_events:>6} | {name:>14} | {duration:>8.2f} | {max_stall * 1000:>25.1f}"
+            )
+        assert len(hashes) == 1, "Block hashes differ"
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
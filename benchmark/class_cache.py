@@ -0,0 +1,53 @@
+"""
+Measures repeated retrievals of the predeployed account class through RPC (`starknet_getClass`)
+and the feeder gateway (`get_class_by_hash`), with the class cache disabled and enabled.
+"""
+
+import asyncio
+import time
+
+from starknet_devnet.blueprints.rpc.classes import get_class
+from starknet_devnet.blueprints.rpc.utils import rpc_felt
+from starknet_devnet.blueprints.shared import get_serialized_class
+from starknet_devnet.devnet_config import DevnetConfig, parse_args
+from starknet_devnet.state import state
+
+N_RETRIEVALS = 50
+
+
+async def _measure(class_cache_size: str):
+    """Return the mean time (in milliseconds) of retrieving the class through RPC and the feeder gateway"""
+    await state.reset(
+        DevnetConfig(
+            parse_args(["--accounts", "1", "--class-cache-size", class_cache_size])
+        )
+    )
+    class_hash = int.from_bytes(
+        state.starknet_wrapper.config.account_class.hash_bytes, "big"
+    )
+
+    start = time.perf_counter()
+    for _ in range(N_RETRIEVALS):
+        await get_class(block_id="latest", class_hash=rpc_felt(class_hash))
+    rpc = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(N_RETRIEVALS):
+        contract_class = await state.starknet_wrapper.get_class_by_hash(class_hash)
+        get_serialized_class(class_hash, contract_class)
+    feeder_gateway = time.perf_counter() - start
+
+    return rpc / N_RETRIEVALS * 1000, feeder_gateway / N_RETRIEVALS * 1000
+
+
+async def main():
+    """Retrieve the class with the cache disabled and enabled"""
+    print(f"mean of {N_RETRIEVALS} retrievals of the account class")
+    print("class cache | getClass [ms] | get_class_by_hash [ms]")
+    for class_cache_size in ["0", "64"]:
+        rpc, feeder_gateway = await _measure(class_cache_size)
+        print(f"{class_cache_size:>7} MiB | {rpc:>13.2f} | {feeder_gateway:>22.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
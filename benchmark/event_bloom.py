@@ -0,0 +1,99 @@
+"""
+Measures event queries on a history of 100k blocks with sparse matches.
+Blocks of a fork origin are scanned: once when their bloom filters are created, after that only
+the blocks whose filters may match are fetched. Blocks of the devnet get their filters when stored,
+their events are looked up in the event index.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from starkware.starknet.business_logic.execution.objects import Event
+
+from starknet_devnet.blocks import DevnetBlocks
+from starknet_devnet.event_index import EventPosition
+from starknet_devnet.origin import NullOrigin
+
+N_BLOCKS = 100_000
+MATCH_INTERVAL = 1_000
+
+TRANSFER_SELECTOR = 0x99CD8BDE557814842A3121E8DDFD433A539B8C9F14BF31EBF108D12E6196E9
+FEE_TOKEN_ADDRESS = 0x49D36570D4E46F48E99674BD3FCC84644DDD6B96F7C741B1562B82F9E004DC7
+QUERIED_ADDRESS = 0x1234
+QUERIED_KEY = 0x5678
+
+
+def _create_block(block_number: int):
+    events = [
+        Event(
+            from_address=FEE_TOKEN_ADDRESS,
+            keys=[TRANSFER_SELECTOR],
+            data=[block_number, 0x42, 1, 0],
+        )
+    ]
+    if block_number % MATCH_INTERVAL == 0:
+        events.append(
+            Event(from_address=QUERIED_ADDRESS, keys=[QUERIED_KEY], data=[block_number])
+        )
+    return SimpleNamespace(
+        block_number=block_number,
+        block_hash=block_number,
+        transaction_receipts=[SimpleNamespace(events=events)],
+    )
+
+
+class _SyntheticOrigin(NullOrigin):
+    """Origin serving the synthetic blocks, counting the fetches"""
+
+    def __init__(self):
+        self.n_fetched = 0
+
+    async def get_block_by_number(self, block_number: int):
+        # each fetch is a request to the forked network, whose latency is not simulated
+        self.n_fetched += 1
+        return _create_block(block_number)
+
+    def get_number_of_blocks(self):
+        return N_BLOCKS
+
+
+async def _query(blocks: DevnetBlocks):
+    """Return the number of found events and the query time (in seconds)"""
+    start = time.perf_counter()
+    events = await blocks.find_events(
+        QUERIED_ADDRESS,
+        [QUERIED_KEY],
+        start=EventPosition(0, 0, 0),
+        to_block_number=N_BLOCKS - 1,
+    )
+    return len(events), time.perf_counter() - start
+
+
+async def main():
+    """
+    Query the events of the fork origin twice (cold and warm), and the same events stored in the devnet
+    """
+    print(f"{N_BLOCKS} blocks, 1 in {MATCH_INTERVAL} matching")
+    print("blocks | query | found events | fetched blocks | time [s]")
+
+    origin = _SyntheticOrigin()
+    origin_blocks = DevnetBlocks(origin)
+    for query in ["cold", "warm"]:
+        origin.n_fetched = 0
+        n_events, duration = await _query(origin_blocks)
+        print(
+            f"origin | {query:>8} | {n_events:>12} | {origin.n_fetched:>14} | {duration:>8.2f}"
+        )
+
+    devnet_blocks = DevnetBlocks(NullOrigin())
+    start = time.perf_counter()
+    for block_number in range(N_BLOCKS):
+        devnet_blocks.insert(_create_block(block_number), state_update=None)
+    print(f"devnet | storing (index and filters): {time.perf_counter() - start:.2f} s")
+    n_events, duration = await _query(devnet_blocks)
+    print(f"devnet | {'indexed':>8} | {n_events:>12} | {0:>14} | {duration:>8.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,62 @@
+"""
+Measures the import time of the server module with `python -X importtime`,
+in fresh interpreters. Importing should not create a starknet wrapper or parse the RPC specification.
+"""
+
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+IMPORTED_MODULE = "starknet_devnet.server"
+TRACKED_MODULES = [
+    IMPORTED_MODULE,
+    "starknet_devnet",
+    "starknet_devnet.state",
+    "starknet_devnet.starknet_wrapper",
+    "starknet_devnet.blueprints.rpc.schema",
+]
+N_RUNS = 5
+N_SLOWEST = 5
+
+
+def _measure_import() -> Dict[str, Tuple[int, int]]:
+    """Return the self and cumulative import times (in microseconds) by module"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {IMPORTED_MODULE}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_time, cumulative, module = line[len("import time:") :].split("|")
+        if self_time.strip().isdigit():
+            times[module.strip()] = (int(self_time), int(cumulative))
+    return times
+
+
+def main():
+    """Import the server module in fresh interpreters and report the fastest run"""
+    runs = [_measure_import() for _ in range(N_RUNS)]
+    fastest = min(runs, key=lambda times: times[IMPORTED_MODULE][1])
+
+    print(f"fastest of {N_RUNS} imports of {IMPORTED_MODULE}")
+    print("module                                | cumulative [ms]")
+    for module in TRACKED_MODULES:
+        print(f"{module:<37} | {fastest[module][1] / 1000:>15.1f}")
+
+    print(f"\n{N_SLOWEST} slowest Devnet modules | self [ms]")
+    devnet_modules = [
+        module for module in fastest if module.startswith("starknet_devnet")
+    ]
+    for module in sorted(devnet_modules, key=lambda module: -fastest[module][0])[
+        :N_SLOWEST
+    ]:
+        print(f"{module:<37} | {fastest[module][0] / 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Measures 100 RPC reads sent as single requests and as one batch request, with and without
+read workers. Reads of a batch are handled concurrently, saving the per-request HTTP overhead.
+"""
+
+import subprocess
+import time
+
+import requests
+
+from starknet_devnet.blueprints.rpc.utils import rpc_felt
+from starknet_devnet.fee_token import FeeToken
+
+HOST = "127.0.0.1"
+PORT = "5099"
+URL = f"http://{HOST}:{PORT}"
+N_REQUESTS = 100
+N_ROUNDS = 5
+
+
+def _start_devnet(*args) -> subprocess.Popen:
+    # pylint: disable=consider-using-with
+    proc = subprocess.Popen(
+        ["starknet-devnet", "--host", HOST, "--port", PORT, "--accounts", "1", *args],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    while True:
+        try:
+            requests.get(f"{URL}/is_alive")
+            return proc
+        except requests.exceptions.ConnectionError:
+            time.sleep(0.5)
+
+
+def _create_payloads(account_address: int):
+    methods = [
+        (
+            "starknet_getNonce",
+            {"contract_address": rpc_felt(account_address), "block_id": "latest"},
+        ),
+        (
+            "starknet_getStorageAt",
+            {
+                "contract_address": rpc_felt(FeeToken.ADDRESS),
+                "key": "0x01",
+                "block_id": "latest",
+            },
+        ),
+        ("starknet_blockNumber", {}),
+    ]
+    return [
+        {
+            "jsonrpc": "2.0",
+            "method": methods[i % len(methods)][0],
+            "params": methods[i % len(methods)][1],
+            "id": i,
+        }
+        for i in range(N_REQUESTS)
+    ]
+
+
+def _measure(session: requests.Session, payloads) -> tuple:
+    """Return the time (in seconds) of sending the payloads one by one and as a batch"""
+    start = time.perf_counter()
+    for payload in payloads:
+        assert "result" in session.post(f"{URL}/rpc", json=payload).json()
+    singles = time.perf_counter() - start
+
+    start = time.perf_counter()
+    responses = session.post(f"{URL}/rpc", json=payloads).json()
+    batch = time.perf_counter() - start
+    assert [response["id"] for response in responses] == list(range(N_REQUESTS))
+
+    return singles, batch
+
+
+def main():
+    """Send the reads to a devnet without and with read workers"""
+    print(f"{N_REQUESTS} reads, best of {N_ROUNDS} rounds")
+    print("read workers | single requests [s] | batch [s] | speedup")
+    for read_workers in ["0", "2"]:
+        proc = _start_devnet("--read-workers", read_workers)
+        try:
+            with requests.Session() as session:
+                account = session.get(f"{URL}/predeployed_accounts").json()[0]
+                payloads = _create_payloads(int(account["address"], 16))
+                results = [_measure(session, payloads) for _ in range(N_ROUNDS)]
+        finally:
+            proc.terminate()
+            proc.wait()
+
+        singles = min(result[0] for result in results)
+        batch = min(result[1] for result in results)
+        print(
+            f"{read_workers:>12} | {singles:>19.3f} | {batch:>9.3f} | {singles / batch:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Measures the validation of the requests and responses of RPC methods against the specification.
+Building a validator on every validation (as `jsonschema.validate` does) is compared
+with reusing the validators compiled once per method and parameter.
+"""
+
+import asyncio
+import time
+
+from jsonschema import validate
+from starkware.starknet.public.abi import get_selector_from_name
+
+from starknet_devnet.blueprints.rpc.blocks import block_number
+from starknet_devnet.blueprints.rpc.call import call
+from starknet_devnet.blueprints.rpc.classes import get_class_at, get_class_hash_at
+from starknet_devnet.blueprints.rpc.misc import get_nonce
+from starknet_devnet.blueprints.rpc.schema import (
+    _assert_valid_rpc_request,
+    _assert_valid_rpc_schema,
+    _request_schemas_for_method,
+    _response_schema_for_method,
+)
+from starknet_devnet.blueprints.rpc.storage import get_storage_at
+from starknet_devnet.blueprints.rpc.utils import rpc_felt
+from starknet_devnet.devnet_config import DevnetConfig, parse_args
+from starknet_devnet.fee_token import FeeToken
+from starknet_devnet.state import state
+
+N_VALIDATIONS = 100
+
+
+def _create_params(account_address: int) -> dict:
+    """Return the parameters of each measured method"""
+    return {
+        "getStorageAt": {
+            "contract_address": rpc_felt(FeeToken.ADDRESS),
+            "key": "0x01",
+            "block_id": "latest",
+        },
+        "getNonce": {
+            "contract_address": rpc_felt(account_address),
+            "block_id": "latest",
+        },
+        "call": {
+            "request": {
+                "contract_address": rpc_felt(FeeToken.ADDRESS),
+                "entry_point_selector": rpc_felt(get_selector_from_name("balanceOf")),
+                "calldata": [rpc_felt(account_address)],
+            },
+            "block_id": "latest",
+        },
+        "blockNumber": {},
+        "getClassHashAt": {
+            "contract_address": rpc_felt(account_address),
+            "block_id": "latest",
+        },
+        "getClassAt": {
+            "contract_address": rpc_felt(account_address),
+            "block_id": "latest",
+        },
+    }
+
+
+METHODS = {
+    "getStorageAt": get_storage_at,
+    "getNonce": get_nonce,
+    "call": call,
+    "blockNumber": block_number,
+    "getClassHashAt": get_class_hash_at,
+    "getClassAt": get_class_at,
+}
+
+
+def _validate_rebuilding(method_name: str, params: dict, result):
+    schemas = _request_schemas_for_method("starknet_" + method_name)
+    for name, value in params.items():
+        validate(value, schemas[name])
+    validate(result, _response_schema_for_method("starknet_" + method_name))
+
+
+def _validate_compiled(method_name: str, params: dict, result):
+    _assert_valid_rpc_request(**params, method_name=method_name)
+    _assert_valid_rpc_schema(result, method_name)
+
+
+def _measure(validate_function, method_name: str, params: dict, result) -> float:
+    """Return the mean time (in milliseconds) of validating a request and its response"""
+    start = time.perf_counter()
+    for _ in range(N_VALIDATIONS):
+        validate_function(method_name, params, result)
+    return (time.perf_counter() - start) / N_VALIDATIONS * 1000
+
+
+async def main():
+    """Validate the request and the response of each method"""
+    await state.reset(DevnetConfig(parse_args(["--accounts", "1", "--seed", "42"])))
+    account = state.starknet_wrapper.accounts[0]
+    all_params = _create_params(account.address)
+
+    print(f"mean of {N_VALIDATIONS} validations of a request and its response")
+    print(
+        "method          | rebuilt validators [ms] | compiled validators [ms] | speedup"
+    )
+    for method_name, method in METHODS.items():
+        params = all_params[method_name]
+        result = await method(**params)
+
+        # the first validation compiles the validators
+        _validate_compiled(method_name, params, result)
+
+        rebuilding = _measure(_validate_rebuilding, method_name, params, result)
+        compiled = _measure(_validate_compiled, method_name, params, result)
+        print(
+            f"{method_name:<15} | {rebuilding:>23.3f} | {compiled:>24.3f} "
+            f"| {rebuilding / compiled:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,52 @@
+"""
+Measures the startup time of the devnet for different numbers of predeployed accounts.
+Account keys are derived in a process pool, so generation should scale with the number of cores.
+"""
+
+import asyncio
+import os
+import time
+
+from starknet_devnet.devnet_config import DevnetConfig, parse_args
+from starknet_devnet.starknet_wrapper import StarknetWrapper
+
+N_ACCOUNTS = [10, 100, 1000]
+
+
+async def _measure_startup(n_accounts: int):
+    """Return the time (in seconds) of generating the accounts and of initializing"""
+    config = DevnetConfig(
+        parse_args(
+            [
+                "--accounts",
+                str(n_accounts),
+                "--seed",
+                "42",
+                "--hide-predeployed-accounts",
+            ]
+        )
+    )
+
+    start = time.perf_counter()
+    starknet_wrapper = StarknetWrapper(config)
+    generated = time.perf_counter()
+    await starknet_wrapper.initialize()
+    initialized = time.perf_counter()
+
+    return generated - start, initialized - generated
+
+
+async def main():
+    """Start the devnet with each number of accounts"""
+    print(f"cpu count: {os.cpu_count()}")
+    print("accounts | generation [s] | initialization [s] | total [s]")
+    for n_accounts in N_ACCOUNTS:
+        generation, initialization = await _measure_startup(n_accounts)
+        print(
+            f"{n_accounts:>8} | {generation:>14.2f} | {initialization:>18.2f} "
+            f"| {generation + initialization:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,47 @@
+"""
+Measures the per-tx latency as the devnet state grows.
+With copy-on-write state layers, the latency should stay flat regardless of the number of storage slots.
+"""
+
+import asyncio
+import time
+
+from starknet_devnet.devnet_config import DevnetConfig
+from starknet_devnet.starknet_wrapper import StarknetWrapper
+
+N_STORAGE_SLOTS = 100_000
+CHECKPOINT_INTERVAL = 10_000
+TXS_PER_CHECKPOINT = 10
+
+DUMMY_ADDRESS = 0x1234
+MINT_RECIPIENT = 0x42
+
+
+async def _measure_tx_latency(starknet_wrapper: StarknetWrapper) -> float:
+    """Return the average latency (in seconds) of a mint tx"""
+    start = time.perf_counter()
+    for _ in range(TXS_PER_CHECKPOINT):
+        await starknet_wrapper.fee_token.mint(
+            to_address=MINT_RECIPIENT, amount=1, lite=False
+        )
+    return (time.perf_counter() - start) / TXS_PER_CHECKPOINT
+
+
+async def main():
+    """Grow the state in chunks and measure tx latency after each chunk"""
+    starknet_wrapper = StarknetWrapper(DevnetConfig())
+    await starknet_wrapper.initialize()
+
+    print("storage slots | avg tx latency [ms]")
+    for n_slots in range(0, N_STORAGE_SLOTS + 1, CHECKPOINT_INTERVAL):
+        if n_slots:
+            cached_state = starknet_wrapper.get_state().state
+            for key in range(n_slots - CHECKPOINT_INTERVAL, n_slots):
+                await cached_state.set_storage_at(DUMMY_ADDRESS, key, key + 1)
+
+        latency = await _measure_tx_latency(starknet_wrapper)
+        print(f"{n_slots:>13} | {latency * 1000:.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -12,6 +12,20 @@ from starkware.starknet.testing.starknet import Starknet
 from starknet_devnet.account_util import set_balance
 from starknet_devnet.contract_class_wrapper import ContractClassWrapper
 
+ACCOUNT_PUBLIC_KEY_SELECTOR = get_selector_from_name("Account_public_key")
+
+
+def calculate_account_address(public_key: int) -> int:
+    """Calculate the address of the account with `public_key`"""
+    # salt and class_hash have frozen values that make the constructor_calldata
+    # the only thing that affects the account address
+    return calculate_contract_address_from_hash(
+        salt=20,
+        class_hash=0x3FCBF77B28C96F4F2FB5BD2D176AB083A12A5E123ADEB0DE955D7EE228C9854,
+        constructor_calldata=[public_key],
+        deployer_address=0,
+    )
+
 
 class Account:
     """Account contract wrapper."""
@@ -24,20 +38,16 @@ class Account:
         public_key: int,
         initial_balance: int,
         account_class_wrapper: ContractClassWrapper,
+        address: int = None,
     ):
+        """`address` is calculated from `public_key` if not provided"""
         self.starknet_wrapper = starknet_wrapper
         self.private_key = private_key
         self.public_key = public_key
         self.contract_class = account_class_wrapper.contract_class
         self.class_hash_bytes = account_class_wrapper.hash_bytes
-
-        # salt and class_hash have frozen values that make the constructor_calldata
-        # the only thing that affects the account address
-        self.address = calculate_contract_address_from_hash(
-            salt=20,
-            class_hash=0x3FCBF77B28C96F4F2FB5BD2D176AB083A12A5E123ADEB0DE955D7EE228C9854,
-            constructor_calldata=[public_key],
-            deployer_address=0,
+        self.address = (
+            calculate_account_address(public_key) if address is None else address
         )
         self.initial_balance = initial_balance
 
@@ -60,7 +70,7 @@ class Account:
         await starknet.state.state.deploy_contract(self.address, self.class_hash_bytes)
 
         await starknet.state.state.set_storage_at(
-            self.address, get_selector_from_name("Account_public_key"), self.public_key
+            self.address, ACCOUNT_PUBLIC_KEY_SELECTOR, self.public_key
         )
 
         await set_balance(starknet.state, self.address, self.initial_balance)
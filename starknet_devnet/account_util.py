@@ -3,7 +3,7 @@ Utilities for OZ (not Starknet CLI) implementation of Starknet Account
 Latest changes based on https://github.com/OpenZeppelin/nile/pull/184
 """
 
-from typing import List, NamedTuple, Sequence, Tuple
+from typing import Dict, List, NamedTuple, Sequence, Tuple
 
 from starkware.cairo.lang.vm.crypto import pedersen_hash
 from starkware.crypto.signature.signature import sign
@@ -115,17 +115,22 @@ def _get_signature(message_hash: int, private_key: int) -> Tuple[str, str]:
     return [str(sig_r), str(sig_s)]
 
 
+def get_balance_storage_writes(
+    fee_token_address: int, address: int, balance: int
+) -> Dict[Tuple[int, int], int]:
+    """Return the fee token storage writes giving `address` the `balance`"""
+    balance_address = pedersen_hash(get_selector_from_name("ERC20_balances"), address)
+    balance_uint256 = Uint256.from_felt(balance)
+    return {
+        (fee_token_address, balance_address): balance_uint256.low,
+        (fee_token_address, balance_address + 1): balance_uint256.high,
+    }
+
+
 async def set_balance(state: StarknetState, address: int, balance: int):
     """Modify `state` so that `address` has `balance`"""
 
     fee_token_address = state.general_config.fee_token_address
-
-    balance_address = pedersen_hash(get_selector_from_name("ERC20_balances"), address)
-    balance_uint256 = Uint256.from_felt(balance)
-
-    await state.state.set_storage_at(
-        fee_token_address, balance_address, balance_uint256.low
-    )
-    await state.state.set_storage_at(
-        fee_token_address, balance_address + 1, balance_uint256.high
-    )
+    storage_writes = get_balance_storage_writes(fee_token_address, address, balance)
+    for (contract_address, key), value in storage_writes.items():
+        await state.state.set_storage_at(contract_address, key, value)
@@ -2,15 +2,40 @@
 Class representing list of predefined accounts
 """
 
+import os
 import random
 import sys
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
 
 from starkware.crypto.signature.signature import private_to_stark_key
 
-from .account import Account
+from .account import ACCOUNT_PUBLIC_KEY_SELECTOR, Account, calculate_account_address
+from .account_util import get_balance_storage_writes
 from .util import warn
 
+# deriving a key takes ~15ms, so smaller chunks are not worth starting a process for
+MIN_ACCOUNTS_PER_PROCESS = 20
+
+
+def _derive_account(private_key: int) -> Tuple[int, int]:
+    """Return the public key and the address of the account with `private_key`"""
+    public_key = private_to_stark_key(private_key)
+    return public_key, calculate_account_address(public_key)
+
+
+def _derive_accounts(private_keys: List[int]) -> List[Tuple[int, int]]:
+    """Return the public keys and the addresses of the accounts, derived in a process pool"""
+    n_processes = min(
+        os.cpu_count() or 1, len(private_keys) // MIN_ACCOUNTS_PER_PROCESS
+    )
+    if n_processes <= 1:
+        return [_derive_account(private_key) for private_key in private_keys]
+
+    with ProcessPoolExecutor(max_workers=n_processes) as executor:
+        chunk_size = -(-len(private_keys) // n_processes)
+        return list(executor.map(_derive_account, private_keys, chunksize=chunk_size))
+
 
 class Accounts:
     """Accounts wrapper"""
@@ -30,19 +55,43 @@ class Accounts:
         self.list = []
 
         self.__generate()
-        if (
-            starknet_wrapper.config.accounts
-            and not starknet_wrapper.config.hide_predeployed_accounts
-        ):
-            self.__print()
 
     def __getitem__(self, index):
         return self.list[index]
 
     async def deploy(self):
-        """deploy listed accounts"""
+        """
+        Deploy listed accounts and set their balances in a single batch of state writes.
+        The addresses are not checked, they are derived from distinct keys.
+        """
+        if not self.list:
+            return
+
+        state = self.starknet_wrapper.get_state()
+        account_class_wrapper = self.__account_class_wrapper
+        await state.state.set_contract_class(
+            account_class_wrapper.hash_bytes, account_class_wrapper.contract_class
+        )
+
+        address_to_class_hash = {}
+        storage_updates = {}
+        fee_token_address = state.general_config.fee_token_address
         for account in self.list:
-            await account.deploy()
+            address_to_class_hash[account.address] = account.class_hash_bytes
+            storage_updates[
+                (account.address, ACCOUNT_PUBLIC_KEY_SELECTOR)
+            ] = account.public_key
+            storage_updates.update(
+                get_balance_storage_writes(
+                    fee_token_address, account.address, account.initial_balance
+                )
+            )
+
+        state.state.cache.update_writes(
+            address_to_class_hash=address_to_class_hash,
+            address_to_nonce={},
+            storage_updates=storage_updates,
+        )
 
     def add(self, account):
         """append account to list"""
@@ -53,11 +102,13 @@ class Accounts:
         """Generates accounts without deploying them"""
         random_generator = random.Random()
         random_generator.seed(self.__seed)
+        private_keys = [
+            random_generator.getrandbits(128) for _ in range(self.__n_accounts)
+        ]
 
-        for _ in range(self.__n_accounts):
-            private_key = random_generator.getrandbits(128)
-            public_key = private_to_stark_key(private_key)
-
+        for private_key, (public_key, address) in zip(
+            private_keys, _derive_accounts(private_keys)
+        ):
             self.add(
                 Account(
                     self.starknet_wrapper,
@@ -65,10 +116,11 @@ class Accounts:
                     public_key=public_key,
                     initial_balance=self.__initial_balance,
                     account_class_wrapper=self.__account_class_wrapper,
+                    address=address,
                 )
             )
 
-    def __print(self):
+    def print_accounts(self):
         """stdout accounts list"""
         for idx, account in enumerate(self):
             print(f"Account #{idx}")
@@ -0,0 +1,205 @@
+"""
+Block hash calculation, equivalent to `calculate_block_hash` of cairo-lang.
+
+The Pedersen hashes of the events, the transaction signatures and the commitment trees
+are computed in batches with the C++ binding, on a pool of threads. The binding releases
+the GIL while hashing, so large blocks neither stall the event loop nor are limited to one core.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from crypto_cpp_py.cpp_bindings import cpp_hash
+from starkware.python.utils import from_bytes, safe_zip
+from starkware.starknet.definitions.general_config import StarknetGeneralConfig
+from starkware.starknet.services.api.feeder_gateway.response_objects import Event
+
+# a single hash takes ~0.1ms, so a batch of this many items outweighs the cost of scheduling it
+ITEMS_PER_BATCH = 32
+
+_HASH_POOL: ThreadPoolExecutor = None
+
+
+def _create_hash_pool():
+    global _HASH_POOL  # pylint: disable=global-statement
+    _HASH_POOL = ThreadPoolExecutor(
+        max_workers=os.cpu_count(), thread_name_prefix="block-hash"
+    )
+
+
+_create_hash_pool()
+# threads are not inherited by forked processes (e.g. the server workers)
+os.register_at_fork(after_in_child=_create_hash_pool)
+
+_Item = TypeVar("_Item")
+
+# a node of a Patricia tree: `None` if empty, otherwise (bottom hash, edge path, edge length)
+_Node = Optional[Tuple[int, int, int]]
+
+
+def _hash_chain(data: Sequence[int]) -> int:
+    """Same as `compute_hash_on_elements` of cairo-lang"""
+    result = 0
+    for element in data:
+        result = cpp_hash(result, element)
+    return cpp_hash(result, len(data))
+
+
+def _hash_pairs(pairs: Sequence[Tuple[int, int]]) -> List[int]:
+    return [cpp_hash(left, right) for left, right in pairs]
+
+
+def _calculate_event_hashes(events: Sequence[Event]) -> List[int]:
+    return [
+        _hash_chain(
+            [event.from_address, _hash_chain(event.keys), _hash_chain(event.data)]
+        )
+        for event in events
+    ]
+
+
+def _calculate_tx_hashes_with_signatures(
+    txs: Sequence[Tuple[int, List[int]]]
+) -> List[int]:
+    return [cpp_hash(tx_hash, _hash_chain(signature)) for tx_hash, signature in txs]
+
+
+async def _map_in_batches(
+    function: Callable[[Sequence[_Item]], List[int]], items: Sequence[_Item]
+) -> List[int]:
+    """Apply `function` to batches of `items` in the pool and return the concatenated results"""
+    loop = asyncio.get_running_loop()
+    batches = await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                _HASH_POOL, function, items[start : start + ITEMS_PER_BATCH]
+            )
+            for start in range(0, len(items), ITEMS_PER_BATCH)
+        )
+    )
+    return [result for batch in batches for result in batch]
+
+
+def _get_node_hash(node: Tuple[int, int, int], edge_hashes: Iterator[int]) -> int:
+    """Return the hash of `node`, taking the hash of its edge from `edge_hashes`"""
+    bottom, _, length = node
+    return next(edge_hashes) + length if length else bottom
+
+
+async def _calculate_patricia_root(leaves: Sequence[int], height: int) -> int:
+    """
+    Return the root of the Patricia tree of `height` whose leftmost leaves are `leaves`.
+    The tree is built bottom-up, hashing all the nodes of a level in one batch.
+    """
+    nodes: List[_Node] = [(leaf, 0, 0) if leaf else None for leaf in leaves]
+    for level in range(height):
+        if len(nodes) <= 1:
+            # the remaining ancestors of the only node are its left edge
+            if nodes and nodes[0] is not None:
+                bottom, path, length = nodes[0]
+                nodes = [(bottom, path, length + height - level)]
+            break
+
+        pairs = [
+            (nodes[i], nodes[i + 1] if i + 1 < len(nodes) else None)
+            for i in range(0, len(nodes), 2)
+        ]
+
+        # the edges of the siblings joined in a binary node are hashed first
+        edges = [
+            node
+            for left, right in pairs
+            if left and right
+            for node in (left, right)
+            if node[2]
+        ]
+        edge_hashes = iter(
+            await _map_in_batches(
+                _hash_pairs, [(bottom, path) for bottom, path, _ in edges]
+            )
+        )
+
+        binary_hashes = iter(
+            await _map_in_batches(
+                _hash_pairs,
+                [
+                    (
+                        _get_node_hash(left, edge_hashes),
+                        _get_node_hash(right, edge_hashes),
+                    )
+                    for left, right in pairs
+                    if left and right
+                ],
+            )
+        )
+
+        nodes = [
+            (next(binary_hashes), 0, 0)
+            if left and right
+            else (left[0], left[1], left[2] + 1)
+            if left
+            else (right[0], (1 << right[2]) | right[1], right[2] + 1)
+            if right
+            else None
+            for left, right in pairs
+        ]
+
+    if not nodes or nodes[0] is None:
+        return 0
+
+    bottom, path, length = nodes[0]
+    return cpp_hash(bottom, path) + length if length else bottom
+
+
+# pylint: disable=too-many-arguments
+async def calculate_block_hash(
+    general_config: StarknetGeneralConfig,
+    parent_hash: int,
+    block_number: int,
+    global_state_root: bytes,
+    sequencer_address: int,
+    block_timestamp: int,
+    tx_hashes: Sequence[int],
+    tx_signatures: Sequence[List[int]],
+    events: Sequence[Event],
+) -> int:
+    """
+    Calculate the block hash like `calculate_block_hash` of cairo-lang,
+    but from the events of the block instead of their hashes.
+    """
+    tx_final_hashes, event_hashes = await asyncio.gather(
+        _map_in_batches(
+            _calculate_tx_hashes_with_signatures,
+            list(safe_zip(tx_hashes, tx_signatures)),
+        ),
+        _map_in_batches(_calculate_event_hashes, events),
+    )
+
+    tx_commitment, event_commitment = await asyncio.gather(
+        _calculate_patricia_root(
+            tx_final_hashes, general_config.tx_commitment_tree_height
+        ),
+        _calculate_patricia_root(
+            event_hashes, general_config.event_commitment_tree_height
+        ),
+    )
+
+    return await asyncio.get_running_loop().run_in_executor(
+        _HASH_POOL,
+        _hash_chain,
+        [
+            block_number,
+            from_bytes(global_state_root),
+            sequencer_address,
+            block_timestamp,
+            len(tx_hashes),
+            tx_commitment,
+            len(event_hashes),
+            event_commitment,
+            0,  # protocol version
+            0,  # extra data
+            parent_hash,
+        ],
+    )
@@ -2,13 +2,16 @@
 Class for generating and handling blocks
 """
 
-from typing import Any, Dict, List, Optional, Sequence, Union
-
-from starkware.starknet.core.os.block_hash.block_hash import (
-    calculate_block_hash,
-    calculate_event_hash,
-)
+import asyncio
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from starkware.starknet.business_logic.execution.objects import Event
+from starkware.starknet.business_logic.transaction.objects import InternalTransaction
 from starkware.starknet.definitions.error_codes import StarknetErrorCode
+from starkware.starknet.definitions.general_config import StarknetGeneralConfig
 from starkware.starknet.services.api.feeder_gateway.response_objects import (
     LATEST_BLOCK_ID,
     PENDING_BLOCK_ID,
@@ -16,16 +19,40 @@ from starkware.starknet.services.api.feeder_gateway.response_objects import (
     BlockStateUpdate,
     BlockStatus,
     StarknetBlock,
+    TransactionExecution,
 )
 from starkware.starknet.testing.state import StarknetState
 from starkware.starkware_utils.error_handling import StarkErrorCode
 
 from starknet_devnet.constants import CAIRO_LANG_VERSION, DUMMY_STATE_ROOT
 
+from .block_hash import calculate_block_hash
+from .event_index import (
+    EventIndex,
+    EventPosition,
+    create_bloom_matcher,
+    create_event_bloom,
+)
+from .history import HistoryStore
 from .origin import Origin
 from .transactions import DevnetTransaction
 from .util import StarknetDevnetException
 
+# calculates the deferred block hashes one after another, so a parent's hash is known before its child's
+_DEFERRED_HASH_EXECUTOR: ThreadPoolExecutor = None
+
+
+def _create_deferred_hash_executor():
+    global _DEFERRED_HASH_EXECUTOR  # pylint: disable=global-statement
+    _DEFERRED_HASH_EXECUTOR = ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="deferred-block-hash"
+    )
+
+
+_create_deferred_hash_executor()
+# threads are not inherited by forked processes (e.g. the server workers)
+os.register_at_fork(after_in_child=_create_deferred_hash_executor)
+
 
 def _parse_block_hash(raw: Optional[str]):
     if raw is None:
@@ -61,19 +88,243 @@ def _parse_block_number(raw: Optional[Union[int, str]]) -> BlockIdentifier:
     )
 
 
+class _PendingBlock:
+    """
+    Append-only contents of the pending block.
+    Appending a transaction is O(1); the `StarknetBlock` is only created when read
+    and is reused until the next append.
+    """
+
+    def __init__(self, parent_block: Optional[StarknetBlock]):
+        self.__parent_block = parent_block
+        self.signatures: List[List[int]] = []
+        self.__transactions: List[InternalTransaction] = []
+        self.__receipts: List[TransactionExecution] = []
+        self.__header: Dict[str, Any] = {}
+        self.__block: Optional[StarknetBlock] = None
+
+    def __len__(self) -> int:
+        return len(self.__transactions)
+
+    @property
+    def receipts(self) -> List[TransactionExecution]:
+        """The receipts of the transactions appended so far"""
+        return self.__receipts
+
+    @property
+    def parent_block_hash(self) -> int:
+        """The hash of the parent block, waiting for it if it is still being calculated"""
+        return self.__parent_block.block_hash if self.__parent_block else 0
+
+    def append(self, transactions: List[DevnetTransaction], state: StarknetState):
+        """Append `transactions` and update the header to the current `state`"""
+        for transaction in transactions:
+            self.signatures.append(transaction.get_signature())
+            self.__transactions.append(transaction.internal_tx)
+            self.__receipts.append(transaction.get_execution())
+
+        self.__header = {
+            "timestamp": state.state.block_info.block_timestamp,
+            "gas_price": state.state.block_info.gas_price,
+            "sequencer_address": state.general_config.sequencer_address,
+        }
+        self.__block = None
+
+    def get_block(self) -> StarknetBlock:
+        """Return the pending block with all the transactions appended so far"""
+        if self.__block is None:
+            self.__block = StarknetBlock.create(
+                block_hash=None,
+                block_number=None,
+                state_root=None,
+                transactions=list(self.__transactions),
+                transaction_receipts=tuple(self.__receipts),
+                status=BlockStatus.PENDING,
+                parent_block_hash=self.parent_block_hash,
+                starknet_version=CAIRO_LANG_VERSION,
+                **self.__header,
+            )
+        return self.__block
+
+    def get_checkpoint(self) -> Tuple[int, Dict[str, Any]]:
+        """Return what is needed to revert to the current contents with `revert`"""
+        return len(self), self.__header
+
+    def revert(self, checkpoint: Tuple[int, Dict[str, Any]]):
+        """Remove the transactions appended after `checkpoint` was taken"""
+        n_transactions, self.__header = checkpoint
+        del self.signatures[n_transactions:]
+        del self.__transactions[n_transactions:]
+        del self.__receipts[n_transactions:]
+        self.__block = None
+
+
+def _get_block(block: StarknetBlock) -> StarknetBlock:
+    return block
+
+
+class _DeferredBlock:
+    """
+    A stored block whose hash is being calculated in the background.
+    The block number is known immediately, reading any other attribute
+    of the block waits for the calculation. Pickled as the calculated block.
+    """
+
+    def __init__(self, block_number: int, future: Future):
+        self.block_number = block_number
+        self.__future = future
+
+    def get_block(self) -> StarknetBlock:
+        """Return the block, waiting for its hash to be calculated"""
+        return self.__future.result()
+
+    async def wait(self) -> StarknetBlock:
+        """Return the block, waiting for its hash without blocking the event loop"""
+        return await asyncio.wrap_future(self.__future)
+
+    def __await__(self):
+        return self.wait().__await__()
+
+    def __getattr__(self, name: str):
+        return getattr(self.get_block(), name)
+
+    def __reduce__(self):
+        return _get_block, (self.get_block(),)
+
+
+async def _create_block(
+    pending_block: _PendingBlock,
+    general_config: StarknetGeneralConfig,
+    block_number: int,
+    calculate_hash: bool,
+) -> StarknetBlock:
+    """
+    Create the accepted block with the contents of `pending_block`.
+    If `calculate_hash` is `False`, the block number is used as the hash.
+    """
+    block = pending_block.get_block()
+    block_dict = block.dump()
+
+    block_dict["status"] = BlockStatus.ACCEPTED_ON_L2.name
+    state_root = DUMMY_STATE_ROOT
+    block_dict["state_root"] = state_root.hex()
+    block_dict["block_number"] = block_number
+
+    if calculate_hash:
+        block_hash = await calculate_block_hash(
+            general_config=general_config,
+            parent_hash=block.parent_block_hash,
+            block_number=block_number,
+            global_state_root=state_root,
+            block_timestamp=block.timestamp,
+            tx_hashes=[tx.transaction_hash for tx in block.transactions],
+            tx_signatures=pending_block.signatures,
+            events=[
+                event
+                for receipt in block.transaction_receipts
+                for event in receipt.events
+            ],
+            sequencer_address=block.sequencer_address,
+        )
+    else:
+        block_hash = block_number
+
+    block_dict["block_hash"] = hex(block_hash)
+    return StarknetBlock.load(block_dict)
+
+
+@dataclass
+class BlocksCheckpoint:
+    """Contents of `DevnetBlocks` at some point, allowing to revert to it"""
+
+    n_blocks: int
+    pending_block: Optional[_PendingBlock]
+    pending_block_checkpoint: Optional[Tuple[int, Dict[str, Any]]]
+    pending_state_update: Optional[BlockStateUpdate]
+
+
 # pylint: disable=too-many-instance-attributes
 class DevnetBlocks:
     """This class is used to store the generated blocks of the devnet."""
 
-    def __init__(self, origin: Origin, lite=False) -> None:
+    def __init__(
+        self,
+        origin: Origin,
+        lite=False,
+        lazy_hash=False,
+        history_store: HistoryStore = None,
+    ) -> None:
         self.origin = origin
         self.lite = lite
-        self.__num2block: Dict[int, StarknetBlock] = {}
-        self.__state_updates: Dict[int, BlockStateUpdate] = {}
-        self.__hash2num: Dict[str, int] = {}
-        self.__pending_block: StarknetBlock = None
+        self.lazy_hash = lazy_hash
+        history_store = history_store or HistoryStore()
+        self.__num2block: Dict[
+            int, Union[StarknetBlock, _DeferredBlock]
+        ] = history_store.create_dict("blocks")
+        self.__deferred: Dict[int, _DeferredBlock] = {}
+        self.__state_updates: Dict[int, BlockStateUpdate] = history_store.create_dict(
+            "state_updates"
+        )
+        self.__hash2num: Dict[int, int] = history_store.create_dict("block_hashes")
+        # events of the blocks of this devnet, not of the origin
+        self.__event_index = EventIndex()
+        # bloom filters of the events of the blocks, created when the blocks of this devnet
+        # are stored and when the blocks of the origin are first scanned
+        self.__event_blooms: Dict[int, int] = history_store.create_dict("event_blooms")
+        self.__pending_block: Optional[_PendingBlock] = None
         self.__pending_state_update: BlockStateUpdate = None
-        self.__pending_signatures: Sequence[List[int]] = None
+
+    def __getstate__(self):
+        # the hashes are not picklable while being calculated
+        self.__wait_for_all_hashes()
+        return self.__dict__
+
+    def __store_block(self, block: StarknetBlock):
+        """Store `block`, whose state update is already stored without its hash"""
+        self.__num2block[block.block_number] = block
+        self.__hash2num[block.block_hash] = block.block_number
+
+        state_update = self.__state_updates[block.block_number]
+        if state_update is not None:
+            self.__state_updates[block.block_number] = BlockStateUpdate(
+                block_hash=block.block_hash,
+                old_root=state_update.old_root,
+                new_root=state_update.new_root,
+                state_diff=state_update.state_diff,
+            )
+
+    def __wait_for_all_hashes(self):
+        """Block until all the deferred hashes are calculated and store their blocks"""
+        for deferred_block in self.__deferred.values():
+            deferred_block.get_block()
+        self.__store_deferred_blocks()
+
+    def __store_deferred_blocks(self, block_number: Optional[int] = None):
+        """
+        Replace the deferred blocks up to `block_number` (or all of them) by the calculated ones.
+        Their hashes must have been calculated.
+        """
+        while self.__deferred:
+            deferred_number = next(iter(self.__deferred))
+            if block_number is not None and deferred_number > block_number:
+                break
+
+            self.__store_block(self.__deferred.pop(deferred_number).get_block())
+
+    async def __wait_for_hashes(self, block_number: Optional[int] = None):
+        """Wait until the hashes of the blocks up to `block_number` (or all) are calculated"""
+        if block_number is None:
+            block_number = self.get_number_of_blocks() - 1
+
+        deferred_numbers = [
+            deferred_number
+            for deferred_number in self.__deferred
+            if deferred_number <= block_number
+        ]
+        if deferred_numbers:
+            # hashes are calculated in order, so the preceding ones are calculated too
+            await self.__deferred[deferred_numbers[-1]].wait()
+        self.__store_deferred_blocks(block_number)
 
     async def get_last_block(self) -> StarknetBlock:
         """Returns the last block stored so far."""
@@ -104,8 +355,8 @@ class DevnetBlocks:
         block_number = _parse_block_number(block_number)
 
         if block_number == PENDING_BLOCK_ID:
-            if self.__pending_block:
-                return self.__pending_block
+            if self.__pending_block is not None:
+                return self.__pending_block.get_block()
             # if no pending, default to latest
             block_number = LATEST_BLOCK_ID
 
@@ -116,6 +367,7 @@ class DevnetBlocks:
 
         self.__assert_block_number_in_range(block_number)
         if block_number in self.__num2block:
+            await self.__wait_for_hashes(block_number)
             return self.__num2block[block_number]
 
         return await self.origin.get_block_by_number(block_number)
@@ -125,6 +377,8 @@ class DevnetBlocks:
         Returns the block with the given block hash.
         """
         numeric_hash = _parse_block_hash(block_hash)
+        if numeric_hash not in self.__hash2num:
+            await self.__wait_for_hashes()
 
         if numeric_hash in self.__hash2num:
             block_number = self.__hash2num[int(block_hash, 16)]
@@ -141,6 +395,8 @@ class DevnetBlocks:
         """
         if block_hash:
             numeric_hash = _parse_block_hash(block_hash)
+            if numeric_hash not in self.__hash2num:
+                await self.__wait_for_hashes()
 
             if numeric_hash not in self.__hash2num:
                 return await self.origin.get_state_update(block_hash=block_hash)
@@ -159,90 +415,103 @@ class DevnetBlocks:
         if block_number != LATEST_BLOCK_ID:
             self.__assert_block_number_in_range(block_number)
             if block_number in self.__state_updates:
+                await self.__wait_for_hashes(block_number)
                 return self.__state_updates[block_number]
 
             return await self.origin.get_state_update(block_number=block_number)
 
         # now we know the block ID is "latest"
+        await self.__wait_for_hashes()
         return (
             self.__state_updates.get(self.get_number_of_blocks() - 1)
             or await self.origin.get_state_update()
         )
 
-    async def generate_pending(
+    def insert(self, block: StarknetBlock, state_update: BlockStateUpdate):
+        """
+        Store a block generated by another devnet instance as the latest block.
+        Used by read replicas, which receive the blocks generated by the primary.
+        """
+        assert block.block_number == self.get_number_of_blocks()
+        self.__num2block[block.block_number] = block
+        self.__state_updates[block.block_number] = state_update
+        self.__hash2num[block.block_hash] = block.block_number
+        self.__add_events(block.block_number, block.transaction_receipts)
+
+    def get_checkpoint(self) -> BlocksCheckpoint:
+        """
+        Return a checkpoint of the stored and pending blocks.
+        Taking it is O(1) and reverting to it is O(blocks and transactions added since).
+        """
+        pending_block = self.__pending_block
+        return BlocksCheckpoint(
+            n_blocks=len(self.__num2block),
+            pending_block=pending_block,
+            pending_block_checkpoint=pending_block.get_checkpoint()
+            if pending_block is not None
+            else None,
+            pending_state_update=self.__pending_state_update,
+        )
+
+    def revert(self, checkpoint: BlocksCheckpoint):
+        """
+        Remove the blocks stored after `checkpoint` was taken and restore the pending block.
+        Checkpoints taken after `checkpoint` can no longer be reverted to.
+        """
+        # the pending block of the checkpoint may be being hashed in the background
+        self.__wait_for_all_hashes()
+
+        while len(self.__num2block) > checkpoint.n_blocks:
+            block_number, block = self.__num2block.popitem()
+            self.__state_updates.pop(block_number, None)
+            self.__hash2num.pop(block.block_hash, None)
+            self.__event_index.remove_block(block.transaction_receipts)
+            self.__event_blooms.pop(block_number, None)
+
+        self.__pending_block = checkpoint.pending_block
+        if self.__pending_block is not None:
+            self.__pending_block.revert(checkpoint.pending_block_checkpoint)
+        self.__pending_state_update = checkpoint.pending_state_update
+
+    def get_number_of_pending_transactions(self) -> int:
+        """Returns the number of transactions in the pending block."""
+        return len(self.__pending_block) if self.__pending_block else 0
+
+    async def append_pending(
         self,
         transactions: List[DevnetTransaction],
         state: StarknetState,
         state_update=None,
     ):
         """
-        Generates pending objects (block, updates) and stores them as private properties.
+        Appends `transactions` to the pending block, creating it if there is none,
+        and replaces the pending state update with `state_update`.
         The method `store_pending` can be used after this method.
         """
-        timestamp = state.state.block_info.block_timestamp
-        signatures = [tx.get_signature() for tx in transactions or []]
-        internal_transactions = [tx.internal_tx for tx in transactions or []]
-        transaction_receipts = tuple(tx.get_execution() for tx in transactions or ())
-
-        block_number = self.get_number_of_blocks()
-        if block_number == 0:
-            parent_block_hash = 0
-        else:
-            last_block = await self.get_last_block()
-            parent_block_hash = last_block.block_hash
-
-        self.__pending_block = StarknetBlock.create(
-            block_hash=None,
-            block_number=None,
-            state_root=None,
-            transactions=internal_transactions,
-            timestamp=timestamp,
-            transaction_receipts=transaction_receipts,
-            status=BlockStatus.PENDING,
-            gas_price=state.state.block_info.gas_price,
-            sequencer_address=state.general_config.sequencer_address,
-            parent_block_hash=parent_block_hash,
-            starknet_version=CAIRO_LANG_VERSION,
-        )
-
+        if self.__pending_block is None:
+            block_number = self.get_number_of_blocks()
+            if block_number == 0:
+                parent_block = None
+            elif block_number - 1 in self.__num2block:
+                # the hash of the parent may still be being calculated
+                parent_block = self.__num2block[block_number - 1]
+            else:
+                parent_block = await self.get_last_block()
+            self.__pending_block = _PendingBlock(parent_block)
+
+        self.__pending_block.append(transactions, state)
         self.__pending_state_update = state_update
-        self.__pending_signatures = signatures
 
     async def generate_empty_block(
         self, state: StarknetState, state_update: BlockStateUpdate
     ) -> StarknetBlock:
         """Generate an empty block"""
-        await self.generate_pending(
+        assert self.__pending_block is None
+        await self.append_pending(
             transactions=[], state=state, state_update=state_update
         )
         return await self.store_pending(state, is_empty_block=True)
 
-    async def __calculate_pending_block_hash(
-        self, state: StarknetState, block_number: int, state_root: bytes
-    ):
-        event_hashes: List[int] = []
-        for receipt in self.__pending_block.transaction_receipts:
-            for event in receipt.events:
-                event_hashes.append(
-                    calculate_event_hash(
-                        from_address=event.from_address,
-                        keys=event.keys,
-                        data=event.data,
-                    )
-                )
-
-        return await calculate_block_hash(
-            general_config=state.general_config,
-            parent_hash=self.__pending_block.parent_block_hash,
-            block_number=block_number,
-            global_state_root=state_root,
-            block_timestamp=self.__pending_block.timestamp,
-            tx_hashes=[tx.transaction_hash for tx in self.__pending_block.transactions],
-            tx_signatures=self.__pending_signatures,
-            event_hashes=event_hashes,
-            sequencer_address=self.__pending_block.sequencer_address,
-        )
-
     def is_block_pending(self) -> bool:
         """Return `True` if there is a pending block, oterhwise return `False`"""
         return self.__pending_block is not None
@@ -253,41 +522,137 @@ class DevnetBlocks:
         """
         Store pending block, assign a block hash to it, effecitvely making it the latest.
         Set pending properties to None.
+        With `lazy_hash`, the hash is calculated in the background and the returned block
+        only waits for it when its hash (or any attribute but the number) is read.
+        With a bounded history, the hash is awaited before returning, as blocks and transactions
+        spilled to disk are pickled with the hash.
         """
-        assert self.__pending_block
-
-        block_dict = self.__pending_block.dump()
-
-        block_dict["status"] = BlockStatus.ACCEPTED_ON_L2.name
-        state_root = DUMMY_STATE_ROOT
-        block_dict["state_root"] = state_root.hex()
+        assert self.__pending_block is not None
 
+        pending_block = self.__pending_block
         block_number = self.get_number_of_blocks()
-        block_dict["block_number"] = block_number
-
-        if self.lite or is_empty_block:
-            block_hash = block_number
-        else:
-            block_hash = await self.__calculate_pending_block_hash(
-                state, block_number, state_root
-            )
-
-        block_dict["block_hash"] = hex(block_hash)
-        self.__hash2num[block_hash] = block_number
-
-        if self.__pending_state_update is not None:
-            self.__pending_state_update = BlockStateUpdate(
-                block_hash=block_hash,
-                old_root=self.__pending_state_update.old_root,
-                new_root=self.__pending_state_update.new_root,
-                state_diff=self.__pending_state_update.state_diff,
-            )
         self.__state_updates[block_number] = self.__pending_state_update
         self.__pending_state_update = None
-
-        block = StarknetBlock.load(block_dict)
-        self.__num2block[block_number] = block
-
         self.__pending_block = None
-        self.__pending_signatures = None
+        self.__add_events(block_number, pending_block.receipts)
+
+        if self.lazy_hash and not (self.lite or is_empty_block):
+            future = _DEFERRED_HASH_EXECUTOR.submit(
+                asyncio.run,
+                _create_block(
+                    pending_block,
+                    state.general_config,
+                    block_number,
+                    calculate_hash=True,
+                ),
+            )
+            deferred_block = _DeferredBlock(block_number, future)
+            if self.__num2block.store.max_in_memory is not None:
+                block = await deferred_block.wait()
+                self.__store_block(block)
+                return block
+
+            self.__num2block[block_number] = deferred_block
+            self.__deferred[block_number] = deferred_block
+            return deferred_block
+
+        block = await _create_block(
+            pending_block,
+            state.general_config,
+            block_number,
+            calculate_hash=not (self.lite or is_empty_block),
+        )
+        self.__store_block(block)
         return block
+
+    def __add_events(
+        self, block_number: int, receipts: List[TransactionExecution]
+    ) -> None:
+        """Index the events of the stored block and store its bloom filter"""
+        self.__event_index.add_block(block_number, receipts)
+        self.__event_blooms[block_number] = create_event_bloom(receipts)
+
+    async def __find_event_positions(
+        self,
+        address: int,
+        keys: List[int],
+        start: EventPosition,
+        to_block_number: int,
+    ) -> AsyncIterator[EventPosition]:
+        """
+        The blocks of the origin are scanned, skipping those already ruled out by their bloom filters,
+        the events of the others are looked up in the index, skipping the blocks ruled out likewise.
+        """
+        n_origin_blocks = self.origin.get_number_of_blocks()
+        may_match = create_bloom_matcher(address, keys)
+        for block_number in range(
+            start.block_number, min(to_block_number + 1, n_origin_blocks)
+        ):
+            bloom = self.__event_blooms.get(block_number)
+            if bloom is not None and not may_match(bloom):
+                continue
+
+            block = await self.get_by_number(block_number)
+            if bloom is None:
+                self.__event_blooms[block_number] = create_event_bloom(
+                    block.transaction_receipts
+                )
+            for transaction_index, receipt in enumerate(block.transaction_receipts):
+                for event_index, event in enumerate(receipt.events):
+                    position = EventPosition(
+                        block_number, transaction_index, event_index
+                    )
+                    if (
+                        position >= start
+                        and event.from_address == address
+                        and set(event.keys) & set(keys)
+                    ):
+                        yield position
+
+        for position in self.__event_index.find(
+            address,
+            keys,
+            start=max(start, EventPosition(n_origin_blocks, 0, 0)),
+            to_block_number=to_block_number,
+            may_match_block=lambda block_number: may_match(
+                self.__event_blooms[block_number]
+            ),
+        ):
+            yield position
+
+    # pylint: disable=too-many-arguments
+    async def find_events(
+        self,
+        address: int,
+        keys: List[int],
+        start: EventPosition,
+        to_block_number: int,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[EventPosition, StarknetBlock, TransactionExecution, Event]]:
+        """
+        Return the events emitted by `address` with any of `keys`, from position `start` on
+        and up to block `to_block_number`, skipping the first `offset` and returning at most `limit`,
+        with the blocks and receipts they are in. Only the blocks of the returned events are read.
+        """
+        positions = []
+        index = 0
+        async for position in self.__find_event_positions(
+            address, keys, start, to_block_number
+        ):
+            if limit is not None and index >= offset + limit:
+                break
+            if index >= offset:
+                positions.append(position)
+            index += 1
+
+        events = []
+        block = None
+        for position in positions:
+            if block is None or block.block_number != position.block_number:
+                block = await self.get_by_number(position.block_number)
+            receipt = block.transaction_receipts[position.transaction_index]
+            events.append(
+                (position, block, receipt, receipt.events[position.event_index])
+            )
+        return events
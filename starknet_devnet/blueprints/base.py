@@ -4,7 +4,9 @@ Base routes
 from flask import Blueprint, Response, jsonify, request
 from starkware.starkware_utils.error_handling import StarkErrorCode
 
+from starknet_devnet.blueprints.rpc.schema import response_validator
 from starknet_devnet.fee_token import FeeToken
+from starknet_devnet.history import get_process_memory
 from starknet_devnet.state import state
 from starknet_devnet.util import (
     StarknetDevnetException,
@@ -125,6 +127,23 @@ def load():
     return Response(status=200)
 
 
+@base.route("/snapshot", methods=["POST"])
+def snapshot():
+    """Takes an in-memory snapshot of the starknet_wrapper"""
+    snapshot_id = state.starknet_wrapper.take_snapshot()
+    return jsonify({"snapshot_id": snapshot_id})
+
+
+@base.route("/revert", methods=["POST"])
+def revert():
+    """Reverts the starknet_wrapper to a previously taken snapshot"""
+    request_dict = request.json or {}
+    snapshot_id = extract_positive(request_dict, "snapshot_id")
+
+    state.starknet_wrapper.revert_to_snapshot(snapshot_id)
+    return jsonify({"snapshot_id": snapshot_id})
+
+
 @base.route("/increase_time", methods=["POST"])
 def increase_time():
     """Increases the block timestamp offset"""
@@ -210,3 +229,31 @@ async def fork_status():
     if config.fork_network:
         return jsonify({"url": config.fork_network.url, "block": config.fork_block})
     return jsonify({})
+
+
+@base.route("/memory_usage", methods=["GET"])
+def memory_usage():
+    """
+    Get the memory usage of the process, the size of the history in memory and on disk
+    and the sizes of the response and class caches
+    """
+    return jsonify(
+        {
+            **get_process_memory(),
+            "history": state.starknet_wrapper.history_store.get_metrics(),
+            "response_cache": state.starknet_wrapper.response_cache.get_metrics(),
+            "class_cache": state.starknet_wrapper.class_cache.get_metrics(),
+        }
+    )
+
+
+@base.route("/read_pool_metrics", methods=["GET"])
+def read_pool_metrics():
+    """Get the metrics of the pool executing calls and fee estimations"""
+    return jsonify(state.starknet_wrapper.read_pool.get_metrics())
+
+
+@base.route("/rpc_response_validation_metrics", methods=["GET"])
+def rpc_response_validation_metrics():
+    """Get the counts of validated RPC responses and of found violations"""
+    return jsonify(response_validator.get_metrics())
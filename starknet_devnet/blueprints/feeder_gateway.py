@@ -2,16 +2,22 @@
 Feeder gateway routes.
 """
 
+import json
+from typing import Optional
+
 from flask import Blueprint, Response, jsonify, request
 from marshmallow import ValidationError
+from starkware.starknet.definitions.error_codes import StarknetErrorCode
 from starkware.starknet.services.api.feeder_gateway.request_objects import (
     CallFunction,
     CallL1Handler,
 )
 from starkware.starknet.services.api.feeder_gateway.response_objects import (
+    BlockStatus,
     BlockTransactionTraces,
     StarknetBlock,
     TransactionSimulationInfo,
+    TransactionStatus,
 )
 from starkware.starknet.services.api.gateway.transaction import (
     AccountTransaction,
@@ -21,11 +27,20 @@ from starkware.starknet.services.api.gateway.transaction import (
 from starkware.starkware_utils.error_handling import StarkErrorCode
 from werkzeug.datastructures import MultiDict
 
+from starknet_devnet.blueprints.shared import get_serialized_class
+from starknet_devnet.read_pool import stream_serially
+from starknet_devnet.response_cache import (
+    get_block_cache_key,
+    get_transaction_cache_key,
+)
 from starknet_devnet.state import state
 from starknet_devnet.util import StarknetDevnetException, custom_int, fixed_length_hex
 
 feeder_gateway = Blueprint("feeder_gateway", __name__, url_prefix="/feeder_gateway")
 
+DEFAULT_TRANSACTIONS_LIMIT = 100
+MAX_TRANSACTIONS_LIMIT = 1000
+
 
 def validate_request(data: bytes, cls, many=False):
     """Ensure `data` is valid Starknet function call. Returns an object of type specified with `cls`."""
@@ -75,15 +90,26 @@ async def _get_block_object(args: MultiDict) -> StarknetBlock:
 
 
 async def _get_block_transaction_traces(block: StarknetBlock):
-    traces = []
-    if block.transaction_receipts:
-        for transaction in block.transaction_receipts:
-            tx_hash = hex(transaction.transaction_hash)
-            trace = await state.starknet_wrapper.transactions.get_transaction_trace(
-                tx_hash
-            )
+    transactions = state.starknet_wrapper.transactions
+    receipts = block.transaction_receipts or []
+
+    # the transactions of accepted local blocks are indexed, the others are looked up one by one
+    indexed_transactions = []
+    if block.status != BlockStatus.PENDING:
+        indexed_transactions = transactions.find(block_number=block.block_number)
 
+    traces = []
+    if receipts and len(indexed_transactions) == len(receipts):
+        for transaction in indexed_transactions:
             # expected trace is equal to response of get_transaction, but with the hash property
+            trace_dict = transaction.get_trace().dump()
+            trace_dict["transaction_hash"] = hex(transaction.transaction_hash)
+            traces.append(trace_dict)
+    else:
+        for receipt in receipts:
+            tx_hash = hex(receipt.transaction_hash)
+            trace = await transactions.get_transaction_trace(tx_hash)
+
             trace_dict = trace.dump()
             trace_dict["transaction_hash"] = tx_hash
             traces.append(trace_dict)
@@ -92,6 +118,70 @@ async def _get_block_transaction_traces(block: StarknetBlock):
     return BlockTransactionTraces.load({"traces": traces})
 
 
+def _serialized_response(serialized: bytes) -> Response:
+    return Response(response=serialized, status=200, mimetype="application/json")
+
+
+def _get_block_range(args: MultiDict) -> range:
+    """Return the range of block numbers from `from` to `to` (inclusive, defaults to latest)"""
+    number_of_blocks = state.starknet_wrapper.blocks.get_number_of_blocks()
+    try:
+        from_block = int(args["from"])
+        to_block = int(args.get("to", number_of_blocks - 1))
+    except (KeyError, ValueError) as err:
+        raise StarknetDevnetException(
+            code=StarkErrorCode.MALFORMED_REQUEST,
+            message="The block numbers from and to must be integers; "
+            f"got: {args.get('from')}, {args.get('to')}.",
+            status_code=400,
+        ) from err
+
+    if not 0 <= from_block <= to_block:
+        raise StarknetDevnetException(
+            code=StarkErrorCode.MALFORMED_REQUEST,
+            message="Invalid block range: from must be non-negative and at most to; "
+            f"got: {from_block}, {to_block}.",
+            status_code=400,
+        )
+
+    if to_block >= number_of_blocks:
+        raise StarknetDevnetException(
+            code=StarknetErrorCode.BLOCK_NOT_FOUND,
+            message=f"Block number too high. There are currently {number_of_blocks} blocks; "
+            f"got: {to_block}.",
+        )
+
+    return range(from_block, to_block + 1)
+
+
+def _get_optional_int(args: MultiDict, attribute: str, convert=int):
+    if attribute not in args:
+        return None
+    try:
+        return convert(args[attribute])
+    except ValueError as err:
+        raise StarknetDevnetException(
+            code=StarkErrorCode.MALFORMED_REQUEST,
+            message=f"Invalid {attribute}: {args[attribute]}.",
+            status_code=400,
+        ) from err
+
+
+def _get_transaction_status(args: MultiDict):
+    status = args.get("status")
+    if status is None:
+        return None
+    try:
+        return TransactionStatus[status]
+    except KeyError as err:
+        raise StarknetDevnetException(
+            code=StarkErrorCode.MALFORMED_REQUEST,
+            message=f"Invalid status: {status}; "
+            f"expected one of: {', '.join(known_status.name for known_status in TransactionStatus)}.",
+            status_code=400,
+        ) from err
+
+
 def _get_block_id(args: MultiDict):
     if "blockHash" in args:
         raise StarknetDevnetException("Cannot handle block hashes", status_code=400)
@@ -129,7 +219,45 @@ async def get_block():
     """Endpoint for retrieving a block identified by its hash or number."""
 
     block = await _get_block_object(request.args)
-    return jsonify(block.dump())
+    serialized = state.starknet_wrapper.response_cache.get_or_create(
+        get_block_cache_key(
+            "get_block", block, state.starknet_wrapper.origin.get_number_of_blocks()
+        ),
+        block.dumps,
+    )
+    return _serialized_response(serialized)
+
+
+@feeder_gateway.route("/get_blocks", methods=["GET"])
+async def get_blocks():
+    """
+    Streams the blocks with numbers from `from` to `to` as newline-delimited JSON objects,
+    each with a block as returned by get_block and optionally its state update.
+    """
+
+    block_range = _get_block_range(request.args)
+    include_state_updates = request.args.get("includeStateUpdates") == "true"
+    # the blocks of the devnet being served, even if it's restarted while streaming
+    blocks = state.starknet_wrapper.blocks
+
+    async def dump_block(block_number: int) -> Optional[bytes]:
+        if block_number >= blocks.get_number_of_blocks():
+            # reverted while streaming
+            return None
+
+        block = await blocks.get_by_number(block_number)
+        line = {"block": block.dump()}
+        if include_state_updates:
+            state_update = await blocks.get_state_update(block_number=block_number)
+            line["state_update"] = state_update.dump()
+
+        return json.dumps(line).encode("utf-8") + b"\n"
+
+    return Response(
+        response=stream_serially(dump_block, block_range),
+        status=200,
+        mimetype="application/x-ndjson",
+    )
 
 
 @feeder_gateway.route("/get_block_traces", methods=["GET"])
@@ -137,8 +265,18 @@ async def get_block_traces():
     """Returns the traces of the transactions in the specified block."""
 
     block = await _get_block_object(request.args)
-    block_transaction_traces = await _get_block_transaction_traces(block)
-    return jsonify(block_transaction_traces.dump())
+    response_cache = state.starknet_wrapper.response_cache
+    cache_key = get_block_cache_key(
+        "get_block_traces", block, state.starknet_wrapper.origin.get_number_of_blocks()
+    )
+    serialized = response_cache.get(cache_key) if cache_key else None
+    if serialized is None:
+        block_transaction_traces = await _get_block_transaction_traces(block)
+        serialized = response_cache.get_or_create(
+            cache_key, block_transaction_traces.dumps
+        )
+
+    return _serialized_response(serialized)
 
 
 @feeder_gateway.route("/get_code", methods=["GET"])
@@ -163,10 +301,13 @@ async def get_full_contract():
 
     contract_address = request.args.get("contractAddress", type=custom_int)
 
-    contract_class = await state.starknet_wrapper.get_class_by_address(
+    class_hash = await state.starknet_wrapper.get_class_hash_at(
         contract_address, block_id
     )
-    return jsonify(contract_class.remove_debug_info().dump())
+    contract_class = await state.starknet_wrapper.get_class_by_hash(
+        class_hash, block_id
+    )
+    return _serialized_response(get_serialized_class(class_hash, contract_class))
 
 
 @feeder_gateway.route("/get_class_hash_at", methods=["GET"])
@@ -184,7 +325,7 @@ async def get_class_by_hash():
 
     class_hash = request.args.get("classHash", type=custom_int)
     contract_class = await state.starknet_wrapper.get_class_by_hash(class_hash)
-    return jsonify(contract_class.remove_debug_info().dump())
+    return _serialized_response(get_serialized_class(class_hash, contract_class))
 
 
 @feeder_gateway.route("/get_storage_at", methods=["GET"])
@@ -229,6 +370,49 @@ async def get_transaction():
     )
 
 
+@feeder_gateway.route("/get_transactions", methods=["GET"])
+async def get_transactions():
+    """
+    Returns a page of the transactions matching all of the provided blockNumber, address
+    (of the sending account, or of the deployed or called contract) and status,
+    looked up in the indexes of the transactions.
+    """
+
+    offset = _get_optional_int(request.args, "offset") or 0
+    limit = _get_optional_int(request.args, "limit")
+    if limit is None:
+        limit = DEFAULT_TRANSACTIONS_LIMIT
+    if offset < 0 or not 0 < limit <= MAX_TRANSACTIONS_LIMIT:
+        raise StarknetDevnetException(
+            code=StarkErrorCode.MALFORMED_REQUEST,
+            message="offset must be non-negative and limit must be between 1 and "
+            f"{MAX_TRANSACTIONS_LIMIT}; got: {offset}, {limit}.",
+            status_code=400,
+        )
+
+    # one more than requested is found, to tell if there is a next page
+    transactions = state.starknet_wrapper.transactions.find(
+        block_number=_get_optional_int(request.args, "blockNumber"),
+        address=_get_optional_int(request.args, "address", convert=custom_int),
+        status=_get_transaction_status(request.args),
+        offset=offset,
+        limit=limit + 1,
+    )
+
+    transactions_page = transactions[:limit]
+    for transaction in transactions_page:
+        await transaction.wait_for_block()
+
+    return jsonify(
+        {
+            "transactions": [
+                transaction.get_tx_info().dump() for transaction in transactions_page
+            ],
+            "next_offset": offset + limit if len(transactions) > limit else None,
+        }
+    )
+
+
 @feeder_gateway.route("/get_transaction_receipt", methods=["GET"])
 async def get_transaction_receipt():
     """
@@ -236,12 +420,18 @@ async def get_transaction_receipt():
     """
 
     transaction_hash = request.args.get("transactionHash")
-    tx_receipt = await state.starknet_wrapper.transactions.get_transaction_receipt(
-        transaction_hash
-    )
-    return Response(
-        response=tx_receipt.dumps(), status=200, mimetype="application/json"
-    )
+    response_cache = state.starknet_wrapper.response_cache
+    cache_key = get_transaction_cache_key("get_transaction_receipt", transaction_hash)
+    serialized = response_cache.get(cache_key) if cache_key else None
+    if serialized is None:
+        transactions = state.starknet_wrapper.transactions
+        tx_receipt = await transactions.get_transaction_receipt(transaction_hash)
+        serialized = response_cache.get_or_create(
+            cache_key if transactions.is_final(transaction_hash) else None,
+            tx_receipt.dumps,
+        )
+
+    return _serialized_response(serialized)
 
 
 @feeder_gateway.route("/get_transaction_trace", methods=["GET"])
@@ -251,13 +441,19 @@ async def get_transaction_trace():
     """
 
     transaction_hash = request.args.get("transactionHash")
-    transaction_trace = await state.starknet_wrapper.transactions.get_transaction_trace(
-        transaction_hash
-    )
+    response_cache = state.starknet_wrapper.response_cache
+    cache_key = get_transaction_cache_key("get_transaction_trace", transaction_hash)
+    serialized = response_cache.get(cache_key) if cache_key else None
+    if serialized is None:
+        # transactions of the forking origin are not stored, so their traces are not cached
+        transactions = state.starknet_wrapper.transactions
+        transaction_trace = await transactions.get_transaction_trace(transaction_hash)
+        serialized = response_cache.get_or_create(
+            cache_key if transactions.is_final(transaction_hash) else None,
+            transaction_trace.dumps,
+        )
 
-    return Response(
-        response=transaction_trace.dumps(), status=200, mimetype="application/json"
-    )
+    return _serialized_response(serialized)
 
 
 @feeder_gateway.route("/get_state_update", methods=["GET"])
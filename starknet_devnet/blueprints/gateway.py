@@ -2,24 +2,24 @@
 Gateway routes
 """
 
+import json
+
 from flask import Blueprint, jsonify, request
 from starkware.starknet.definitions.transaction_type import TransactionType
-from starkware.starkware_utils.error_handling import StarkErrorCode
+from starkware.starknet.services.api.gateway.transaction import Transaction
+from starkware.starkware_utils.error_handling import StarkErrorCode, StarkException
 
 from starknet_devnet.devnet_config import DumpOn
 from starknet_devnet.state import state
 from starknet_devnet.util import StarknetDevnetException, fixed_length_hex
 
-from .shared import validate_transaction
+from .shared import cache_declared_class, validate_transaction
 
 gateway = Blueprint("gateway", __name__, url_prefix="/gateway")
 
 
-@gateway.route("/add_transaction", methods=["POST"])
-async def add_transaction():
-    """Endpoint for accepting (state-changing) transactions."""
-
-    transaction = validate_transaction(request.data)
+async def _add_transaction(transaction: Transaction) -> dict:
+    """Add `transaction` and return the response dict"""
     tx_type = transaction.tx_type
 
     response_dict = {
@@ -30,6 +30,9 @@ async def add_transaction():
         contract_class_hash, transaction_hash = await state.starknet_wrapper.declare(
             transaction
         )
+        await cache_declared_class(
+            contract_class_hash, transaction.contract_class, transaction_hash
+        )
         response_dict["class_hash"] = hex(contract_class_hash)
 
     elif tx_type == TransactionType.DEPLOY_ACCOUNT:
@@ -59,9 +62,61 @@ async def add_transaction():
         )
 
     response_dict["transaction_hash"] = hex(transaction_hash)
+    return response_dict
+
+
+@gateway.route("/add_transaction", methods=["POST"])
+async def add_transaction():
+    """Endpoint for accepting (state-changing) transactions."""
+
+    transaction = validate_transaction(request.data)
+    response_dict = await _add_transaction(transaction)
 
     # after tx
     if state.dumper.dump_on == DumpOn.TRANSACTION:
         state.dumper.dump()
 
     return jsonify(response_dict)
+
+
+@gateway.route("/add_transaction_bulk", methods=["POST"])
+async def add_transaction_bulk():
+    """
+    Endpoint for accepting a list of (state-changing) transactions.
+    The transactions are executed in order and added in a single block.
+    A transaction which can't be added is answered with its error, the others are still added.
+    """
+
+    request_list = request.get_json(silent=True)
+    if not isinstance(request_list, list):
+        raise StarknetDevnetException(
+            code=StarkErrorCode.MALFORMED_REQUEST,
+            message="Request body must be a list of transactions.",
+            status_code=400,
+        )
+
+    # validate all before executing any
+    transactions = [validate_transaction(json.dumps(tx)) for tx in request_list]
+
+    response_list = []
+    async with state.starknet_wrapper.transaction_bulk():
+        for transaction in transactions:
+            try:
+                response_list.append(await _add_transaction(transaction))
+            except StarkException as error:
+                response_list.append(
+                    {"code": str(error.code), "message": error.message}
+                )
+
+    # the statuses are known once the bulk is committed
+    for response_dict in response_list:
+        if "transaction_hash" in response_dict:
+            response_dict["status"] = state.starknet_wrapper.transactions.get_status(
+                response_dict["transaction_hash"]
+            ).name
+
+    # after txs
+    if state.dumper.dump_on == DumpOn.TRANSACTION:
+        state.dumper.dump()
+
+    return jsonify(response_list)
@@ -1,10 +1,31 @@
 """
 RPC block endpoints
 """
-from starknet_devnet.blueprints.rpc.schema import validate_schema
-from starknet_devnet.blueprints.rpc.structures.payloads import rpc_block
-from starknet_devnet.blueprints.rpc.structures.types import BlockId, RpcError
-from starknet_devnet.blueprints.rpc.utils import get_block_by_block_id, rpc_felt
+import json
+from typing import Optional
+
+from starknet_devnet.blueprints.rpc.schema import (
+    assert_valid_rpc_request,
+    validate_schema,
+)
+from starknet_devnet.blueprints.rpc.structures.payloads import (
+    rpc_block,
+    rpc_state_update,
+)
+from starknet_devnet.blueprints.rpc.structures.responses import rpc_transaction_receipt
+from starknet_devnet.blueprints.rpc.structures.types import (
+    BlockId,
+    PredefinedRpcErrorCode,
+    RpcError,
+)
+from starknet_devnet.blueprints.rpc.utils import (
+    StreamedArray,
+    get_block_by_block_id,
+    get_cached_result,
+    rpc_felt,
+)
+from starknet_devnet.read_pool import stream_serially
+from starknet_devnet.response_cache import get_block_cache_key
 from starknet_devnet.state import state
 
 
@@ -14,7 +35,15 @@ async def get_block_with_tx_hashes(block_id: BlockId) -> dict:
     Get block information with transaction hashes given the block id
     """
     block = await get_block_by_block_id(block_id)
-    return await rpc_block(block=block)
+    return await get_cached_result(
+        "getBlockWithTxHashes",
+        get_block_cache_key(
+            "getBlockWithTxHashes",
+            block,
+            state.starknet_wrapper.origin.get_number_of_blocks(),
+        ),
+        lambda: rpc_block(block=block),
+    )
 
 
 @validate_schema("getBlockWithTxs")
@@ -23,7 +52,15 @@ async def get_block_with_txs(block_id: BlockId) -> dict:
     Get block information with full transactions given the block id
     """
     block = await get_block_by_block_id(block_id)
-    return await rpc_block(block=block, tx_type="FULL_TXNS")
+    return await get_cached_result(
+        "getBlockWithTxs",
+        get_block_cache_key(
+            "getBlockWithTxs",
+            block,
+            state.starknet_wrapper.origin.get_number_of_blocks(),
+        ),
+        lambda: rpc_block(block=block, tx_type="FULL_TXNS"),
+    )
 
 
 @validate_schema("blockNumber")
@@ -64,3 +101,66 @@ async def get_block_transaction_count(block_id: BlockId) -> int:
     """
     block = await get_block_by_block_id(block_id)
     return len(block.transactions)
+
+
+async def get_blocks(
+    from_block: BlockId,
+    to_block: BlockId,
+    include_receipts: bool = False,
+    include_state_updates: bool = False,
+) -> StreamedArray:
+    """
+    Stream the blocks from `from_block` to `to_block` (inclusive) with full transactions,
+    optionally with the receipts of the transactions and the state updates.
+    This method is not a part of the RPC specification.
+    """
+    for block_id in (from_block, to_block):
+        assert_valid_rpc_request(block_id, method_name="getBlockWithTxs")
+
+    if not isinstance(include_receipts, bool) or not isinstance(
+        include_state_updates, bool
+    ):
+        raise RpcError(
+            code=PredefinedRpcErrorCode.INVALID_PARAMS.value,
+            message="Invalid value for include_receipts or include_state_updates.",
+        )
+
+    first_block = await get_block_by_block_id(from_block)
+    last_block = await get_block_by_block_id(to_block)
+    if first_block.block_number > last_block.block_number:
+        raise RpcError(
+            code=PredefinedRpcErrorCode.INVALID_PARAMS.value,
+            message="from_block must not be after to_block.",
+        )
+
+    # the devnet being served, even if it's restarted while streaming
+    starknet_wrapper = state.starknet_wrapper
+
+    async def dump_block(number: int) -> Optional[bytes]:
+        if number >= starknet_wrapper.blocks.get_number_of_blocks():
+            # reverted while streaming
+            return None
+
+        block = await starknet_wrapper.blocks.get_by_number(number)
+        item = {"block": await rpc_block(block=block, tx_type="FULL_TXNS")}
+        if include_receipts:
+            item["receipts"] = [
+                await rpc_transaction_receipt(
+                    await starknet_wrapper.transactions.get_transaction_receipt(
+                        hex(receipt.transaction_hash)
+                    )
+                )
+                for receipt in block.transaction_receipts or []
+            ]
+        if include_state_updates:
+            item["state_update"] = rpc_state_update(
+                await starknet_wrapper.blocks.get_state_update(block_number=number)
+            )
+
+        return json.dumps(item).encode("utf-8")
+
+    return StreamedArray(
+        stream_serially(
+            dump_block, range(first_block.block_number, last_block.block_number + 1)
+        )
+    )
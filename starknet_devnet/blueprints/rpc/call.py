@@ -18,8 +18,8 @@ from starknet_devnet.blueprints.rpc.structures.types import (
     RpcError,
 )
 from starknet_devnet.blueprints.rpc.utils import (
-    assert_block_id_is_latest_or_pending,
     gateway_felt,
+    get_state_block_id,
     rpc_felt,
 )
 from starknet_devnet.state import state
@@ -39,17 +39,17 @@ async def call(request: RpcFunctionCall, block_id: BlockId) -> List[Felt]:
     """
     Call a starknet function without creating a StarkNet transaction
     """
-    await assert_block_id_is_latest_or_pending(block_id)
+    block_id = await get_state_block_id(block_id)
 
     if not await state.starknet_wrapper.is_deployed(
-        int(request["contract_address"], 16)
+        int(request["contract_address"], 16), block_id
     ):
         raise RpcError(code=20, message="Contract not found")
 
     _validate_calldata(request["calldata"])
     try:
         result = await state.starknet_wrapper.call(
-            transaction=make_call_function(request)
+            transaction=make_call_function(request), block_id=block_id
         )
         return [rpc_felt(res) for res in result["result"]]
     except StarknetDevnetException as ex:
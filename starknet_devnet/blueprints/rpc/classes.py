@@ -5,36 +5,35 @@ RPC classes endpoints
 from starkware.starkware_utils.error_handling import StarkException
 
 from starknet_devnet.blueprints.rpc.schema import validate_schema
-from starknet_devnet.blueprints.rpc.structures.payloads import rpc_contract_class
 from starknet_devnet.blueprints.rpc.structures.types import (
     Address,
     BlockId,
     Felt,
     RpcError,
 )
-from starknet_devnet.blueprints.rpc.utils import (
-    assert_block_id_is_latest_or_pending,
-    rpc_felt,
-)
+from starknet_devnet.blueprints.rpc.utils import get_state_block_id, rpc_felt
+from starknet_devnet.blueprints.shared import get_serialized_rpc_class
+from starknet_devnet.response_cache import SerializedJson
 from starknet_devnet.state import state
 from starknet_devnet.util import StarknetDevnetException
 
 
 @validate_schema("getClass")
-async def get_class(block_id: BlockId, class_hash: Felt) -> dict:
+async def get_class(block_id: BlockId, class_hash: Felt) -> SerializedJson:
     """
     Get the contract class definition in the given block associated with the given hash
     """
-    await assert_block_id_is_latest_or_pending(block_id)
+    block_id = await get_state_block_id(block_id)
+    class_hash_int = int(class_hash, 16)
 
     try:
         result = await state.starknet_wrapper.get_class_by_hash(
-            class_hash=int(class_hash, 16)
+            class_hash=class_hash_int, block_id=block_id
         )
     except StarknetDevnetException as ex:
         raise RpcError(code=28, message="Class hash not found") from ex
 
-    return rpc_contract_class(result)
+    return get_serialized_rpc_class(class_hash_int, result)
 
 
 @validate_schema("getClassHashAt")
@@ -42,7 +41,7 @@ async def get_class_hash_at(block_id: BlockId, contract_address: Address) -> Fel
     """
     Get the contract class hash in the given block for the contract deployed at the given address
     """
-    await assert_block_id_is_latest_or_pending(block_id)
+    block_id = await get_state_block_id(block_id)
 
     try:
         result = await state.starknet_wrapper.get_class_hash_at(
@@ -55,17 +54,18 @@ async def get_class_hash_at(block_id: BlockId, contract_address: Address) -> Fel
 
 
 @validate_schema("getClassAt")
-async def get_class_at(block_id: BlockId, contract_address: Address) -> dict:
+async def get_class_at(block_id: BlockId, contract_address: Address) -> SerializedJson:
     """
     Get the contract class definition in the given block at the given address
     """
-    await assert_block_id_is_latest_or_pending(block_id)
+    block_id = await get_state_block_id(block_id)
 
     try:
-        result = await state.starknet_wrapper.get_class_by_address(
+        class_hash = await state.starknet_wrapper.get_class_hash_at(
             int(contract_address, 16), block_id
         )
+        result = await state.starknet_wrapper.get_class_by_hash(class_hash, block_id)
     except StarkException as ex:
         raise RpcError(code=20, message="Contract not found") from ex
 
-    return rpc_contract_class(result)
+    return get_serialized_rpc_class(class_hash, result)
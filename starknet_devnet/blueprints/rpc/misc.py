@@ -6,10 +6,6 @@ from __future__ import annotations
 
 from typing import Union
 
-from starkware.starknet.services.api.feeder_gateway.response_objects import (
-    PENDING_BLOCK_ID,
-)
-
 from starknet_devnet.blueprints.rpc.schema import validate_schema
 from starknet_devnet.blueprints.rpc.structures.responses import (
     EmittedEvent,
@@ -23,47 +19,39 @@ from starknet_devnet.blueprints.rpc.structures.types import (
     RpcError,
 )
 from starknet_devnet.blueprints.rpc.utils import (
-    assert_block_id_is_latest_or_pending,
     get_block_by_block_id,
+    get_state_block_id,
     rpc_felt,
 )
+from starknet_devnet.event_index import EventPosition
 from starknet_devnet.state import state
 
+# separates the block number, transaction index and event index in a cursor
+CURSOR_SEPARATOR = "-"
 
-def check_address(address, event):
-    """
-    Check address.
-    """
-    return event.from_address == int(address, 0)
 
+def _get_emitted_event(block, receipt, event) -> EmittedEvent:
+    return {
+        "from_address": rpc_felt(event.from_address),
+        "keys": [rpc_felt(e) for e in event.keys],
+        "data": [rpc_felt(d) for d in event.data],
+        "block_hash": rpc_felt(block.block_hash),
+        "block_number": block.block_number,
+        "transaction_hash": rpc_felt(receipt.transaction_hash),
+    }
 
-def check_keys(keys, event):
-    """
-    Check keys.
-    """
-    return bool(set(event.keys) & set(keys))
 
+def _parse_cursor(continuation_token: str) -> EventPosition:
+    try:
+        return EventPosition(*map(int, continuation_token.split(CURSOR_SEPARATOR)))
+    except (TypeError, ValueError) as ex:
+        raise RpcError(
+            code=33, message="The supplied continuation token is invalid or unknown"
+        ) from ex
 
-def get_events_from_block(block, address, keys):
-    """
-    Return filtered events.
-    """
-    events = []
-    for receipt, event in [
-        (r, e) for r in block.transaction_receipts for e in r.events
-    ]:
-        if check_keys(keys, event) and check_address(address, event):
-            _event: EmittedEvent = {
-                "from_address": rpc_felt(event.from_address),
-                "keys": [rpc_felt(e) for e in event.keys],
-                "data": [rpc_felt(d) for d in event.data],
-                "block_hash": rpc_felt(block.block_hash),
-                "block_number": block.block_number,
-                "transaction_hash": rpc_felt(receipt.transaction_hash),
-            }
-            events.append(_event)
-
-    return events
+
+def _format_cursor(position: EventPosition) -> str:
+    return CURSOR_SEPARATOR.join(map(str, position))
 
 
 @validate_schema("chainId")
@@ -92,11 +80,13 @@ async def get_events(filter) -> RpcEventsResult:
     """
     Returns all events matching the given filters.
 
-    In our implementation continuation_token is just a number.
+    In our implementation continuation_token is a cursor: the position of the next event,
+    formatted as `<block number>-<transaction index>-<event index>`. Each chunk resumes exactly
+    where the previous one stopped, even if blocks were added in between. A number is still
+    accepted as a token, meaning the number of chunks to skip, and is answered with the next number.
 
-    In state.starknet_wrapper.get_state().events there is no relation between blocks.
-    This is why we need to iterate block by block, take all events,
-    and chunk it later which is not an optimal solution.
+    The events are looked up in the event index of the blocks, which yields them in order,
+    so only the events up to the requested chunk are iterated.
     """
     # Required parameters
     from_block = await get_block_by_block_id(filter.get("from_block"))
@@ -110,34 +100,45 @@ async def get_events(filter) -> RpcEventsResult:
             message=f"invalid chunk_size: '{filter.get('chunk_size')}'",
         ) from ex
 
-    address = filter.get("address")
+    address = int(filter.get("address"), 0)
     keys = [int(k, 0) for k in filter.get("keys")]
     # Optional parameter
-    continuation_token = filter.get("continuation_token", "0")
-
-    events = []
-
-    include_pending = to_block == PENDING_BLOCK_ID
-    block_range = list(range(from_block.block_number, to_block.block_number + 1))
-
-    if include_pending:
-        # pending needs to be included separately as it is not reachable through a number
-        block_range.append(PENDING_BLOCK_ID)
-
-    for block_number in block_range:
-        block = await state.starknet_wrapper.blocks.get_by_number(block_number)
-        if block.transaction_receipts:
-            events.extend(get_events_from_block(block, address, keys))
-
-    # Chunking
-    continuation_token = int(continuation_token)
-    start_index = continuation_token * chunk_size
-    events = events[start_index : start_index + chunk_size]
-
-    # Continuation_token should be increased only if events are not empty
-    if events:
-        continuation_token = continuation_token + 1
-
+    continuation_token = filter.get("continuation_token")
+
+    start = EventPosition(from_block.block_number, 0, 0)
+    if continuation_token is None or not continuation_token.isdigit():
+        if continuation_token is not None:
+            start = max(start, _parse_cursor(continuation_token))
+        found_events = await state.starknet_wrapper.blocks.find_events(
+            address,
+            keys,
+            start=start,
+            to_block_number=to_block.block_number,
+            limit=chunk_size,
+        )
+        if found_events:
+            last_position = found_events[-1][0]
+            start = last_position._replace(event_index=last_position.event_index + 1)
+        continuation_token = _format_cursor(start)
+    else:
+        # Chunking
+        continuation_token = int(continuation_token)
+        found_events = await state.starknet_wrapper.blocks.find_events(
+            address,
+            keys,
+            start=start,
+            to_block_number=to_block.block_number,
+            offset=continuation_token * chunk_size,
+            limit=chunk_size,
+        )
+        # Continuation_token should be increased only if events are not empty
+        if found_events:
+            continuation_token = continuation_token + 1
+
+    events = [
+        _get_emitted_event(block, receipt, event)
+        for _, block, receipt, event in found_events
+    ]
     return RpcEventsResult(events=events, continuation_token=str(continuation_token))
 
 
@@ -146,9 +147,11 @@ async def get_nonce(block_id: BlockId, contract_address: Address) -> Felt:
     """
     Get the nonce associated with the given address in the given block
     """
-    await assert_block_id_is_latest_or_pending(block_id)
+    block_id = await get_state_block_id(block_id)
 
-    if not await state.starknet_wrapper.is_deployed(int(contract_address, 16)):
+    if not await state.starknet_wrapper.is_deployed(
+        int(contract_address, 16), block_id
+    ):
         raise RpcError(code=20, message="Contract not found")
 
     result = await state.starknet_wrapper.get_nonce(
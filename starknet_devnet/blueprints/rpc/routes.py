@@ -6,10 +6,11 @@ https://github.com/starkware-libs/starknet-specs/releases/tag/v0.1.0
 
 from __future__ import annotations
 
+import asyncio
 import inspect
 from typing import Callable, Dict, List, Tuple, Union
 
-from flask import Blueprint, request
+from flask import Blueprint, Response, request
 
 from starknet_devnet.blueprints.rpc.blocks import (
     block_hash_and_number,
@@ -17,6 +18,7 @@ from starknet_devnet.blueprints.rpc.blocks import (
     get_block_transaction_count,
     get_block_with_tx_hashes,
     get_block_with_txs,
+    get_blocks,
 )
 from starknet_devnet.blueprints.rpc.call import call
 from starknet_devnet.blueprints.rpc.classes import (
@@ -40,13 +42,20 @@ from starknet_devnet.blueprints.rpc.transactions import (
     add_deploy_account_transaction,
     add_deploy_transaction,
     add_invoke_transaction,
+    add_transaction_bulk,
     estimate_fee,
     get_transaction_by_block_id_and_index,
     get_transaction_by_hash,
     get_transaction_receipt,
     pending_transactions,
 )
-from starknet_devnet.blueprints.rpc.utils import rpc_error, rpc_response
+from starknet_devnet.blueprints.rpc.utils import (
+    rpc_batch_response,
+    rpc_error,
+    rpc_response,
+)
+from starknet_devnet.read_pool import keep_serial_lock
+from starknet_devnet.state import state
 
 methods = {
     "getBlockWithTxHashes": get_block_with_tx_hashes,
@@ -73,6 +82,17 @@ methods = {
     "addDeclareTransaction": add_declare_transaction,
     "addDeployTransaction": add_deploy_transaction,
     "addDeployAccountTransaction": add_deploy_account_transaction,
+    "addTransactionBulk": add_transaction_bulk,
+    "getBlocks": get_blocks,
+}
+
+# methods changing the state, which are not served by read replicas
+write_methods = {
+    "addInvokeTransaction",
+    "addDeclareTransaction",
+    "addDeployTransaction",
+    "addDeployAccountTransaction",
+    "addTransactionBulk",
 }
 
 rpc = Blueprint("rpc", __name__, url_prefix="/rpc")
@@ -81,12 +101,58 @@ rpc = Blueprint("rpc", __name__, url_prefix="/rpc")
 @rpc.route("", methods=["POST"])
 async def base_route():
     """
-    Base route for RPC calls
+    Base route for RPC calls, either a single call or a batch (an array) of calls
+    """
+    body = request.json
+    if isinstance(body, list):
+        return await handle_batch(body)
+
+    return await handle_call(body)
+
+
+async def handle_batch(bodies: list) -> Response:
     """
+    Handle a batch of calls, answered with an array of their responses in the same order.
+    Consecutive calls of read methods are handled concurrently; writes are handled one at a time,
+    after the preceding calls and before the following ones.
+    """
+    if not bodies:
+        return rpc_error(
+            message_id=None,
+            code=PredefinedRpcErrorCode.INVALID_REQUEST.value,
+            message="Invalid request: empty batch",
+        )
+
+    responses = []
+    reads = []
+    with keep_serial_lock():
+        for body in bodies:
+            if _is_write(body):
+                responses.extend(await asyncio.gather(*reads))
+                reads = []
+                responses.append(await handle_call(body))
+            else:
+                reads.append(handle_call(body))
+        responses.extend(await asyncio.gather(*reads))
+
+    return rpc_batch_response(responses)
+
 
+def _is_write(body) -> bool:
+    return (
+        isinstance(body, dict)
+        and isinstance(body.get("method"), str)
+        and body["method"].replace("starknet_", "") in write_methods
+    )
+
+
+async def handle_call(body: dict) -> Union[dict, Response]:
+    """
+    Handle a single call, returning its response or error
+    """
     message_id = None
     try:
-        method, params, message_id = parse_body(request.json)
+        method, params, message_id = parse_body(body)
         result = await (
             method(*params) if isinstance(params, list) else method(**params)
         )
@@ -116,11 +182,17 @@ def parse_body(body: dict) -> Tuple[Callable, Union[List, dict], int]:
     """
     Parse rpc call body to function name, params and message id
     """
+    if not isinstance(body, dict):
+        raise RpcError(
+            code=PredefinedRpcErrorCode.INVALID_REQUEST.value, message="Invalid request"
+        )
+
     try:
         method_name = body["method"].replace("starknet_", "")
         params: Union[List, dict] = body.get("params") or {}
         message_id = body["id"]
-    except RuntimeError as error:
+    except (KeyError, TypeError, AttributeError) as error:
+        # e.g. a missing or non-string method, or a notification (a call without an id)
         raise RpcError(
             code=PredefinedRpcErrorCode.INVALID_REQUEST.value, message="Invalid request"
         ) from error
@@ -131,6 +203,12 @@ def parse_body(body: dict) -> Tuple[Callable, Union[List, dict], int]:
             message="Method not found",
         )
 
+    if state.replica and method_name in write_methods:
+        raise RpcError(
+            code=PredefinedRpcErrorCode.METHOD_NOT_FOUND.value,
+            message="Method not served by read replicas",
+        )
+
     if not isinstance(params, (List, Dict)):
         raise RpcError(
             code=PredefinedRpcErrorCode.INVALID_PARAMS.value,
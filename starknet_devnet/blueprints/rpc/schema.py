@@ -2,20 +2,30 @@
 Utilities for validating RPC responses against RPC specification
 """
 import json
+import logging
+import threading
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache, wraps
 from itertools import zip_longest
 from typing import Any, Dict, List
 from typing import OrderedDict as OrderedDictType
 from typing import Tuple
 
-from jsonschema import validate
-from jsonschema.exceptions import ValidationError
+from jsonschema.exceptions import ValidationError, best_match
+from jsonschema.protocols import Validator
+from jsonschema.validators import validator_for
 
 from starknet_devnet.blueprints.rpc.rpc_spec import RPC_SPECIFICATION
 from starknet_devnet.blueprints.rpc.rpc_spec_write import RPC_SPECIFICATION_WRITE
+from starknet_devnet.response_cache import SerializedJson
 from starknet_devnet.state import state
 
+logger = logging.getLogger(__name__)
+
+# responses waiting for background validation above this number are not validated
+MAX_PENDING_VALIDATIONS = 1000
+
 
 # Cache the function result so schemas are not reloaded from disk on every call
 @lru_cache
@@ -121,12 +131,47 @@ def _request_schemas_for_method(name: str) -> OrderedDictType[str, Any]:
     return request_schemas
 
 
+def _create_validator(schema: Dict[str, Any]) -> Validator:
+    """
+    Check the schema and create its validator. Validators are reused for all validations,
+    so the schema is checked only once and the `$ref`s resolved by the validator are cached.
+    """
+    validator_class = validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class(schema)
+
+
+def _validate(validator: Validator, instance: Any):
+    """Raise the most relevant error of `instance`, as `jsonschema.validate` does"""
+    error = best_match(validator.iter_errors(instance))
+    if error is not None:
+        raise error
+
+
+@lru_cache
+def _response_validator_for_method(name: str) -> Validator:
+    return _create_validator(_response_schema_for_method(name))
+
+
+@lru_cache
+def _request_validators_for_method(
+    name: str,
+) -> OrderedDictType[str, Tuple[Validator, bool]]:
+    """
+    Return a dict of validators of all parameters, and whether the parameters are required
+    """
+    return OrderedDict(
+        (param_name, (_create_validator(schema), schema["is_required"]))
+        for param_name, schema in _request_schemas_for_method(name).items()
+    )
+
+
 def _assert_valid_rpc_schema(data: Dict[str, Any], method_name: str):
     """
     Check if rpc response is valid against the schema for given method name
     """
-    schema = _response_schema_for_method("starknet_" + method_name)
-    validate(data, schema=schema)
+    validator = _response_validator_for_method("starknet_" + method_name)
+    _validate(validator, data)
 
 
 def _assert_valid_rpc_request(*args, method_name: str, **kwargs):
@@ -135,39 +180,39 @@ def _assert_valid_rpc_request(*args, method_name: str, **kwargs):
 
     Raise ValidationError if not.
     """
-    schemas = _request_schemas_for_method("starknet_" + method_name)
+    validators = _request_validators_for_method("starknet_" + method_name)
 
     if args and kwargs:
         raise ValueError("Cannot validate schemas with both args and kwargs provided.")
 
     if args:
-        if len(args) > len(schemas):
+        if len(args) > len(validators):
             raise ValidationError("Too many arguments provided.")
 
-        for name, arg in zip_longest(schemas.keys(), args, fillvalue="missing"):
+        for name, arg in zip_longest(validators.keys(), args, fillvalue="missing"):
             if arg == "missing":
                 raise ValidationError(f"""Missing positional argument \"{name}\".""")
 
-            validate(arg, schemas[name])
+            validator, _ = validators[name]
+            _validate(validator, arg)
         return
 
     if kwargs:
-        if len(kwargs) > len(schemas):
+        if len(kwargs) > len(validators):
             raise ValidationError("Too many arguments provided.")
 
-        for name, schema in schemas.items():
+        for name, (validator, is_required) in validators.items():
             if name not in kwargs:
-                if schema["is_required"]:
+                if is_required:
                     raise ValidationError(f"""Missing keyword argument \"{name}\".""")
                 continue
 
-            value = kwargs[name]
-            validate(value, schema)
+            _validate(validator, kwargs[name])
         return
 
-    if len(schemas) != 0:
+    if len(validators) != 0:
         raise ValidationError(
-            f"0 arguments provided to function expecting {len(schemas)} arguments."
+            f"0 arguments provided to function expecting {len(validators)} arguments."
         )
 
 
@@ -199,6 +244,139 @@ class ResponseValidationErrorWrapper(Exception):
         return f"""Devnet tried to return invalid value: \"{self.validation_error.message}\""""
 
 
+def assert_valid_rpc_request(*args, method_name: str, **kwargs):
+    """
+    Validate RPC request parameters in respect to RPC specification schemas,
+    unless request validation is disabled.
+
+    Raise ParamsValidationErrorWrapper if not valid.
+    """
+    if state.starknet_wrapper.config.validate_rpc_requests:
+        try:
+            _assert_valid_rpc_request(*args, **kwargs, method_name=method_name)
+        except ValidationError as err:
+            raise ParamsValidationErrorWrapper(err) from err
+
+
+class ResponseValidator:
+    """
+    Validates RPC responses: every response, 1 in `rpc_response_validation_sampling` responses,
+    or in a background thread after the responses were returned, as configured.
+    Only violations found in full validation are returned as errors;
+    violations found in sampled or background validation are logged and counted.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__executor = None
+        self.__n_responses = 0
+        self.__n_validated = 0
+        self.__n_violations = 0
+        self.__n_pending = 0
+        self.__n_dropped = 0
+
+    def __is_sampled(self, sampling: int) -> bool:
+        with self.__lock:
+            self.__n_responses += 1
+            return (self.__n_responses - 1) % sampling == 0
+
+    def __validate(self, result: Any, method_name: str):
+        try:
+            _assert_valid_rpc_schema(result, method_name)
+        except ValidationError:
+            with self.__lock:
+                self.__n_violations += 1
+            raise
+        finally:
+            with self.__lock:
+                self.__n_validated += 1
+
+    def __validate_and_log(self, result: Any, method_name: str):
+        try:
+            self.__validate(result, method_name)
+        except ValidationError as err:
+            logger.warning(
+                "Invalid response of starknet_%s: %s",
+                method_name,
+                ResponseValidationErrorWrapper(err),
+            )
+
+    def __validate_in_background(self, result: Any, method_name: str):
+        try:
+            self.__validate_and_log(result, method_name)
+        finally:
+            with self.__lock:
+                self.__n_pending -= 1
+
+    def __submit(self, result: Any, method_name: str):
+        with self.__lock:
+            if self.__n_pending >= MAX_PENDING_VALIDATIONS:
+                self.__n_dropped += 1
+                return
+            self.__n_pending += 1
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="rpc-validation"
+                )
+
+        self.__executor.submit(self.__validate_in_background, result, method_name)
+
+    def validate(self, result: Any, method_name: str, config):
+        """
+        Validate `result` of `method_name` as specified by `config`.
+        Raise ResponseValidationErrorWrapper if every response is validated and it is not valid.
+        """
+        sampling = config.rpc_response_validation_sampling
+        if not self.__is_sampled(sampling):
+            return
+
+        if config.background_rpc_response_validation:
+            self.__submit(result, method_name)
+        elif sampling > 1:
+            self.__validate_and_log(result, method_name)
+        else:
+            try:
+                self.__validate(result, method_name)
+            except ValidationError as err:
+                raise ResponseValidationErrorWrapper(err) from err
+
+    def wait(self):
+        """Wait until the responses submitted for background validation are validated"""
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+        if executor:
+            executor.shutdown(wait=True)
+
+    def get_metrics(self) -> dict:
+        """
+        Return the number of responses, of validated responses and of violations,
+        and the number of responses waiting for and dropped from background validation
+        """
+        with self.__lock:
+            return {
+                "responses": self.__n_responses,
+                "validated": self.__n_validated,
+                "violations": self.__n_violations,
+                "pending": self.__n_pending,
+                "dropped": self.__n_dropped,
+            }
+
+
+response_validator = ResponseValidator()
+
+
+def assert_valid_rpc_response(result: Any, method_name: str):
+    """
+    Validate RPC response in respect to RPC specification schemas,
+    unless response validation is disabled.
+
+    Raise ResponseValidationErrorWrapper if not valid and every response is validated.
+    """
+    config = state.starknet_wrapper.config
+    if config.validate_rpc_responses:
+        response_validator.validate(result, method_name, config)
+
+
 def validate_schema(method_name: str):
     """
     Decorator ensuring that call to rpc method and its response are valid
@@ -208,21 +386,13 @@ def validate_schema(method_name: str):
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            config = state.starknet_wrapper.config
-
-            if config.validate_rpc_requests:
-                try:
-                    _assert_valid_rpc_request(*args, **kwargs, method_name=method_name)
-                except ValidationError as err:
-                    raise ParamsValidationErrorWrapper(err) from err
+            assert_valid_rpc_request(*args, **kwargs, method_name=method_name)
 
             result = await func(*args, **kwargs)
 
-            if config.validate_rpc_responses:
-                try:
-                    _assert_valid_rpc_schema(result, method_name)
-                except ValidationError as err:
-                    raise ResponseValidationErrorWrapper(err) from err
+            # cached results were validated before being serialized
+            if not isinstance(result, SerializedJson):
+                assert_valid_rpc_response(result, method_name)
 
             return result
 
@@ -8,10 +8,7 @@ from starknet_devnet.blueprints.rpc.structures.types import (
     Felt,
     RpcError,
 )
-from starknet_devnet.blueprints.rpc.utils import (
-    assert_block_id_is_latest_or_pending,
-    rpc_felt,
-)
+from starknet_devnet.blueprints.rpc.utils import get_state_block_id, rpc_felt
 from starknet_devnet.state import state
 
 
@@ -22,9 +19,11 @@ async def get_storage_at(
     """
     Get the value of the storage at the given address and key
     """
-    await assert_block_id_is_latest_or_pending(block_id)
+    block_id = await get_state_block_id(block_id)
 
-    if not await state.starknet_wrapper.is_deployed(int(contract_address, 16)):
+    if not await state.starknet_wrapper.is_deployed(
+        int(contract_address, 16), block_id
+    ):
         raise RpcError(code=20, message="Contract not found")
 
     storage = await state.starknet_wrapper.get_storage_at(
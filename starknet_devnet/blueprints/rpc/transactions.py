@@ -10,7 +10,10 @@ from starkware.starknet.services.api.feeder_gateway.response_objects import (
 from starkware.starknet.services.api.gateway.transaction import AccountTransaction
 from starkware.starkware_utils.error_handling import StarkException
 
-from starknet_devnet.blueprints.rpc.schema import validate_schema
+from starknet_devnet.blueprints.rpc.schema import (
+    assert_valid_rpc_request,
+    validate_schema,
+)
 from starknet_devnet.blueprints.rpc.structures.payloads import (
     RpcBroadcastedDeclareTxn,
     RpcBroadcastedDeployAccountTxn,
@@ -32,13 +35,20 @@ from starknet_devnet.blueprints.rpc.structures.responses import (
     RpcInvokeTransactionResult,
     rpc_transaction_receipt,
 )
-from starknet_devnet.blueprints.rpc.structures.types import BlockId, RpcError, TxnHash
+from starknet_devnet.blueprints.rpc.structures.types import (
+    BlockId,
+    PredefinedRpcErrorCode,
+    RpcError,
+    TxnHash,
+)
 from starknet_devnet.blueprints.rpc.utils import (
-    assert_block_id_is_latest_or_pending,
+    cache_result,
     gateway_felt,
     get_block_by_block_id,
+    get_state_block_id,
     rpc_felt,
 )
+from starknet_devnet.blueprints.shared import cache_declared_class
 from starknet_devnet.state import state
 from starknet_devnet.util import StarknetDevnetException
 
@@ -81,6 +91,11 @@ async def get_transaction_receipt(transaction_hash: TxnHash) -> dict:
     """
     Get the transaction receipt by the transaction hash
     """
+    cache_key = ("getTransactionReceipt", transaction_hash)
+    serialized = state.starknet_wrapper.response_cache.get(cache_key)
+    if serialized is not None:
+        return serialized
+
     try:
         result = await state.starknet_wrapper.transactions.get_transaction_receipt(
             tx_hash=transaction_hash
@@ -91,7 +106,10 @@ async def get_transaction_receipt(transaction_hash: TxnHash) -> dict:
     if result.status == TransactionStatus.NOT_RECEIVED:
         raise RpcError(code=25, message="Transaction hash not found")
 
-    return await rpc_transaction_receipt(result)
+    receipt = await rpc_transaction_receipt(result)
+    if state.starknet_wrapper.transactions.is_final(transaction_hash):
+        return cache_result("getTransactionReceipt", cache_key, receipt)
+    return receipt
 
 
 @validate_schema("pendingTransactions")
@@ -129,6 +147,9 @@ async def add_declare_transaction(
     class_hash, transaction_hash = await state.starknet_wrapper.declare(
         external_tx=declare_transaction
     )
+    await cache_declared_class(
+        class_hash, declare_transaction.contract_class, transaction_hash
+    )
     return RpcDeclareTransactionResult(
         transaction_hash=rpc_felt(transaction_hash),
         class_hash=rpc_felt(class_hash),
@@ -179,6 +200,55 @@ async def add_deploy_account_transaction(
     )
 
 
+_ADD_TRANSACTION_METHODS = {
+    "INVOKE": ("addInvokeTransaction", add_invoke_transaction),
+    "DECLARE": ("addDeclareTransaction", add_declare_transaction),
+    "DEPLOY": ("addDeployTransaction", add_deploy_transaction),
+    "DEPLOY_ACCOUNT": ("addDeployAccountTransaction", add_deploy_account_transaction),
+}
+
+
+async def add_transaction_bulk(transactions: List[RpcBroadcastedTxn]) -> List[dict]:
+    """
+    Submit a list of transactions to be executed in order and added in a single block.
+    A transaction which can't be added is answered with its error, the others are still added.
+    This method is not a part of the RPC specification.
+    """
+    if not isinstance(transactions, list) or any(
+        not isinstance(txn, dict) or txn.get("type") not in _ADD_TRANSACTION_METHODS
+        for txn in transactions
+    ):
+        raise RpcError(
+            code=PredefinedRpcErrorCode.INVALID_PARAMS.value,
+            message="Invalid value for transactions.",
+        )
+
+    # validate all before executing any
+    for txn in transactions:
+        method_name, _ = _ADD_TRANSACTION_METHODS[txn["type"]]
+        assert_valid_rpc_request(txn, method_name=method_name)
+
+    results = []
+    async with state.starknet_wrapper.transaction_bulk():
+        for txn in transactions:
+            _, add_method = _ADD_TRANSACTION_METHODS[txn["type"]]
+            try:
+                results.append(await add_method(txn))
+            except RpcError as error:
+                results.append(
+                    {"error": {"code": error.code, "message": error.message}}
+                )
+
+    # the statuses are known once the bulk is committed
+    for result in results:
+        if "transaction_hash" in result:
+            result["status"] = state.starknet_wrapper.transactions.get_status(
+                result["transaction_hash"]
+            ).name
+
+    return results
+
+
 def make_transaction(txn: RpcBroadcastedTxn) -> AccountTransaction:
     """
     Convert RpcBroadcastedTxn to AccountTransaction
@@ -200,7 +270,7 @@ async def estimate_fee(request: RpcBroadcastedTxn, block_id: BlockId) -> dict:
     """
     Estimate the fee for a given StarkNet transaction
     """
-    await assert_block_id_is_latest_or_pending(block_id)
+    block_id = await get_state_block_id(block_id)
     transaction = make_transaction(request)
     try:
         _, fee_response = await state.starknet_wrapper.calculate_trace_and_fee(
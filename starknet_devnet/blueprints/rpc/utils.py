@@ -1,14 +1,33 @@
 """
 RPC utilities
 """
-from typing import Union
+import json
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from flask import Response
+from starkware.starknet.services.api.feeder_gateway.response_objects import (
+    BlockIdentifier,
+)
+from starkware.starkware_utils.error_handling import StarkException
 
+from starknet_devnet.blueprints.rpc.schema import assert_valid_rpc_response
 from starknet_devnet.blueprints.rpc.structures.types import (
     BlockId,
     Felt,
     PredefinedRpcErrorCode,
     RpcError,
 )
+from starknet_devnet.response_cache import SerializedJson
 from starknet_devnet.state import state
 from starknet_devnet.util import StarknetDevnetException
 
@@ -47,13 +66,13 @@ async def get_block_by_block_id(block_id: BlockId) -> dict:
         raise RpcError(code=24, message="Block not found") from ex
 
 
-async def assert_block_id_is_latest_or_pending(block_id: BlockId) -> None:
+async def get_state_block_id(block_id: BlockId) -> BlockIdentifier:
     """
-    Assert block_id is "latest"/"pending" or a block hash or number of "latest"/"pending" block and throw RpcError otherwise
+    Convert block_id to the identifier of the block whose state is queried.
+    Throw RpcError if block_id is invalid, the block doesn't exist
+    or the state of the block is no longer kept in history
     """
     if isinstance(block_id, dict):
-        last_block = await state.starknet_wrapper.blocks.get_last_block()
-
         if "block_hash" in block_id and "block_number" in block_id:
             raise RpcError(
                 code=-1,
@@ -61,16 +80,29 @@ async def assert_block_id_is_latest_or_pending(block_id: BlockId) -> None:
             )
 
         if "block_hash" in block_id:
-            if int(block_id["block_hash"], 16) == last_block.block_hash:
-                return
-
-        if "block_number" in block_id:
-            if int(block_id["block_number"]) == last_block.block_number:
-                return
+            try:
+                block = await state.starknet_wrapper.blocks.get_by_hash(
+                    block_hash=block_id["block_hash"]
+                )
+            except StarkException as ex:
+                raise RpcError(code=24, message="Block not found") from ex
+            block_number = block.block_number
+        else:
+            block_number = int(block_id["block_number"])
+            if block_number >= state.starknet_wrapper.blocks.get_number_of_blocks():
+                raise RpcError(code=24, message="Block not found")
+
+        if not state.starknet_wrapper.is_state_available(block_number):
+            raise RpcError(
+                code=PredefinedRpcErrorCode.INVALID_PARAMS.value,
+                message="The state of the block is no longer kept in history; "
+                "see --state-history-depth.",
+            )
+        return str(block_number)
 
     if isinstance(block_id, str):
         if block_id in ("latest", "pending"):
-            return
+            return block_id
 
     raise RpcError(
         code=PredefinedRpcErrorCode.INVALID_PARAMS.value,
@@ -109,13 +141,101 @@ def rpc_root(root: str) -> Felt:
     return "0x0" + (root.lstrip("0") or "0")
 
 
-def rpc_response(message_id: int, content: dict) -> dict:
+async def get_cached_result(
+    method_name: str,
+    cache_key: Optional[Hashable],
+    create: Callable[[], Awaitable[Any]],
+) -> Union[Any, SerializedJson]:
     """
-    Wrap response content in rpc format
+    Return the result of `create`, serialized and cached under `cache_key`.
+    With `cache_key` of `None`, the result may still change, so it is neither cached nor serialized.
     """
+    if cache_key is None:
+        return await create()
+
+    serialized = state.starknet_wrapper.response_cache.get(cache_key)
+    if serialized is None:
+        serialized = cache_result(method_name, cache_key, await create())
+    return serialized
+
+
+def cache_result(method_name: str, cache_key: Hashable, result: Any) -> SerializedJson:
+    """Validate `result` of an immutable object, then serialize it and cache it under `cache_key`"""
+    assert_valid_rpc_response(result, method_name)
+    return state.starknet_wrapper.response_cache.put(
+        cache_key, json.dumps(result).encode("utf-8")
+    )
+
+
+# pylint: disable=too-few-public-methods
+class StreamedArray:
+    """Array result whose items, serialized to JSON, are produced while the response is streamed"""
+
+    def __init__(self, items: Iterator[bytes]):
+        self.items = items
+
+
+def _split_envelope(message_id: int) -> Tuple[bytes, bytes]:
+    """Return the serialized rpc response envelope before and after the result"""
+    # the result is the last value of the envelope, so its placeholder is the last null
+    head, _, tail = json.dumps(
+        {"jsonrpc": "2.0", "id": message_id, "result": None}
+    ).rpartition("null")
+    return head.encode("utf-8"), tail.encode("utf-8")
+
+
+def _stream_array(head: bytes, items: Iterator[bytes], tail: bytes) -> Iterator[bytes]:
+    yield head + b"["
+    for index, item in enumerate(items):
+        yield item if index == 0 else b"," + item
+    yield b"]" + tail
+
+
+def rpc_response(message_id: int, content: Any) -> Union[dict, Response]:
+    """
+    Wrap response content in rpc format.
+    Already serialized content is inserted into the response as is, streamed content is streamed.
+    """
+    if isinstance(content, SerializedJson):
+        head, tail = _split_envelope(message_id)
+        return Response(
+            response=head + content + tail, status=200, mimetype="application/json"
+        )
+
+    if isinstance(content, StreamedArray):
+        head, tail = _split_envelope(message_id)
+        return Response(
+            response=_stream_array(head, content.items, tail),
+            status=200,
+            mimetype="application/json",
+        )
+
     return {"jsonrpc": "2.0", "id": message_id, "result": content}
 
 
+def _stream_batch(responses: List[Union[dict, Response]]) -> Iterator[bytes]:
+    yield b"["
+    for index, response in enumerate(responses):
+        if index:
+            yield b","
+        if isinstance(response, Response):
+            # already serialized or streamed
+            yield from response.response
+        else:
+            yield json.dumps(response).encode("utf-8")
+    yield b"]"
+
+
+def rpc_batch_response(responses: List[Union[dict, Response]]) -> Response:
+    """
+    Combine the responses of a batch of calls into an array,
+    streamed so that the streamed responses are produced as before.
+    """
+    return Response(
+        response=_stream_batch(responses), status=200, mimetype="application/json"
+    )
+
+
 def rpc_error(message_id: int, code: int, message: str) -> dict:
     """
     Wrap error in rpc format
@@ -2,11 +2,21 @@
 Shared functions between blueprints
 """
 
+import json
+
 from marshmallow import ValidationError
+from starkware.starknet.services.api.contract_class import ContractClass
+from starkware.starknet.services.api.feeder_gateway.response_objects import (
+    TransactionStatus,
+)
 from starkware.starknet.services.api.gateway.transaction import Transaction
 from starkware.starkware_utils.error_handling import StarkErrorCode
 
+from starknet_devnet.blueprints.rpc.schema import assert_valid_rpc_response
+from starknet_devnet.blueprints.rpc.structures.payloads import rpc_contract_class
 from starknet_devnet.constants import CAIRO_LANG_VERSION
+from starknet_devnet.response_cache import SerializedJson
+from starknet_devnet.state import state
 from starknet_devnet.util import StarknetDevnetException
 
 
@@ -20,3 +30,49 @@ Be sure to use the correct compilation (json) artifact. Devnet-compatible cairo-
         raise StarknetDevnetException(
             code=StarkErrorCode.MALFORMED_REQUEST, message=msg, status_code=400
         ) from err
+
+
+def get_serialized_class(
+    class_hash: int, contract_class: ContractClass
+) -> SerializedJson:
+    """
+    Return `contract_class` as returned by the feeder gateway, serialized and cached by `class_hash`
+    """
+    return state.starknet_wrapper.class_cache.get_or_create(
+        ("get_class_by_hash", class_hash),
+        lambda: json.dumps(contract_class.remove_debug_info().dump()),
+    )
+
+
+def get_serialized_rpc_class(
+    class_hash: int, contract_class: ContractClass
+) -> SerializedJson:
+    """
+    Return `contract_class` as returned by RPC, with a compressed program,
+    validated, serialized and cached by `class_hash`
+    """
+    class_cache = state.starknet_wrapper.class_cache
+    cache_key = ("getClass", class_hash)
+    serialized = class_cache.get(cache_key)
+    if serialized is None:
+        result = rpc_contract_class(contract_class)
+        assert_valid_rpc_response(result, "getClass")
+        serialized = class_cache.put(cache_key, json.dumps(result).encode("utf-8"))
+    return serialized
+
+
+async def cache_declared_class(
+    class_hash: int, contract_class: ContractClass, transaction_hash: int
+):
+    """
+    Cache the serialized forms of a declared class, so it is not serialized when first requested.
+    Nothing is cached if the declaration was rejected.
+    """
+    tx_info = await state.starknet_wrapper.transactions.get_transaction(
+        hex(transaction_hash)
+    )
+    if tx_info.status == TransactionStatus.REJECTED:
+        return
+
+    get_serialized_class(class_hash, contract_class)
+    get_serialized_rpc_class(class_hash, contract_class)
@@ -26,6 +26,14 @@ DUMMY_STATE_ROOT = bytes(32)
 
 DEFAULT_TIMEOUT = 60  # seconds
 
+DEFAULT_STATE_HISTORY_DEPTH = 1000  # blocks
+
+DEFAULT_RESPONSE_CACHE_SIZE = 64  # MiB
+
+DEFAULT_CLASS_CACHE_SIZE = 64  # MiB
+
+REPLICA_SYNC_TIMEOUT = 10  # seconds
+
 OLD_SUPPORTED_VERSIONS = [0]
 
 # account used by StarkNet CLI
@@ -23,10 +23,13 @@ from starkware.starknet.services.api.feeder_gateway.feeder_gateway_client import
 from . import __version__
 from .constants import (
     DEFAULT_ACCOUNTS,
+    DEFAULT_CLASS_CACHE_SIZE,
     DEFAULT_GAS_PRICE,
     DEFAULT_HOST,
     DEFAULT_INITIAL_BALANCE,
     DEFAULT_PORT,
+    DEFAULT_RESPONSE_CACHE_SIZE,
+    DEFAULT_STATE_HISTORY_DEPTH,
     DEFAULT_TIMEOUT,
 )
 from .contract_class_wrapper import (
@@ -186,6 +189,24 @@ class NonNegativeAction(argparse.Action):
         setattr(namespace, self.dest, value)
 
 
+class PositiveAction(argparse.Action):
+    """
+    Action for parsing the positive int argument.
+    """
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        error_msg = f"{option_string} must be a positive integer; got: {values}."
+        try:
+            value = int(values)
+        except ValueError:
+            parser.error(error_msg)
+
+        if value <= 0:
+            parser.error(error_msg)
+
+        setattr(namespace, self.dest, value)
+
+
 def parse_args(raw_args: List[str]):
     """
     Parses CLI arguments.
@@ -228,6 +249,11 @@ def parse_args(raw_args: List[str]):
         help="Introduces speed-up by skipping block hash calculation"
         " - applies sequential numbering instead (0x0, 0x1, 0x2, ...).",
     )
+    parser.add_argument(
+        "--lazy-block-hash",
+        action="store_true",
+        help="Calculate block hashes in the background, waiting for them only when they are requested.",
+    )
     parser.add_argument(
         "--blocks-on-demand",
         action="store_true",
@@ -252,6 +278,11 @@ def parse_args(raw_args: List[str]):
         type=int,
         help="Specify the seed for randomness of accounts to be predeployed",
     )
+    parser.add_argument(
+        "--genesis-cache-dir",
+        help="Specify the directory in which the genesis state is cached across runs, "
+        + "so it is not redeployed on startup; used only with --seed",
+    )
     parser.add_argument(
         "--hide-predeployed-accounts",
         action="store_true",
@@ -301,6 +332,58 @@ def parse_args(raw_args: List[str]):
         default=StarknetChainId.TESTNET,
         help=f"Specify the chain id as string: {{{CHAIN_IDS}}}",
     )
+    parser.add_argument(
+        "--state-history-depth",
+        action=PositiveAction,
+        default=DEFAULT_STATE_HISTORY_DEPTH,
+        help="Specify the number of most recent blocks whose state can be queried; "
+        f"defaults to {DEFAULT_STATE_HISTORY_DEPTH}",
+    )
+    parser.add_argument(
+        "--history-size",
+        action=PositiveAction,
+        help="Specify the number of most recent blocks, state updates and transactions kept in memory; "
+        "older ones are moved to a temporary file on disk; defaults to keeping all in memory",
+    )
+    parser.add_argument(
+        "--response-cache-size",
+        action=NonNegativeAction,
+        default=DEFAULT_RESPONSE_CACHE_SIZE,
+        help="Specify the size in MiB of the cache of serialized blocks, receipts and traces; "
+        f"defaults to {DEFAULT_RESPONSE_CACHE_SIZE} (0 disables the cache)",
+    )
+    parser.add_argument(
+        "--class-cache-size",
+        action=NonNegativeAction,
+        default=DEFAULT_CLASS_CACHE_SIZE,
+        help="Specify the size in MiB of the cache of serialized contract classes; "
+        f"defaults to {DEFAULT_CLASS_CACHE_SIZE} (0 disables the cache)",
+    )
+    parser.add_argument(
+        "--keep-execution-info",
+        action="store_true",
+        help="Keep the full execution info of accepted transactions in memory, "
+        "instead of only their compressed receipts and traces",
+    )
+    parser.add_argument(
+        "--read-workers",
+        action=NonNegativeAction,
+        default=0,
+        help="Specify the number of threads executing calls and fee estimations "
+        "concurrently with other requests; defaults to 0 (executed one request at a time)",
+    )
+    parser.add_argument(
+        "--read-replicas",
+        action=NonNegativeAction,
+        default=0,
+        help="Specify the number of processes serving read-only requests on --replica-port, "
+        "following the blocks of the primary; defaults to 0 (no replicas)",
+    )
+    parser.add_argument(
+        "--replica-port",
+        type=int,
+        help="Specify the port read replicas listen on; defaults to --port + 1",
+    )
     parser.add_argument(
         "--disable-rpc-request-validation",
         action="store_true",
@@ -311,6 +394,19 @@ def parse_args(raw_args: List[str]):
         action="store_true",
         help="Disable RPC schema validation for devnet responses",
     )
+    parser.add_argument(
+        "--rpc-response-validation-sampling",
+        action=PositiveAction,
+        default=1,
+        help="Validate only 1 in N RPC responses, logging the invalid ones instead of "
+        "returning an error; defaults to 1 (every response validated)",
+    )
+    parser.add_argument(
+        "--background-rpc-response-validation",
+        action="store_true",
+        help="Validate RPC responses in a background thread after returning them, "
+        "logging the invalid ones instead of returning an error",
+    )
 
     parsed_args = parser.parse_args(raw_args)
     if parsed_args.dump_on and not parsed_args.dump_path:
@@ -319,6 +415,9 @@ def parse_args(raw_args: List[str]):
     if parsed_args.fork_block and not parsed_args.fork_network:
         sys.exit("Error: --fork-network required if --fork-block present")
 
+    if parsed_args.replica_port is None:
+        parsed_args.replica_port = parsed_args.port + 1
+
     if parsed_args.fork_network:
         parsed_args.fork_block = parsed_args.fork_block or "latest"
         parsed_args.fork_network, parsed_args.fork_block = _get_feeder_gateway_client(
@@ -342,11 +441,24 @@ class DevnetConfig:
         self.start_time = self.args.start_time
         self.gas_price = self.args.gas_price
         self.lite_mode = self.args.lite_mode
+        self.lazy_block_hash = self.args.lazy_block_hash
         self.blocks_on_demand = self.args.blocks_on_demand
         self.account_class = self.args.account_class
         self.hide_predeployed_accounts = self.args.hide_predeployed_accounts
         self.fork_network = self.args.fork_network
         self.fork_block = self.args.fork_block
         self.chain_id = self.args.chain_id
+        self.state_history_depth = self.args.state_history_depth
+        self.history_size = self.args.history_size
+        self.response_cache_size = self.args.response_cache_size
+        self.class_cache_size = self.args.class_cache_size
+        self.keep_execution_info = self.args.keep_execution_info
+        self.read_workers = self.args.read_workers
         self.validate_rpc_requests = not self.args.disable_rpc_request_validation
         self.validate_rpc_responses = not self.args.disable_rpc_response_validation
+        self.rpc_response_validation_sampling = (
+            self.args.rpc_response_validation_sampling
+        )
+        self.background_rpc_response_validation = (
+            self.args.background_rpc_response_validation
+        )
@@ -0,0 +1,176 @@
+"""
+Index of the events emitted in the stored blocks, by emitter address and by key,
+and bloom filters of the events of each block.
+"""
+
+import hashlib
+import heapq
+from bisect import bisect_left
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+from starkware.starknet.services.api.feeder_gateway.response_objects import (
+    TransactionExecution,
+)
+
+# the filters are 2048-bit integers, with 3 bits set per address or key
+BLOOM_BITS = 2048
+BLOOM_HASHES = 3
+
+
+def _get_bloom_bits(value: int) -> int:
+    digest = hashlib.blake2b(
+        value.to_bytes(32, "big"), digest_size=2 * BLOOM_HASHES
+    ).digest()
+    bits = 0
+    for i in range(BLOOM_HASHES):
+        bit_index = int.from_bytes(digest[2 * i : 2 * i + 2], "big")
+        bits |= 1 << (bit_index % BLOOM_BITS)
+    return bits
+
+
+def create_event_bloom(receipts: Sequence[TransactionExecution]) -> int:
+    """Return the bloom filter of the emitter addresses and keys of the events of `receipts`"""
+    bloom = 0
+    for receipt in receipts:
+        for event in receipt.events:
+            bloom |= _get_bloom_bits(event.from_address)
+            for key in event.keys:
+                bloom |= _get_bloom_bits(key)
+    return bloom
+
+
+def create_bloom_matcher(address: int, keys: Iterable[int]) -> Callable[[int], bool]:
+    """
+    Return a function of a bloom filter, returning `False` if no event of its block
+    can be emitted by `address` with any of `keys`. As address and keys are checked independently,
+    `True` does not guarantee that such an event exists.
+    """
+    address_bits = _get_bloom_bits(address)
+    keys_bits = [_get_bloom_bits(key) for key in keys]
+
+    def may_match(bloom: int) -> bool:
+        return bloom & address_bits == address_bits and any(
+            bloom & key_bits == key_bits for key_bits in keys_bits
+        )
+
+    return may_match
+
+
+class EventPosition(NamedTuple):
+    """The position of an event in the stored blocks; positions are ordered by emission"""
+
+    block_number: int
+    transaction_index: int
+    event_index: int
+
+
+def _contains(positions: List[EventPosition], position: EventPosition) -> bool:
+    index = bisect_left(positions, position)
+    return index < len(positions) and positions[index] == position
+
+
+def _iterate_from(
+    positions: List[EventPosition], start: EventPosition
+) -> Iterator[EventPosition]:
+    """Iterate sorted `positions` from `start` on, without copying them"""
+    for index in range(bisect_left(positions, start), len(positions)):
+        yield positions[index]
+
+
+def _merge(
+    positions_lists: Iterable[List[EventPosition]], start: EventPosition
+) -> Iterator[EventPosition]:
+    """Merge sorted `positions_lists` from `start` on, without duplicates"""
+    previous = None
+    for position in heapq.merge(
+        *[_iterate_from(positions, start) for positions in positions_lists]
+    ):
+        if position != previous:
+            yield position
+        previous = position
+
+
+class EventIndex:
+    """
+    Positions of the events of the stored blocks, by the address of the emitting contract
+    and by each of the event keys. The positions in each list are sorted, as blocks are only
+    added after and removed from the end. Positions are shared by the lists they are in.
+    """
+
+    def __init__(self):
+        self.__by_address: Dict[int, List[EventPosition]] = {}
+        self.__by_key: Dict[int, List[EventPosition]] = {}
+
+    def __get_lists(self, receipts: Sequence[TransactionExecution]):
+        for receipt in receipts:
+            for event in receipt.events:
+                yield self.__by_address, event.from_address
+                for key in dict.fromkeys(event.keys):
+                    yield self.__by_key, key
+
+    def add_block(self, block_number: int, receipts: Sequence[TransactionExecution]):
+        """Index the events of the block, which must follow the already indexed blocks"""
+        for transaction_index, receipt in enumerate(receipts):
+            for event_index, event in enumerate(receipt.events):
+                position = EventPosition(block_number, transaction_index, event_index)
+                self.__by_address.setdefault(event.from_address, []).append(position)
+                for key in dict.fromkeys(event.keys):
+                    self.__by_key.setdefault(key, []).append(position)
+
+    def remove_block(self, receipts: Sequence[TransactionExecution]):
+        """Remove the events of the last indexed block, whose `receipts` were indexed"""
+        for index, key in self.__get_lists(receipts):
+            positions = index[key]
+            positions.pop()
+            if not positions:
+                del index[key]
+
+    # pylint: disable=too-many-arguments
+    def find(
+        self,
+        address: int,
+        keys: Iterable[int],
+        start: EventPosition,
+        to_block_number: int,
+        may_match_block: Optional[Callable[[int], bool]] = None,
+    ) -> Iterator[EventPosition]:
+        """
+        Yield the positions, from `start` on and up to block `to_block_number`, of the events
+        emitted by `address` with any of `keys`. The shorter of the matching lists is iterated,
+        the other one is only searched in, unless `may_match_block` rules out the block
+        of the candidate (e.g. by its bloom filter).
+        """
+        address_positions = self.__by_address.get(address, [])
+        keys_positions = [
+            self.__by_key[key] for key in set(keys) if key in self.__by_key
+        ]
+
+        if len(address_positions) <= sum(map(len, keys_positions)):
+            candidates = _iterate_from(address_positions, start)
+            searched_lists = keys_positions
+        else:
+            candidates = _merge(keys_positions, start)
+            searched_lists = [address_positions]
+
+        ruled_out_block_number = None
+        for position in candidates:
+            if position.block_number > to_block_number:
+                return
+            if position.block_number == ruled_out_block_number:
+                continue
+            if may_match_block is not None and not may_match_block(
+                position.block_number
+            ):
+                ruled_out_block_number = position.block_number
+                continue
+            if any(_contains(positions, position) for positions in searched_lists):
+                yield position
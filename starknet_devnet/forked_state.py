@@ -2,11 +2,11 @@
 
 import contextlib
 import json
+from typing import Dict, Tuple
 
 from services.external_api.client import BadRequest
 from starkware.python.utils import to_bytes
 from starkware.starknet.business_logic.state.state import BlockInfo, CachedState
-from starkware.starknet.business_logic.state.state_api import StateReader
 from starkware.starknet.definitions.constants import UNINITIALIZED_CLASS_HASH
 from starkware.starknet.definitions.general_config import StarknetChainId
 from starkware.starknet.services.api.contract_class import ContractClass
@@ -19,6 +19,7 @@ from starkware.starkware_utils.error_handling import StarkException
 
 from .block_info_generator import now
 from .general_config import build_devnet_general_config
+from .layered_state import OriginStateReader
 
 
 def is_originally_starknet_exception(exc: BadRequest):
@@ -35,7 +36,7 @@ def is_originally_starknet_exception(exc: BadRequest):
         return False
 
 
-class ForkedStateReader(StateReader):
+class ForkedStateReader(OriginStateReader):
     """State with a fallback to a forked origin"""
 
     def __init__(
@@ -46,6 +47,13 @@ class ForkedStateReader(StateReader):
         self.__feeder_gateway_client = feeder_gateway_client
         self.__block_number = block_number
 
+        # the origin is fixed at `block_number`, so its responses never change;
+        # cached here since the devnet state above does not keep its reads forever
+        self.__class_hashes: Dict[int, bytes] = {}
+        self.__nonces: Dict[int, int] = {}
+        self.__storage: Dict[Tuple[int, int], int] = {}
+        self.__declared_classes: Dict[bytes, bool] = {}
+
     async def get_contract_class(self, class_hash: bytes) -> ContractClass:
         try:
             with contextlib.redirect_stderr(None):
@@ -61,7 +69,34 @@ class ForkedStateReader(StateReader):
     async def _get_raw_contract_class(self, class_hash: bytes) -> bytes:
         raise NotImplementedError
 
+    async def has_contract_class(self, class_hash: bytes) -> bool:
+        """Check if `class_hash` is declared at the origin; fetched once per class"""
+        if class_hash not in self.__declared_classes:
+            self.__declared_classes[class_hash] = await self.__fetch_has_contract_class(
+                class_hash
+            )
+        return self.__declared_classes[class_hash]
+
+    async def __fetch_has_contract_class(self, class_hash: bytes) -> bool:
+        try:
+            with contextlib.redirect_stderr(None):
+                await self.__feeder_gateway_client.get_class_by_hash(
+                    "0x" + class_hash.hex()
+                )
+            return True
+        except BadRequest as bad_request:
+            if is_originally_starknet_exception(bad_request):
+                return False
+            raise
+
     async def get_class_hash_at(self, contract_address: int) -> bytes:
+        if contract_address not in self.__class_hashes:
+            self.__class_hashes[contract_address] = await self.__fetch_class_hash_at(
+                contract_address
+            )
+        return self.__class_hashes[contract_address]
+
+    async def __fetch_class_hash_at(self, contract_address: int) -> bytes:
         try:
             with contextlib.redirect_stderr(None):
                 class_hash_hex = await self.__feeder_gateway_client.get_class_hash_at(
@@ -75,18 +110,25 @@ class ForkedStateReader(StateReader):
             raise
 
     async def get_nonce_at(self, contract_address: int) -> int:
-        return await self.__feeder_gateway_client.get_nonce(
-            contract_address=contract_address,
-            block_number=self.__block_number,
-        )
+        if contract_address not in self.__nonces:
+            self.__nonces[
+                contract_address
+            ] = await self.__feeder_gateway_client.get_nonce(
+                contract_address=contract_address,
+                block_number=self.__block_number,
+            )
+        return self.__nonces[contract_address]
 
     async def get_storage_at(self, contract_address: int, key: int) -> int:
-        storage_hex = await self.__feeder_gateway_client.get_storage_at(
-            contract_address=contract_address,
-            key=key,
-            block_number=self.__block_number,
-        )
-        return int(storage_hex, 16)
+        address_key_pair = (contract_address, key)
+        if address_key_pair not in self.__storage:
+            storage_hex = await self.__feeder_gateway_client.get_storage_at(
+                contract_address=contract_address,
+                key=key,
+                block_number=self.__block_number,
+            )
+            self.__storage[address_key_pair] = int(storage_hex, 16)
+        return self.__storage[address_key_pair]
 
 
 def get_forked_starknet(
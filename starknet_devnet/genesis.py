@@ -0,0 +1,173 @@
+"""
+Cache of the genesis state, so that restarting (and optionally starting) Devnet
+does not redeploy the fee token, the UDC and the predeployed accounts through the VM.
+
+A genesis template is the pickled `StarknetWrapper` right after these deployments,
+before the genesis block is created. The frozen state layers and the contract classes
+are immutable, so they are not pickled, but shared by all the clones of the template.
+"""
+
+import hashlib
+import io
+import os
+import pickle
+from typing import Any, Dict, List, Optional
+
+import cloudpickle
+from starkware.starknet.services.api.contract_class import ContractClass
+
+from . import __version__
+from .devnet_config import DevnetConfig
+from .layered_state import FrozenStateLayer
+from .read_pool import ReadPool
+from .response_cache import ResponseCache
+from .starknet_wrapper import StarknetWrapper
+from .util import warn
+
+_SHARED_TYPES = (FrozenStateLayer, ContractClass)
+
+
+class _SharingPickler(cloudpickle.CloudPickler):
+    """Pickles references to the immutable objects instead of the objects"""
+
+    def __init__(self, file, shared: List[Any]):
+        super().__init__(file)
+        self.__shared = shared
+        self.__shared_ids: Dict[int, int] = {}
+
+    def persistent_id(self, obj):  # pylint: disable=method-hidden
+        if not isinstance(obj, _SHARED_TYPES):
+            return None
+
+        if id(obj) not in self.__shared_ids:
+            self.__shared_ids[id(obj)] = len(self.__shared)
+            self.__shared.append(obj)
+        return self.__shared_ids[id(obj)]
+
+
+class _SharingUnpickler(pickle.Unpickler):
+    """Resolves the references pickled by `_SharingPickler`"""
+
+    def __init__(self, file, shared: List[Any]):
+        super().__init__(file)
+        self.__shared = shared
+
+    def persistent_load(self, pid):
+        return self.__shared[pid]
+
+
+def get_genesis_key(config: DevnetConfig) -> Optional[str]:
+    """
+    Return the key identifying the genesis state of Devnet run with `config`,
+    or `None` if the genesis state cannot be reused (random accounts or forking).
+    """
+    if config.seed is None or config.fork_network:
+        return None
+
+    genesis_options = (
+        __version__,
+        config.accounts,
+        config.initial_balance,
+        config.seed,
+        config.account_class.hash_bytes.hex(),
+        config.chain_id,
+        config.gas_price,
+        config.start_time,
+        config.lite_mode,
+    )
+    return hashlib.sha256(repr(genesis_options).encode()).hexdigest()
+
+
+class GenesisTemplate:
+    """Genesis state which can be cloned into new, independent instances of `StarknetWrapper`"""
+
+    def __init__(self, payload: bytes, shared: List[Any]):
+        self.__payload = payload
+        self.__shared = shared
+
+    @staticmethod
+    def create(starknet_wrapper: StarknetWrapper) -> "GenesisTemplate":
+        """Create a template of `starknet_wrapper`, which must not be modified afterwards"""
+        shared = []
+        file = io.BytesIO()
+        _SharingPickler(file, shared).dump(starknet_wrapper)
+        return GenesisTemplate(file.getvalue(), shared)
+
+    @staticmethod
+    def load(path: str) -> "GenesisTemplate":
+        """Load a template saved to `path`"""
+        with open(path, "rb") as file:
+            payload, shared = pickle.load(file)
+        return GenesisTemplate(payload, shared)
+
+    def save(self, path: str):
+        """Save the template to `path`, atomically"""
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as file:
+            cloudpickle.dump((self.__payload, self.__shared), file)
+        os.replace(temporary_path, path)
+
+    async def clone(self, config: DevnetConfig) -> StarknetWrapper:
+        """Return a new initialized `StarknetWrapper` with the genesis state of the template"""
+        starknet_wrapper: StarknetWrapper = _SharingUnpickler(
+            io.BytesIO(self.__payload), self.__shared
+        ).load()
+
+        # the options not affecting the genesis state may differ from the template's
+        starknet_wrapper.config = config
+        starknet_wrapper.blocks.lazy_hash = config.lazy_block_hash
+        starknet_wrapper.transactions.keep_execution_info = config.keep_execution_info
+        starknet_wrapper.history_store.max_in_memory = config.history_size
+        starknet_wrapper.response_cache = ResponseCache(
+            config.response_cache_size * 2**20
+        )
+        starknet_wrapper.class_cache = ResponseCache(config.class_cache_size * 2**20)
+        starknet_wrapper.read_pool.shutdown()
+        starknet_wrapper.read_pool = ReadPool(config.read_workers)
+
+        await starknet_wrapper.create_genesis_block()
+        return starknet_wrapper
+
+
+class GenesisCache:
+    """
+    Genesis templates by the key of the config they were created with.
+    If `cache_dir` is set, the templates are also saved to and loaded from it.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir
+        self.__templates: Dict[str, GenesisTemplate] = {}
+
+    def __get_template(self, key: str) -> Optional[GenesisTemplate]:
+        if key not in self.__templates and self.cache_dir:
+            path = os.path.join(self.cache_dir, f"genesis-{key}.pkl")
+            if os.path.isfile(path):
+                try:
+                    self.__templates[key] = GenesisTemplate.load(path)
+                except (OSError, EOFError, pickle.UnpicklingError) as error:
+                    warn(f"Ignoring the cached genesis state {path}: {error}")
+        return self.__templates.get(key)
+
+    def __add_template(self, key: str, template: GenesisTemplate):
+        self.__templates[key] = template
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            template.save(os.path.join(self.cache_dir, f"genesis-{key}.pkl"))
+
+    async def create_starknet_wrapper(self, config: DevnetConfig) -> StarknetWrapper:
+        """Return a new initialized `StarknetWrapper`, cloned from the genesis template if possible"""
+        key = get_genesis_key(config)
+        if key is None:
+            starknet_wrapper = StarknetWrapper(config)
+            await starknet_wrapper.initialize()
+            return starknet_wrapper
+
+        template = self.__get_template(key)
+        if template is None:
+            template_wrapper = StarknetWrapper(config)
+            await template_wrapper.predeploy()
+            template = GenesisTemplate.create(template_wrapper)
+            self.__add_template(key, template)
+
+        return await template.clone(config)
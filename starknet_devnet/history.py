@@ -0,0 +1,289 @@
+"""
+Bounded-memory storage of the block and transaction history.
+
+A `SpillingDict` keeps its most recently inserted entries in memory and spills the older
+ones to its `HistoryStore`, an SQLite database in a temporary file. Spilled entries are
+unpickled from the database on each lookup, they are not brought back to memory.
+A value looked up from disk is a copy: after mutating it, it must be stored again.
+
+Kept in memory regardless of the history size are only the per-entry indexes of the history
+(the positions of the events, the secondary indexes of the transactions), which take a few
+small tuples per event or transaction, and the states of the most recent blocks, which are
+bounded by the state history depth.
+"""
+
+import os
+import pickle
+import sqlite3
+import sys
+import tempfile
+import threading
+import weakref
+from typing import Any, Dict, Generic, Iterator, List, Optional, Tuple, TypeVar
+
+_Key = TypeVar("_Key")
+_Value = TypeVar("_Value")
+
+# stores whose database must be reopened in forked processes (e.g. the server workers)
+_OPEN_STORES: "weakref.WeakSet[HistoryStore]" = weakref.WeakSet()
+
+
+def _remove_database(connection: sqlite3.Connection, path: str):
+    connection.close()
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class HistoryStore:
+    """
+    Creates the dicts of the history, keeping at most `max_in_memory` entries of each in memory.
+    With `max_in_memory` of `None`, nothing is spilled and no database is created.
+    """
+
+    def __init__(self, max_in_memory: Optional[int] = None):
+        self.max_in_memory = max_in_memory
+        self.__dicts: Dict[str, SpillingDict] = {}
+        self.__lock = threading.Lock()
+        self.__path: Optional[str] = None
+        self.__connection: Optional[sqlite3.Connection] = None
+
+    def __getstate__(self):
+        # the spilled entries are pickled by their dicts
+        return {"max_in_memory": self.max_in_memory}
+
+    def __setstate__(self, state: dict):
+        self.__init__(state["max_in_memory"])
+
+    def create_dict(self, table: str) -> "SpillingDict":
+        """Create an empty dict spilling its entries to `table`"""
+        assert table.isidentifier() and table not in self.__dicts
+        spilling_dict = SpillingDict(self, table)
+        self.__dicts[table] = spilling_dict
+        return spilling_dict
+
+    def _add_dict(self, spilling_dict: "SpillingDict"):
+        """Register `spilling_dict` unpickled with this store"""
+        self.__dicts[spilling_dict.table] = spilling_dict
+
+    def _execute(self, sql: str, parameters=()) -> List[tuple]:
+        """Execute `sql` in the database, creating the database if needed"""
+        with self.__lock:
+            if self.__connection is None:
+                file_descriptor, self.__path = tempfile.mkstemp(
+                    prefix="devnet-history-", suffix=".sqlite"
+                )
+                os.close(file_descriptor)
+                self.__connect()
+                weakref.finalize(self, _remove_database, self.__connection, self.__path)
+                _OPEN_STORES.add(self)
+
+            return self.__connection.execute(sql, parameters).fetchall()
+
+    def _execute_many(self, sql: str, parameters: List[tuple]):
+        with self.__lock:
+            self.__connection.executemany(sql, parameters)
+
+    def __connect(self):
+        self.__connection = sqlite3.connect(
+            self.__path, check_same_thread=False, isolation_level=None
+        )
+        # the database is discarded on exit, so it needs no durability
+        self.__connection.execute("PRAGMA journal_mode=OFF")
+        self.__connection.execute("PRAGMA synchronous=OFF")
+
+    def _reconnect(self):
+        """Open a new connection; connections must not be shared with forked processes"""
+        self.__connect()
+
+    def get_metrics(self) -> dict:
+        """Return the number of entries in memory and on disk, and the size of the database"""
+        return {
+            "max_in_memory": self.max_in_memory,
+            "store_size": os.path.getsize(self.__path) if self.__path else 0,
+            **{
+                table: spilling_dict.get_metrics()
+                for table, spilling_dict in self.__dicts.items()
+            },
+        }
+
+
+def _reconnect_stores():
+    for store in list(_OPEN_STORES):
+        store._reconnect()  # pylint: disable=protected-access
+
+
+os.register_at_fork(after_in_child=_reconnect_stores)
+
+
+class SpillingDict(Generic[_Key, _Value]):
+    """
+    Dict keeping its `store.max_in_memory` most recently inserted entries in memory
+    and the older ones in `table` of the store. Keys must be ints (or other values
+    with a deterministic pickle). Only the most recent entries can be removed efficiently.
+    """
+
+    def __init__(self, store: HistoryStore, table: str):
+        self.store = store
+        self.table = table
+        self.__memory: Dict[_Key, _Value] = {}
+        self.__n_spilled = 0
+
+    def __getstate__(self):
+        # pickled with all the entries, including the spilled ones
+        return {"store": self.store, "table": self.table, "items": list(self.items())}
+
+    def __setstate__(self, state: dict):
+        self.__init__(state["store"], state["table"])
+        self.store._add_dict(self)  # pylint: disable=protected-access
+        for key, value in state["items"]:
+            self[key] = value
+
+    def __len__(self) -> int:
+        return len(self.__memory) + self.__n_spilled
+
+    def __contains__(self, key: _Key) -> bool:
+        return key in self.__memory or self.__load(key) is not None
+
+    def __getitem__(self, key: _Key) -> _Value:
+        """
+        Return the value of `key`. A value on disk is unpickled anew on each lookup,
+        so mutating it has no effect unless it is stored again with `self[key] = value`.
+        """
+        if key in self.__memory:
+            return self.__memory[key]
+
+        row = self.__load(key)
+        if row is None:
+            raise KeyError(key)
+        return pickle.loads(row[0])
+
+    def get(self, key: _Key, default: Any = None) -> _Value:
+        """Return the value of `key` if present, otherwise `default`"""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key: _Key, value: _Value):
+        if key not in self.__memory and self.__load(key) is not None:
+            self.store._execute(  # pylint: disable=protected-access
+                f"UPDATE {self.table} SET value = ? WHERE key = ?",
+                (pickle.dumps(value), pickle.dumps(key)),
+            )
+            return
+
+        self.__memory[key] = value
+        self.__spill()
+
+    def pop(self, key: _Key, default: Any = None) -> _Value:
+        """Remove `key` and return its value if present, otherwise return `default`"""
+        if key in self.__memory:
+            return self.__memory.pop(key)
+
+        row = self.__load(key)
+        if row is None:
+            return default
+
+        self.store._execute(  # pylint: disable=protected-access
+            f"DELETE FROM {self.table} WHERE key = ?", (pickle.dumps(key),)
+        )
+        self.__n_spilled -= 1
+        return pickle.loads(row[0])
+
+    def popitem(self) -> Tuple[_Key, _Value]:
+        """Remove and return the most recently inserted entry"""
+        if self.__memory:
+            return self.__memory.popitem()
+
+        if not self.__n_spilled:
+            raise KeyError("popitem(): dictionary is empty")
+
+        # pylint: disable=protected-access
+        position, key, value = self.store._execute(
+            f"SELECT position, key, value FROM {self.table} ORDER BY position DESC LIMIT 1"
+        )[0]
+        self.store._execute(f"DELETE FROM {self.table} WHERE position = ?", (position,))
+        self.__n_spilled -= 1
+        return pickle.loads(key), pickle.loads(value)
+
+    def values_since(self, start: int) -> List[_Value]:
+        """Return the values inserted after the first `start` entries, in the insertion order"""
+        spilled_values = []
+        if start < self.__n_spilled:
+            rows = self.store._execute(  # pylint: disable=protected-access
+                f"SELECT value FROM {self.table} ORDER BY position LIMIT -1 OFFSET ?",
+                (start,),
+            )
+            spilled_values = [pickle.loads(value) for (value,) in rows]
+
+        memory_start = max(start - self.__n_spilled, 0)
+        return spilled_values + list(self.__memory.values())[memory_start:]
+
+    def items(self) -> Iterator[Tuple[_Key, _Value]]:
+        """Iterate over the entries in the insertion order"""
+        if self.__n_spilled:
+            rows = self.store._execute(  # pylint: disable=protected-access
+                f"SELECT key, value FROM {self.table} ORDER BY position"
+            )
+            for key, value in rows:
+                yield pickle.loads(key), pickle.loads(value)
+
+        yield from list(self.__memory.items())
+
+    def get_metrics(self) -> dict:
+        """Return the number of entries in memory and on disk"""
+        return {"in_memory": len(self.__memory), "on_disk": self.__n_spilled}
+
+    def __load(self, key: _Key) -> Optional[tuple]:
+        if not self.__n_spilled:
+            return None
+
+        rows = self.store._execute(  # pylint: disable=protected-access
+            f"SELECT value FROM {self.table} WHERE key = ?", (pickle.dumps(key),)
+        )
+        return rows[0] if rows else None
+
+    def __spill(self):
+        max_in_memory = self.store.max_in_memory
+        if max_in_memory is None or len(self.__memory) <= max_in_memory:
+            return
+
+        if not self.__n_spilled:
+            self.store._execute(  # pylint: disable=protected-access
+                f"CREATE TABLE IF NOT EXISTS {self.table} "
+                "(position INTEGER PRIMARY KEY, key BLOB UNIQUE, value BLOB)"
+            )
+
+        spilled = []
+        while len(self.__memory) > max_in_memory:
+            key = next(iter(self.__memory))
+            spilled.append((pickle.dumps(key), pickle.dumps(self.__memory.pop(key))))
+
+        self.store._execute_many(  # pylint: disable=protected-access
+            f"INSERT INTO {self.table} (key, value) VALUES (?, ?)", spilled
+        )
+        self.__n_spilled += len(spilled)
+
+
+def get_process_memory() -> dict:
+    """Return the current and the peak resident set size of the process, in bytes"""
+    rss = None
+    try:
+        with open("/proc/self/statm", encoding="utf-8") as statm:
+            rss = int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        pass
+
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # reported in kilobytes on Linux and in bytes on macOS
+        if sys.platform != "darwin":
+            max_rss *= 1024
+    except ImportError:
+        max_rss = None
+
+    return {"rss": rss, "max_rss": max_rss}
@@ -0,0 +1,257 @@
+"""
+Copy-on-write layering of the devnet state.
+
+After each transaction, the writes of the mutable `CachedState` are frozen into
+an immutable `FrozenStateLayer` stacked on top of the previous layers, and execution
+continues in a fresh `CachedState` reading from that layer. Preserving the previous
+state therefore costs O(tx writes) instead of a deep copy of the whole state.
+
+The mutable `JournaledCachedState` doubles as the write journal of the current
+transaction: its cache holds the storage, nonce and class hash writes, and it records
+the classes declared through it, so the state diff can be built without re-reading.
+"""
+
+from abc import abstractmethod
+from typing import Dict, Optional, Set, Tuple, Union
+
+from starkware.starknet.business_logic.state.state import (
+    CachedState,
+    ContractClassCache,
+)
+from starkware.starknet.business_logic.state.state_api import StateReader
+from starkware.starknet.business_logic.state.state_api_objects import BlockInfo
+from starkware.starknet.services.api.contract_class import ContractClass
+
+
+class OriginStateReader(StateReader):
+    """
+    Base reader of a state with classes declared before the devnet started, e.g. the origin of a fork.
+    """
+
+    @abstractmethod
+    async def has_contract_class(self, class_hash: bytes) -> bool:
+        """Check if `class_hash` is declared, without raising if it's not"""
+
+
+class FrozenStateLayer(StateReader):
+    """
+    Immutable set of state writes on top of a parent reader.
+    Reads not satisfied by this layer are delegated to the parent.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        parent: StateReader,
+        class_hashes: Dict[int, bytes],
+        nonces: Dict[int, int],
+        storage: Dict[Tuple[int, int], int],
+        contract_classes: Dict[bytes, ContractClass],
+    ):
+        self.parent = parent
+        self.class_hashes = class_hashes
+        self.nonces = nonces
+        self.storage = storage
+        self.contract_classes = contract_classes
+
+    def __deepcopy__(self, memo):
+        # the layer is never mutated, so it can be shared by all copies
+        return self
+
+    @property
+    def size(self) -> int:
+        """Number of entries written in this layer"""
+        return (
+            len(self.class_hashes)
+            + len(self.nonces)
+            + len(self.storage)
+            + len(self.contract_classes)
+        )
+
+    async def get_contract_class(self, class_hash: bytes) -> ContractClass:
+        layer = self
+        while isinstance(layer, FrozenStateLayer):
+            if class_hash in layer.contract_classes:
+                return layer.contract_classes[class_hash]
+            layer = layer.parent
+        return await layer.get_contract_class(class_hash)
+
+    async def _get_raw_contract_class(self, class_hash: bytes) -> bytes:
+        raise NotImplementedError
+
+    async def get_class_hash_at(self, contract_address: int) -> bytes:
+        layer = self
+        while isinstance(layer, FrozenStateLayer):
+            if contract_address in layer.class_hashes:
+                return layer.class_hashes[contract_address]
+            layer = layer.parent
+        return await layer.get_class_hash_at(contract_address)
+
+    async def get_nonce_at(self, contract_address: int) -> int:
+        layer = self
+        while isinstance(layer, FrozenStateLayer):
+            if contract_address in layer.nonces:
+                return layer.nonces[contract_address]
+            layer = layer.parent
+        return await layer.get_nonce_at(contract_address)
+
+    async def get_storage_at(self, contract_address: int, key: int) -> int:
+        address_key_pair = (contract_address, key)
+        layer = self
+        while isinstance(layer, FrozenStateLayer):
+            if address_key_pair in layer.storage:
+                return layer.storage[address_key_pair]
+            layer = layer.parent
+        return await layer.get_storage_at(contract_address, key)
+
+    def merge(self, child: "FrozenStateLayer") -> "FrozenStateLayer":
+        """
+        Return a new layer equivalent to `child` stacked on top of this layer.
+        Neither of the two layers is modified.
+        """
+        assert child.parent is self
+        return FrozenStateLayer(
+            parent=self.parent,
+            class_hashes={**self.class_hashes, **child.class_hashes},
+            nonces={**self.nonces, **child.nonces},
+            storage={**self.storage, **child.storage},
+            contract_classes={**self.contract_classes, **child.contract_classes},
+        )
+
+
+async def _is_class_frozen(state_reader: StateReader, class_hash: bytes) -> bool:
+    """
+    Check if `class_hash` was set in any of the frozen layers below `state_reader`,
+    or is declared in the origin below them.
+    Any other base reader holds no classes (e.g. of a devnet which is not forked), so it isn't queried.
+    """
+    while isinstance(state_reader, CachedState):
+        state_reader = state_reader.state_reader
+    while isinstance(state_reader, FrozenStateLayer):
+        if class_hash in state_reader.contract_classes:
+            return True
+        state_reader = state_reader.parent
+
+    if isinstance(state_reader, OriginStateReader):
+        return await state_reader.has_contract_class(class_hash)
+    return False
+
+
+class JournaledCachedState(CachedState):
+    """
+    A `CachedState` which additionally journals the hashes of the classes declared
+    through it, i.e. the classes not present in the frozen layers below it.
+    """
+
+    def __init__(
+        self,
+        block_info: BlockInfo,
+        state_reader: StateReader,
+        contract_class_cache: Optional[ContractClassCache] = None,
+    ):
+        super().__init__(
+            block_info=block_info,
+            state_reader=state_reader,
+            contract_class_cache=contract_class_cache,
+        )
+        self.declared_class_hashes: Set[bytes] = set()
+
+    async def set_contract_class(
+        self, class_hash: bytes, contract_class: ContractClass
+    ):
+        await super().set_contract_class(class_hash, contract_class)
+        if not await _is_class_frozen(self.state_reader, class_hash):
+            self.declared_class_hashes.add(class_hash)
+
+    def forget_declared_classes(self, preserved: Set[bytes]):
+        """Forget the classes declared since `preserved` was journaled, e.g. by a rejected transaction"""
+        self.declared_class_hashes.intersection_update(preserved)
+
+    def _copy(self) -> "JournaledCachedState":
+        return JournaledCachedState(
+            block_info=self.block_info,
+            state_reader=self,
+            contract_class_cache=self.contract_classes,
+        )
+
+    def _apply(self, parent: CachedState):
+        super()._apply(parent)
+        if isinstance(parent, JournaledCachedState):
+            parent.declared_class_hashes.update(self.declared_class_hashes)
+
+
+def _compact(layer: FrozenStateLayer) -> FrozenStateLayer:
+    """
+    Merge `layer` into its parents while they are not bigger than it.
+    Keeps the layer sizes geometrically decreasing towards the top, so the depth of the
+    chain (and the cost of a read) stays logarithmic in the number of frozen writes.
+    """
+    while (
+        isinstance(layer.parent, FrozenStateLayer) and layer.parent.size <= layer.size
+    ):
+        layer = layer.parent.merge(layer)
+    return layer
+
+
+def freeze_cached_state(
+    cached_state: CachedState,
+) -> Tuple[Union[FrozenStateLayer, StateReader], JournaledCachedState]:
+    """
+    Freeze the writes of `cached_state` into an immutable layer.
+    Returns the frozen layer and a new empty `JournaledCachedState` on top of it.
+    `cached_state` must not be written to afterwards.
+    """
+    cache = cached_state.cache
+    # pylint: disable=protected-access
+    if (
+        cache._class_hash_writes
+        or cache._nonce_writes
+        or cache._storage_writes
+        or cached_state.contract_classes
+    ):
+        layer = _compact(
+            FrozenStateLayer(
+                parent=cached_state.state_reader,
+                class_hashes=cache._class_hash_writes,
+                nonces=cache._nonce_writes,
+                storage=cache._storage_writes,
+                # copied because the old state may still cache its class reads here
+                contract_classes=dict(cached_state.contract_classes),
+            )
+        )
+    else:
+        layer = cached_state.state_reader
+
+    new_cached_state = JournaledCachedState(
+        block_info=cached_state.block_info,
+        state_reader=layer,
+        contract_class_cache={},
+    )
+    return layer, new_cached_state
+
+
+def snapshot_cached_state(
+    cached_state: CachedState,
+) -> Union[FrozenStateLayer, StateReader]:
+    """
+    Return an immutable reader of the current contents of `cached_state`.
+    Unlike `freeze_cached_state`, `cached_state` can still be written to afterwards,
+    so its writes since the last freezing are copied into the returned layer.
+    """
+    cache = cached_state.cache
+    # pylint: disable=protected-access
+    if not (
+        cache._class_hash_writes
+        or cache._nonce_writes
+        or cache._storage_writes
+        or cached_state.contract_classes
+    ):
+        return cached_state.state_reader
+
+    return FrozenStateLayer(
+        parent=cached_state.state_reader,
+        class_hashes=dict(cache._class_hash_writes),
+        nonces=dict(cache._nonce_writes),
+        storage=dict(cache._storage_writes),
+        contract_classes=dict(cached_state.contract_classes),
+    )
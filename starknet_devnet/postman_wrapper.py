@@ -3,6 +3,7 @@ This module wraps the usage of Postman for L1 <> L2 interaction.
 """
 import json
 from abc import ABC, abstractmethod
+from typing import Optional
 
 from starkware.eth.eth_test_utils import EthAccount, EthContract
 from starkware.solidity.utils import load_nearby_contract
@@ -122,6 +123,25 @@ and that the Messaging Contract is deployed at the provided address ({contract_a
             transactions_to_execute,
         )
 
+    def get_checkpoint(self) -> Optional[int]:
+        """Return the number of consumed L2 -> L1 messages, or `None` if no L1 network is loaded"""
+        if self.__postman_wrapper is None:
+            return None
+        return self.__postman_wrapper.postman.n_consumed_l2_to_l1_messages
+
+    def revert(self, checkpoint: Optional[int], n_l2_to_l1_messages: int):
+        """
+        Revert the number of consumed L2 -> L1 messages to `checkpoint`, after the messages log
+        was truncated to `n_l2_to_l1_messages`. The messages already sent to L1 stay there.
+        """
+        if self.__postman_wrapper is None:
+            return
+
+        postman = self.__postman_wrapper.postman
+        if checkpoint is None:  # loaded after the checkpoint
+            checkpoint = postman.n_consumed_l2_to_l1_messages
+        postman.n_consumed_l2_to_l1_messages = min(checkpoint, n_l2_to_l1_messages)
+
 
 class PostmanWrapper(ABC):
     """Postman Wrapper base class"""
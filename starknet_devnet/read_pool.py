@@ -0,0 +1,159 @@
+"""
+Pool of threads executing read-only requests (calls and fee estimations).
+
+Requests are served while holding `SERIAL_LOCK`, so they are processed one at a time.
+A read submitted to the pool is executed against an immutable snapshot of the state,
+so the lock is released while the read is queued and executed, letting other requests
+(e.g. transactions) be served meanwhile.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Iterable, Iterator, Optional
+
+# held by every request being served, except while its read is executed in the pool
+SERIAL_LOCK = threading.Lock()
+
+# set while serving requests whose reads are awaited concurrently, e.g. the requests of a batch
+_KEEP_SERIAL_LOCK = contextvars.ContextVar("keep_serial_lock", default=False)
+
+
+@contextmanager
+def keep_serial_lock():
+    """
+    Within this context, reads executed in the pool do not release `SERIAL_LOCK`,
+    so several reads of the request holding it can be awaited concurrently,
+    while the state is not changed by other requests.
+    """
+    token = _KEEP_SERIAL_LOCK.set(True)
+    try:
+        yield
+    finally:
+        _KEEP_SERIAL_LOCK.reset(token)
+
+
+def stream_serially(
+    produce: Callable[[Any], Awaitable[Optional[bytes]]], items: Iterable
+) -> Iterator[bytes]:
+    """
+    Yield the result of `produce(item)` for each of `items`, as the body of a streamed response.
+    The body is streamed after its request released `SERIAL_LOCK`, so the lock is acquired
+    for producing each item, letting other requests be served between the items.
+    The stream ends early if `produce` returns `None`, e.g. if the item was removed meanwhile.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        for item in items:
+            with SERIAL_LOCK:
+                chunk = loop.run_until_complete(produce(item))
+            if chunk is None:
+                break
+            yield chunk
+    finally:
+        loop.close()
+
+
+# pylint: disable=too-many-instance-attributes
+class ReadPool:
+    """
+    Executes reads on `n_workers` threads, each with its own event loop.
+    With no workers, reads are executed directly in the calling event loop.
+    """
+
+    def __init__(self, n_workers: int):
+        self.n_workers = n_workers
+        self.__executor = (
+            ThreadPoolExecutor(max_workers=n_workers, thread_name_prefix="read-pool")
+            if n_workers
+            else None
+        )
+
+        self.__metrics_lock = threading.Lock()
+        self.__queue_depth = 0
+        self.__max_queue_depth = 0
+        self.__n_active = 0
+        self.__n_completed = 0
+        self.__last_snapshot_age = 0.0
+        self.__max_snapshot_age = 0.0
+
+    def __getstate__(self):
+        # threads cannot be pickled, the pool is recreated when loaded
+        return {"n_workers": self.n_workers}
+
+    def __setstate__(self, state: dict):
+        self.__init__(state["n_workers"])
+
+    def shutdown(self):
+        """Stop accepting reads; the already submitted ones are still executed."""
+        if self.__executor:
+            self.__executor.shutdown(wait=False)
+
+    async def run(
+        self, read: Callable[..., Awaitable], snapshot: Any, *args: Any
+    ) -> Any:
+        """
+        Return the result of `read(snapshot, *args)`.
+        `snapshot` must have been taken just before this call and must not be shared.
+        If the pool has workers, this must be called while holding `SERIAL_LOCK`,
+        which is released while the read is executed, unless within `keep_serial_lock`.
+        """
+        if self.__executor is None:
+            return await read(snapshot, *args)
+
+        snapshot_time = time.monotonic()
+        with self.__metrics_lock:
+            self.__queue_depth += 1
+            self.__max_queue_depth = max(self.__max_queue_depth, self.__queue_depth)
+
+        future = self.__executor.submit(
+            self.__execute, snapshot_time, read, snapshot, *args
+        )
+        if _KEEP_SERIAL_LOCK.get():
+            return await asyncio.wrap_future(future)
+
+        SERIAL_LOCK.release()
+        try:
+            return await asyncio.wrap_future(future)
+        finally:
+            SERIAL_LOCK.acquire()  # pylint: disable=consider-using-with
+
+    def __execute(
+        self,
+        snapshot_time: float,
+        read: Callable[..., Awaitable],
+        *args: Any,
+    ) -> Any:
+        with self.__metrics_lock:
+            self.__queue_depth -= 1
+            self.__n_active += 1
+            self.__last_snapshot_age = time.monotonic() - snapshot_time
+            self.__max_snapshot_age = max(
+                self.__max_snapshot_age, self.__last_snapshot_age
+            )
+
+        try:
+            return asyncio.run(read(*args))
+        finally:
+            with self.__metrics_lock:
+                self.__n_active -= 1
+                self.__n_completed += 1
+
+    def get_metrics(self) -> dict:
+        """
+        Return the pool metrics. The age of a snapshot is the time (in seconds)
+        that passed between taking it and starting the execution of its read.
+        """
+        with self.__metrics_lock:
+            return {
+                "workers": self.n_workers,
+                "queue_depth": self.__queue_depth,
+                "max_queue_depth": self.__max_queue_depth,
+                "active": self.__n_active,
+                "completed": self.__n_completed,
+                "last_snapshot_age": self.__last_snapshot_age,
+                "max_snapshot_age": self.__max_snapshot_age,
+            }
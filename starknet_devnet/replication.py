@@ -0,0 +1,328 @@
+"""
+Replication of the devnet state to read replicas.
+
+The primary process owns all the writes. After each request, it publishes the blocks
+and transactions created by the request over a Unix socket. Read replicas run in other
+processes: each starts from a snapshot of the primary's `StarknetWrapper` and then applies
+the published updates, serving read-only requests in parallel with the primary.
+"""
+
+import asyncio
+import queue
+import socket
+import struct
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import cloudpickle as pickle
+from flask import Request
+from starkware.starknet.definitions.error_codes import StarknetErrorCode
+from starkware.starknet.services.api.contract_class import ContractClass
+from starkware.starknet.services.api.feeder_gateway.response_objects import (
+    BlockStateUpdate,
+    StarknetBlock,
+)
+from starkware.starkware_utils.error_handling import StarkErrorCode
+
+from .constants import REPLICA_SYNC_TIMEOUT
+from .read_pool import SERIAL_LOCK
+from .starknet_wrapper import StarknetWrapper
+from .transactions import DevnetTransaction
+from .util import StarknetDevnetException
+
+# blueprints served by read replicas
+REPLICA_BLUEPRINTS = {"feeder_gateway", "rpc"}
+# endpoints outside of `REPLICA_BLUEPRINTS` served by read replicas
+REPLICA_ENDPOINTS = {
+    "api",
+    "base.is_alive",
+    "base.get_balance",
+    "base.get_predeployed_accounts",
+    "base.get_fee_token",
+    "base.fork_status",
+    "base.read_pool_metrics",
+}
+
+_MESSAGE_LENGTH = struct.Struct(">Q")
+_SNAPSHOT = "snapshot"
+_UPDATE = "update"
+
+
+@dataclass
+class ReplicatedBlock:
+    """A block generated by the primary, with the classes declared in it"""
+
+    block: StarknetBlock
+    state_update: BlockStateUpdate
+    contract_classes: Dict[int, ContractClass]
+
+
+@dataclass
+class ReplicationUpdate:
+    """Blocks and transactions created by the primary since the previous update"""
+
+    blocks: List[ReplicatedBlock]
+    transactions: List[DevnetTransaction]
+
+
+def _send_message(sock: socket.socket, message: bytes):
+    sock.sendall(_MESSAGE_LENGTH.pack(len(message)) + message)
+
+
+def _receive_exactly(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise EOFError("Connection to the primary closed")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _receive_message(sock: socket.socket) -> Any:
+    (length,) = _MESSAGE_LENGTH.unpack(_receive_exactly(sock, _MESSAGE_LENGTH.size))
+    return pickle.loads(_receive_exactly(sock, length))
+
+
+class ReplicationPublisher:
+    """
+    Publishes the changes of the primary to the connected read replicas.
+    The socket is bound on creation, so replicas can connect before `start` is called.
+    """
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self.__server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.__server_socket.bind(socket_path)
+        self.__server_socket.listen()
+
+        self.__replica_queues: List[queue.Queue] = []
+        self.__starknet_wrapper: StarknetWrapper = None
+        self.__snapshot_message: Optional[bytes] = None
+        self.__n_blocks = 0
+        self.__n_transactions = 0
+
+    def start(self, starknet_wrapper: StarknetWrapper):
+        """Start accepting replicas, which are first sent a snapshot of `starknet_wrapper`"""
+        self.__reset(starknet_wrapper)
+        threading.Thread(target=self.__accept_replicas, daemon=True).start()
+
+    def __reset(self, starknet_wrapper: StarknetWrapper):
+        self.__starknet_wrapper = starknet_wrapper
+        self.__snapshot_message = None
+        self.__n_blocks = starknet_wrapper.blocks.get_number_of_blocks()
+        self.__n_transactions = starknet_wrapper.transactions.get_count()
+
+    def __get_snapshot_message(self) -> bytes:
+        if self.__snapshot_message is None:
+            self.__snapshot_message = pickle.dumps((_SNAPSHOT, self.__starknet_wrapper))
+        return self.__snapshot_message
+
+    def __accept_replicas(self):
+        while True:
+            connection, _ = self.__server_socket.accept()
+            replica_queue = queue.Queue()
+            # the snapshot must not miss nor precede any of the published updates
+            with SERIAL_LOCK:
+                replica_queue.put(self.__get_snapshot_message())
+                self.__replica_queues.append(replica_queue)
+
+            threading.Thread(
+                target=self.__send_messages,
+                args=(connection, replica_queue),
+                daemon=True,
+            ).start()
+
+    def __send_messages(self, connection: socket.socket, replica_queue: queue.Queue):
+        with connection:
+            while True:
+                message = replica_queue.get()
+                try:
+                    _send_message(connection, message)
+                except OSError:
+                    break
+
+        with SERIAL_LOCK:
+            self.__replica_queues.remove(replica_queue)
+
+    def __broadcast(self, message: bytes):
+        for replica_queue in self.__replica_queues:
+            replica_queue.put(message)
+
+    def publish(self, starknet_wrapper: StarknetWrapper):
+        """
+        Publish the changes made to `starknet_wrapper` since the previous publication.
+        If it was replaced (e.g. restarted or loaded) or reverted, publish a snapshot of it instead.
+        Must be called while holding `SERIAL_LOCK`.
+        """
+        if (
+            starknet_wrapper is not self.__starknet_wrapper
+            # reverted to a snapshot
+            or starknet_wrapper.blocks.get_number_of_blocks() < self.__n_blocks
+            or starknet_wrapper.transactions.get_count() < self.__n_transactions
+        ):
+            self.__reset(starknet_wrapper)
+            self.__broadcast(self.__get_snapshot_message())
+            return
+
+        update = asyncio.run(self.__get_update())
+        if update.blocks or update.transactions:
+            self.__snapshot_message = None
+            self.__broadcast(pickle.dumps((_UPDATE, update)))
+
+    async def __get_update(self) -> ReplicationUpdate:
+        starknet_wrapper = self.__starknet_wrapper
+
+        # includes pending transactions, which are republished once they are in a block
+        transactions = {
+            transaction.transaction_hash: transaction
+            for transaction in starknet_wrapper.transactions.get_stored_since(
+                self.__n_transactions
+            )
+        }
+        self.__n_transactions = starknet_wrapper.transactions.get_count()
+
+        blocks = []
+        n_blocks = starknet_wrapper.blocks.get_number_of_blocks()
+        for block_number in range(self.__n_blocks, n_blocks):
+            block = await starknet_wrapper.blocks.get_by_number(block_number)
+            state_update = await starknet_wrapper.blocks.get_state_update(
+                block_number=block_number
+            )
+            contract_classes = {
+                class_hash: await starknet_wrapper.get_class_by_hash(class_hash)
+                for class_hash in state_update.state_diff.declared_contracts
+            }
+            blocks.append(ReplicatedBlock(block, state_update, contract_classes))
+
+            for transaction in block.transactions:
+                transactions[
+                    transaction.transaction_hash
+                ] = starknet_wrapper.transactions.get_devnet_transaction(
+                    transaction.transaction_hash
+                )
+        self.__n_blocks = n_blocks
+
+        return ReplicationUpdate(
+            blocks=blocks, transactions=list(transactions.values())
+        )
+
+
+class ReplicaSubscriber:
+    """Keeps a read replica up to date with the updates published by the primary"""
+
+    def __init__(
+        self,
+        socket_path: str,
+        set_starknet_wrapper: Callable[[StarknetWrapper], None],
+    ):
+        self.socket_path = socket_path
+        self.__set_starknet_wrapper = set_starknet_wrapper
+        self.__socket: socket.socket = None
+        self.__starknet_wrapper: StarknetWrapper = None
+        self.__block_number = -1
+        self.__block_number_changed = threading.Condition()
+
+    def start(self):
+        """Connect to the primary, apply its snapshot and follow its updates in the background"""
+        self.__socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.__socket.connect(self.socket_path)
+        self.__apply(_receive_message(self.__socket))
+        threading.Thread(target=self.__follow, daemon=True).start()
+
+    def __follow(self):
+        while True:
+            try:
+                message = _receive_message(self.__socket)
+            except (EOFError, OSError) as error:
+                print(
+                    f"Replica stopped following the primary: {error}", file=sys.stderr
+                )
+                return
+
+            with SERIAL_LOCK:
+                self.__apply(message)
+
+    def __apply(self, message: tuple):
+        kind, payload = message
+        if kind == _SNAPSHOT:
+            self.__starknet_wrapper = payload
+            self.__set_starknet_wrapper(payload)
+        else:
+            asyncio.run(self.__apply_update(payload))
+
+        with self.__block_number_changed:
+            self.__block_number = (
+                self.__starknet_wrapper.blocks.get_number_of_blocks() - 1
+            )
+            self.__block_number_changed.notify_all()
+
+    async def __apply_update(self, update: ReplicationUpdate):
+        for replicated_block in update.blocks:
+            await self.__starknet_wrapper.apply_replicated_block(
+                block=replicated_block.block,
+                state_update=replicated_block.state_update,
+                contract_classes=replicated_block.contract_classes,
+            )
+
+        for transaction in update.transactions:
+            self.__starknet_wrapper.transactions.store(
+                transaction.transaction_hash, transaction
+            )
+
+    def __wait_for_block(self, block_number: int):
+        if self.__block_number >= block_number:
+            return
+
+        # let the updates be applied while waiting
+        SERIAL_LOCK.release()
+        try:
+            with self.__block_number_changed:
+                reached = self.__block_number_changed.wait_for(
+                    lambda: self.__block_number >= block_number,
+                    timeout=REPLICA_SYNC_TIMEOUT,
+                )
+        finally:
+            SERIAL_LOCK.acquire()  # pylint: disable=consider-using-with
+
+        if not reached:
+            raise StarknetDevnetException(
+                code=StarknetErrorCode.BLOCK_NOT_FOUND,
+                status_code=503,
+                message=f"Replica did not reach block {block_number} "
+                f"within {REPLICA_SYNC_TIMEOUT} seconds.",
+            )
+
+    def handle_request(self, request: Request):
+        """
+        Reject `request` if it is not read-only. If `request` specifies `minBlockNumber`,
+        wait until the replica has applied that block. Must be called while holding `SERIAL_LOCK`.
+        """
+        if request.endpoint is None:
+            return  # not found
+
+        if (
+            request.blueprint not in REPLICA_BLUEPRINTS
+            and request.endpoint not in REPLICA_ENDPOINTS
+        ):
+            raise StarknetDevnetException(
+                code=StarkErrorCode.INVALID_REQUEST,
+                status_code=405,
+                message=f"{request.path} is not served by read replicas; "
+                "send it to the primary instead.",
+            )
+
+        min_block_number = request.args.get("minBlockNumber")
+        if min_block_number is None:
+            return
+
+        if not min_block_number.isdigit():
+            raise StarknetDevnetException(
+                code=StarkErrorCode.MALFORMED_REQUEST,
+                status_code=400,
+                message=f"Invalid minBlockNumber: '{min_block_number}'",
+            )
+        self.__wait_for_block(int(min_block_number))
@@ -0,0 +1,131 @@
+"""
+Cache of responses serialized to JSON, for objects which never change once created,
+e.g. accepted blocks and the receipts and traces of accepted transactions.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+from starkware.starknet.services.api.feeder_gateway.response_objects import (
+    BlockStatus,
+    StarknetBlock,
+)
+
+
+class SerializedJson(bytes):
+    """JSON value already serialized to bytes, to be returned as is"""
+
+
+class ResponseCache:
+    """
+    Keeps serialized responses of at most `max_size` bytes in total,
+    evicting the least recently used ones. With `max_size` of 0, nothing is cached.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.__entries: "OrderedDict[Hashable, SerializedJson]" = OrderedDict()
+        self.__size = 0
+        self.__n_hits = 0
+        self.__n_misses = 0
+        self.__lock = threading.Lock()
+
+    def __getstate__(self):
+        # the responses are recreated on demand
+        return {"max_size": self.max_size}
+
+    def __setstate__(self, state: dict):
+        self.__init__(state["max_size"])
+
+    def get(self, key: Hashable) -> Optional[SerializedJson]:
+        """Return the response cached under `key`, or `None`"""
+        with self.__lock:
+            serialized = self.__entries.get(key)
+            if serialized is None:
+                self.__n_misses += 1
+                return None
+
+            self.__n_hits += 1
+            self.__entries.move_to_end(key)
+            return serialized
+
+    def put(self, key: Hashable, serialized: bytes) -> SerializedJson:
+        """Cache `serialized` under `key` if it fits, and return it as `SerializedJson`"""
+        serialized = SerializedJson(serialized)
+        if len(serialized) > self.max_size:
+            return serialized
+
+        with self.__lock:
+            previous = self.__entries.pop(key, None)
+            if previous is not None:
+                self.__size -= len(previous)
+
+            self.__entries[key] = serialized
+            self.__size += len(serialized)
+            while self.__size > self.max_size:
+                _, evicted = self.__entries.popitem(last=False)
+                self.__size -= len(evicted)
+
+        return serialized
+
+    def get_or_create(
+        self, key: Optional[Hashable], serialize: Callable[[], str]
+    ) -> SerializedJson:
+        """
+        Return the response cached under `key`, or cache and return the result of `serialize`.
+        With `key` of `None`, the response is not immutable and is always serialized anew.
+        """
+        if key is None:
+            return SerializedJson(serialize().encode("utf-8"))
+
+        serialized = self.get(key)
+        if serialized is None:
+            serialized = self.put(key, serialize().encode("utf-8"))
+        return serialized
+
+    def clear(self):
+        """Remove all the responses, e.g. after the objects they were created from changed"""
+        with self.__lock:
+            self.__entries.clear()
+            self.__size = 0
+
+    def get_metrics(self) -> dict:
+        """Return the number and total size of the cached responses, and the hit counts"""
+        with self.__lock:
+            return {
+                "max_size": self.max_size,
+                "size": self.__size,
+                "entries": len(self.__entries),
+                "hits": self.__n_hits,
+                "misses": self.__n_misses,
+            }
+
+
+def get_block_cache_key(
+    name: str, block: StarknetBlock, number_of_origin_blocks: int
+) -> Optional[Hashable]:
+    """
+    Return the key of the cached `name` response for `block`, `None` if the block may still change:
+    if it's pending or if it's a block of the forking origin, which may still be accepted on L1
+    """
+    if (
+        block.status == BlockStatus.PENDING
+        or block.block_number < number_of_origin_blocks
+    ):
+        return None
+    return (name, block.block_number)
+
+
+def get_transaction_cache_key(
+    name: str, transaction_hash: Optional[str]
+) -> Optional[Hashable]:
+    """
+    Return the key of the cached `name` response for the transaction with `transaction_hash`,
+    `None` if the hash is malformed. The hash is normalized, so that e.g. 0x1 and 0x01 share the key.
+    Only the responses for final transactions (see `DevnetTransactions.is_final`) are to be cached.
+    """
+    try:
+        return (name, int(transaction_hash, 16))
+    except (TypeError, ValueError):
+        return None
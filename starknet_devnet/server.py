@@ -3,10 +3,13 @@ A server exposing Starknet functionalities as API endpoints.
 """
 
 import asyncio
+import multiprocessing
 import os
+import shutil
 import sys
+import tempfile
 
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 from flask_cors import CORS
 from gunicorn.app.base import BaseApplication
 from starkware.starkware_utils.error_handling import StarkException
@@ -17,7 +20,8 @@ from .blueprints.gateway import gateway
 from .blueprints.postman import postman
 from .blueprints.rpc.routes import rpc
 from .devnet_config import DevnetConfig, DumpOn, parse_args
-from .starknet_wrapper import StarknetWrapper
+from .read_pool import SERIAL_LOCK
+from .replication import ReplicaSubscriber, ReplicationPublisher
 from .state import state
 from .util import StarknetDevnetException
 
@@ -31,6 +35,29 @@ async def initialize_starknet():
     await state.starknet_wrapper.initialize()
 
 
+def serialize_requests(wsgi_app):
+    """Serve requests one at a time; only reads executed in the read pool run concurrently."""
+
+    def serialized_wsgi_app(environ, start_response):
+        with SERIAL_LOCK:
+            response = wsgi_app(environ, start_response)
+            if state.replication_publisher:
+                state.replication_publisher.publish(state.starknet_wrapper)
+            return response
+
+    return serialized_wsgi_app
+
+
+app.wsgi_app = serialize_requests(app.wsgi_app)
+
+
+@app.before_request
+def handle_replica_request():
+    """On read replicas, reject writes and wait for the requested block."""
+    if state.replica:
+        state.replica.handle_request(request)
+
+
 app.register_blueprint(base)
 app.register_blueprint(gateway)
 app.register_blueprint(feeder_gateway)
@@ -42,14 +69,22 @@ app.register_blueprint(rpc)
 class GunicornServer(BaseApplication):
     """Our Gunicorn application."""
 
-    def __init__(self, application, args):
+    # pylint: disable=too-many-arguments
+    def __init__(self, application, args, port=None, workers=1, post_worker_init=None):
         self.args = args
         self.application = application
+        self.port = port or args.port
+        self.workers = workers
+        self.post_worker_init = post_worker_init
         super().__init__()
 
     def load_config(self):
-        self.cfg.set("bind", f"{self.args.host}:{self.args.port}")
-        self.cfg.set("workers", 1)
+        self.cfg.set("bind", f"{self.args.host}:{self.port}")
+        self.cfg.set("workers", self.workers)
+        if self.post_worker_init:
+            self.cfg.set("post_worker_init", self.post_worker_init)
+        # one thread more than read workers, so a request can be served while all of them are busy
+        self.cfg.set("threads", self.args.read_workers + 1)
         self.cfg.set("timeout", self.args.timeout)
         self.cfg.set(
             "logconfig_dict",
@@ -77,30 +112,77 @@ class GunicornServer(BaseApplication):
         return self.application
 
 
+def start_replication_publisher(_worker):
+    """Start publishing the changes of the primary once its worker is initialized."""
+    state.replication_publisher.start(state.starknet_wrapper)
+
+
+def serve_read_replicas(args, socket_path: str):
+    """Serve read-only requests on `args.read_replicas` processes following the primary."""
+    state.replication_publisher = None
+
+    def start_replica(_worker):
+        state.replica = ReplicaSubscriber(socket_path, state.set_starknet_wrapper)
+        state.replica.start()
+
+    GunicornServer(
+        app,
+        args,
+        port=args.replica_port,
+        workers=args.read_replicas,
+        post_worker_init=start_replica,
+    ).run()
+
+
 def main():
     """Runs the server."""
 
     args = parse_args(sys.argv[1:])
 
+    state.genesis_cache.cache_dir = args.genesis_cache_dir
     try:
         if args.load_path:
             state.load(args.load_path)
         else:
-            state.set_starknet_wrapper(StarknetWrapper(DevnetConfig(args)))
+            asyncio.run(state.reset(DevnetConfig(args)))
 
         state.set_dump_options(args.dump_path, args.dump_on)
     except StarknetDevnetException as error:
         sys.exit(error.message)
 
-    asyncio.run(state.starknet_wrapper.initialize())
+    main_pid = os.getpid()
+    replicas = None
+    if args.read_replicas:
+        socket_dir = tempfile.mkdtemp()
+        # bound before the replicas are started, so they can connect right away
+        state.replication_publisher = ReplicationPublisher(
+            os.path.join(socket_dir, "replication.sock")
+        )
+        replicas = multiprocessing.Process(
+            target=serve_read_replicas,
+            args=(args, state.replication_publisher.socket_path),
+            daemon=True,
+        )
+        replicas.start()
 
     try:
         print(f" * Listening on http://{args.host}:{args.port}/ (Press CTRL+C to quit)")
-        main_pid = os.getpid()
-        GunicornServer(app, args).run()
+        if replicas:
+            print(
+                f" * Read replicas listening on http://{args.host}:{args.replica_port}/"
+            )
+        GunicornServer(
+            app,
+            args,
+            post_worker_init=start_replication_publisher if replicas else None,
+        ).run()
     except KeyboardInterrupt:
         pass
     finally:
+        if replicas and os.getpid() == main_pid:
+            replicas.terminate()
+            shutil.rmtree(socket_dir, ignore_errors=True)
+
         # Dump only if process is worker (not main)
         if args.dump_on == DumpOn.EXIT and os.getpid() != main_pid:
             state.dumper.dump()
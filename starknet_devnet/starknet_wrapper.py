@@ -2,15 +2,18 @@
 This module introduces `StarknetWrapper`, a wrapper class of
 starkware.starknet.testing.starknet.Starknet.
 """
-from copy import deepcopy
+# pylint: disable=too-many-lines
+import copy
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from types import TracebackType
-from typing import Dict, List, Optional, Set, Tuple, Type, Union
+from typing import Dict, List, Optional, Tuple, Type, Union
 
 import cloudpickle as pickle
 from starkware.starknet.business_logic.state.state import BlockInfo, CachedState
+from starkware.starknet.business_logic.state.state_api import StateReader
 from starkware.starknet.business_logic.transaction.fee import calculate_tx_fee
 from starkware.starknet.business_logic.transaction.objects import (
-    CallInfo,
     InternalDeclare,
     InternalDeploy,
     InternalDeployAccount,
@@ -26,7 +29,7 @@ from starkware.starknet.core.os.transaction_hash.transaction_hash import (
     calculate_deploy_transaction_hash,
 )
 from starkware.starknet.definitions.error_codes import StarknetErrorCode
-from starkware.starknet.services.api.contract_class import ContractClass, EntryPointType
+from starkware.starknet.services.api.contract_class import ContractClass
 from starkware.starknet.services.api.feeder_gateway.request_objects import (
     CallFunction,
     CallL1Handler,
@@ -36,10 +39,7 @@ from starkware.starknet.services.api.feeder_gateway.response_objects import (
     PENDING_BLOCK_ID,
     BlockIdentifier,
     BlockStateUpdate,
-    DeployedContract,
     StarknetBlock,
-    StateDiff,
-    StorageEntry,
     TransactionStatus,
     TransactionTrace,
 )
@@ -52,6 +52,7 @@ from starkware.starknet.services.api.gateway.transaction import (
 from starkware.starknet.services.api.messages import StarknetMessageToL1
 from starkware.starknet.testing.objects import FunctionInvocation
 from starkware.starknet.testing.starknet import Starknet
+from starkware.starknet.testing.state import StarknetState
 from starkware.starknet.third_party.open_zeppelin.starknet_contracts import (
     account_contract as oz_account_class,
 )
@@ -59,7 +60,7 @@ from starkware.starkware_utils.error_handling import StarkErrorCode, StarkExcept
 
 from .accounts import Accounts
 from .block_info_generator import BlockInfoGenerator
-from .blocks import DevnetBlocks
+from .blocks import BlocksCheckpoint, DevnetBlocks
 from .blueprints.rpc.structures.types import Felt
 from .chargeable_account import ChargeableAccount
 from .constants import DUMMY_STATE_ROOT, OZ_ACCOUNT_CLASS_HASH
@@ -67,17 +68,25 @@ from .devnet_config import DevnetConfig
 from .fee_token import FeeToken
 from .forked_state import get_forked_starknet
 from .general_config import build_devnet_general_config
+from .history import HistoryStore
+from .layered_state import (
+    JournaledCachedState,
+    freeze_cached_state,
+    snapshot_cached_state,
+)
 from .origin import ForkedOrigin, NullOrigin
 from .postman_wrapper import DevnetL1L2
+from .read_pool import ReadPool
+from .response_cache import ResponseCache
 from .sequencer_api_utils import InternalInvokeFunctionForSimulate
 from .transactions import DevnetTransaction, DevnetTransactions
 from .udc import UDC
 from .util import (
     StarknetDevnetException,
     enable_pickling,
-    get_all_declared_contracts,
     get_fee_estimation_info,
-    get_storage_diffs,
+    get_state_diff,
+    merge_state_diffs,
     to_bytes,
     warn,
 )
@@ -86,6 +95,29 @@ enable_pickling()
 
 DEFAULT_BLOCK_ID = LATEST_BLOCK_ID
 
+
+# pylint: disable=too-many-instance-attributes
+@dataclass
+class DevnetSnapshot:
+    """
+    In-memory snapshot of a `StarknetWrapper`. It shares the frozen state layers
+    and the stored blocks and transactions with the wrapper instead of copying them.
+    """
+
+    state_reader: StateReader
+    block_info: BlockInfo
+    l2_to_l1_messages: Dict[str, int]
+    n_l2_to_l1_messages: int
+    n_events: int
+    blocks: BlocksCheckpoint
+    n_transactions: int
+    pending_txs: List[Tuple[DevnetTransaction, TransactionStatus, StarknetBlock]]
+    block_info_generator: BlockInfoGenerator
+    l1l2: Optional[int]
+    state_history: Dict[int, StarknetState]
+    latest_state: StarknetState
+
+
 # pylint: disable=too-many-instance-attributes
 # pylint: disable=too-many-public-methods
 class StarknetWrapper:
@@ -103,18 +135,37 @@ class StarknetWrapper:
         """Origin chain that this devnet was forked from."""
 
         self.block_info_generator = BlockInfoGenerator()
-        self.blocks = DevnetBlocks(self.origin, lite=config.lite_mode)
+        self.history_store = HistoryStore(config.history_size)
+        self.blocks = DevnetBlocks(
+            self.origin,
+            lite=config.lite_mode,
+            lazy_hash=config.lazy_block_hash,
+            history_store=self.history_store,
+        )
         self.config = config
         self.l1l2 = DevnetL1L2()
-        self.transactions = DevnetTransactions(self.origin)
+        self.transactions = DevnetTransactions(
+            self.origin,
+            self.history_store,
+            keep_execution_info=config.keep_execution_info,
+        )
         self.starknet: Starknet = None
-        self.__current_cached_state = None
         self.__initialized = False
         self.fee_token = FeeToken(self)
         self.accounts = Accounts(self)
         self.__udc = UDC(self)
         self.pending_txs: List[DevnetTransaction] = []
+        # explicitly declared classes of the transaction bulk being executed, if any
+        self._bulk_declared_contracts: Optional[List[int]] = None
+        # states of the most recent blocks, keyed by block number, oldest first
+        self.__state_history: Dict[int, StarknetState] = {}
         self.__latest_state = None
+        self.read_pool = ReadPool(config.read_workers)
+        self.response_cache = ResponseCache(config.response_cache_size * 2**20)
+        # serialized classes by class hash, which are not cleared on revert as they never change
+        self.class_cache = ResponseCache(config.class_cache_size * 2**20)
+        self.__snapshots: Dict[int, DevnetSnapshot] = {}
+        self.__next_snapshot_id = 0
 
         if config.start_time is not None:
             self.set_block_time(config.start_time)
@@ -130,27 +181,150 @@ class StarknetWrapper:
     async def initialize(self):
         """Initialize the underlying starknet instance, fee_token and accounts."""
         if not self.__initialized:
-            starknet = await self.__init_starknet()
+            await self.predeploy()
+            await self.create_genesis_block()
+
+    async def predeploy(self):
+        """
+        Initialize the underlying starknet instance and deploy the fee token, the accounts
+        and the UDC. The resulting state is the same for the same genesis options of the config.
+        """
+        starknet = await self.__init_starknet()
+
+        await self.fee_token.deploy()
+        await self.accounts.deploy()
+        await self.__deploy_chargeable_account()
+        await self.__predeclare_oz_account()
+        await self.__udc.deploy()
 
-            await self.fee_token.deploy()
-            await self.accounts.deploy()
-            await self.__deploy_chargeable_account()
-            await self.__predeclare_oz_account()
-            await self.__udc.deploy()
+        await self.__preserve_current_state(starknet.state.state)
 
-            await self.__preserve_current_state(starknet.state.state)
-            await self.create_empty_block()
-            self.__initialized = True
+    async def create_genesis_block(self):
+        """Create the first block after `predeploy` and print the predeployed accounts."""
+        if self.config.accounts and not self.config.hide_predeployed_accounts:
+            self.accounts.print_accounts()
+
+        await self.create_empty_block()
+        self.__initialized = True
 
     async def create_empty_block(self) -> StarknetBlock:
         """Create empty block."""
         self._update_block_number()
         state_update = await self._update_pending_state()
-        self.__latest_state = self.get_state().copy()
-        return await self.blocks.generate_empty_block(self.get_state(), state_update)
+        self.__latest_state = self.__snapshot_current_state()
+        block = await self.blocks.generate_empty_block(self.get_state(), state_update)
+        self.__store_state_version(block.block_number)
+        return block
 
     async def __preserve_current_state(self, state: CachedState):
-        self.__current_cached_state = deepcopy(state)
+        """
+        Freeze the writes of `state` so they are not affected by later transactions.
+        Execution continues in a new `JournaledCachedState` on top of the frozen writes.
+        """
+        assert state is self.get_state().state
+        _, self.get_state().state = freeze_cached_state(state)
+
+    def __snapshot_current_state(self) -> StarknetState:
+        """
+        Return an immutable view of the current state.
+        Only the writes made since the last preservation are frozen, nothing is copied.
+        """
+        state = self.get_state()
+        frozen_state, state.state = freeze_cached_state(state.state)
+        return StarknetState(
+            state=CachedState(
+                block_info=state.state.block_info,
+                state_reader=frozen_state,
+                contract_class_cache={},
+            ),
+            general_config=state.general_config,
+        )
+
+    def __store_state_version(self, block_number: int):
+        """
+        Store the latest state as the state of block `block_number`.
+        Only the states of the last `state_history_depth` blocks are kept.
+        """
+        self.__state_history[block_number] = self.__latest_state
+        while len(self.__state_history) > self.config.state_history_depth:
+            del self.__state_history[next(iter(self.__state_history))]
+
+    def take_snapshot(self) -> int:
+        """
+        Take an in-memory snapshot of the devnet and return its id for `revert_to_snapshot`.
+        The writes since the last preservation are frozen and shared, nothing is copied.
+        """
+        # pylint: disable=protected-access
+        state = self.get_state()
+        frozen_state, state.state = freeze_cached_state(state.state)
+        snapshot = DevnetSnapshot(
+            state_reader=frozen_state,
+            block_info=state.state.block_info,
+            l2_to_l1_messages=dict(state._l2_to_l1_messages),
+            n_l2_to_l1_messages=len(state.l2_to_l1_messages_log),
+            n_events=len(state.events),
+            blocks=self.blocks.get_checkpoint(),
+            n_transactions=self.transactions.get_count(),
+            pending_txs=[(tx, tx.status, tx.block) for tx in self.pending_txs],
+            block_info_generator=copy.copy(self.block_info_generator),
+            l1l2=self.l1l2.get_checkpoint(),
+            state_history=dict(self.__state_history),
+            latest_state=self.__latest_state,
+        )
+
+        snapshot_id = self.__next_snapshot_id
+        self.__next_snapshot_id += 1
+        self.__snapshots[snapshot_id] = snapshot
+        return snapshot_id
+
+    def revert_to_snapshot(self, snapshot_id: int):
+        """
+        Revert the devnet to the snapshot with `snapshot_id`, in O(changes since the snapshot).
+        The snapshot can be reverted to again, but the snapshots taken after it are discarded.
+        """
+        if snapshot_id not in self.__snapshots:
+            raise StarknetDevnetException(
+                code=StarkErrorCode.INVALID_REQUEST,
+                status_code=400,
+                message=f"No snapshot with id {snapshot_id}.",
+            )
+
+        # the later snapshots may refer to blocks and transactions removed by reverting
+        for later_snapshot_id in range(snapshot_id + 1, self.__next_snapshot_id):
+            self.__snapshots.pop(later_snapshot_id, None)
+        snapshot = self.__snapshots[snapshot_id]
+
+        # pylint: disable=protected-access
+        state = self.get_state()
+        state.state = JournaledCachedState(
+            block_info=snapshot.block_info,
+            state_reader=snapshot.state_reader,
+            contract_class_cache={},
+        )
+        state._l2_to_l1_messages = dict(snapshot.l2_to_l1_messages)
+        del state.l2_to_l1_messages_log[snapshot.n_l2_to_l1_messages :]
+        del state.events[snapshot.n_events :]
+        self.l1l2.revert(snapshot.l1l2, snapshot.n_l2_to_l1_messages)
+
+        self.blocks.revert(snapshot.blocks)
+        self.transactions.truncate(snapshot.n_transactions)
+        self.pending_txs = []
+        for transaction, status, block in snapshot.pending_txs:
+            transaction.status = status
+            transaction.set_block(block)
+            self.transactions.store(transaction.transaction_hash, transaction)
+            self.pending_txs.append(transaction)
+
+        self.block_info_generator = copy.copy(snapshot.block_info_generator)
+        self.__state_history = dict(snapshot.state_history)
+        self.__latest_state = snapshot.latest_state
+
+        # the reverted blocks and transactions may be replaced by different ones
+        self.response_cache.clear()
+
+    def is_state_available(self, block_number: int) -> bool:
+        """Check if the state of block `block_number` can be queried"""
+        return block_number in self.__state_history
 
     async def __init_starknet(self):
         """
@@ -185,41 +359,17 @@ class StarknetWrapper:
         return self.starknet.state
 
     async def _update_pending_state(
-        self,
-        deployed_contracts: List[DeployedContract] = None,
-        explicitly_declared_contracts: List[int] = None,
-        visited_storage_entries: Set[StorageEntry] = None,
-        nonces: Dict[int, int] = None,
+        self, explicitly_declared_contracts: List[int] = None
     ):
-        # defaulting
-        deployed_contracts = deployed_contracts or []
-        explicitly_declared_contracts = explicitly_declared_contracts or []
-        visited_storage_entries = visited_storage_entries or set()
-
-        # state update and preservation
-        previous_state = self.__current_cached_state
-        assert previous_state is not None
+        # the current state journaled all the writes since the last preservation
         current_state = self.get_state().state
         current_state.block_info = self.block_info_generator.next_block(
             block_info=current_state.block_info,
             general_config=self.get_state().general_config,
         )
+        state_diff = get_state_diff(current_state, explicitly_declared_contracts or [])
         await self.__preserve_current_state(current_state)
 
-        # calculating diffs
-        declared_contracts = await get_all_declared_contracts(
-            previous_state, explicitly_declared_contracts, deployed_contracts
-        )
-        storage_diffs = await get_storage_diffs(
-            previous_state, current_state, visited_storage_entries
-        )
-        state_diff = StateDiff(
-            deployed_contracts=deployed_contracts,
-            declared_contracts=declared_contracts,
-            storage_diffs=storage_diffs,
-            nonces=nonces or {},
-        )
-
         return BlockStateUpdate(
             block_hash=None,
             new_root=DUMMY_STATE_ROOT,
@@ -287,14 +437,21 @@ class StarknetWrapper:
 
             internal_tx: InternalTransaction
             execution_info: TransactionExecutionInfo = TransactionExecutionInfo.empty()
-            internal_calls: List[CallInfo] = []
-            deployed_contracts: List[DeployedContract] = []
             explicitly_declared: List[int] = []
-            visited_storage_entries: Set[StorageEntry] = set()
 
             def __init__(self, starknet_wrapper: StarknetWrapper):
                 self.starknet_wrapper = starknet_wrapper
-                self.preserved_block_info = starknet_wrapper._update_block_number()
+                # the classes set by a rejected transaction must not be reported as declared
+                self.preserved_declared_classes = set(
+                    starknet_wrapper.get_state().state.declared_class_hashes
+                )
+                if starknet_wrapper._bulk_declared_contracts is None:
+                    self.preserved_block_info = starknet_wrapper._update_block_number()
+                else:
+                    # the block number was already updated for the whole bulk
+                    self.preserved_block_info = (
+                        starknet_wrapper.get_state().state.block_info
+                    )
 
             async def __aenter__(self):
                 return self
@@ -316,6 +473,9 @@ class StarknetWrapper:
                     self.starknet_wrapper.get_state().state.block_info = (
                         self.preserved_block_info
                     )
+                    self.starknet_wrapper.get_state().state.forget_declared_classes(
+                        self.preserved_declared_classes
+                    )
 
                     transaction = DevnetTransaction(
                         internal_tx=self.internal_tx,
@@ -330,19 +490,6 @@ class StarknetWrapper:
                     status = TransactionStatus.PENDING
 
                     assert self.execution_info is not None
-                    if self.execution_info.call_info:
-                        await self.starknet_wrapper._register_new_contracts(
-                            self.internal_calls,
-                            tx_hash,
-                            self.deployed_contracts,
-                        )
-
-                    state_update = await self.starknet_wrapper._update_pending_state(
-                        deployed_contracts=self.deployed_contracts,
-                        visited_storage_entries=self.visited_storage_entries,
-                        explicitly_declared_contracts=self.explicitly_declared,
-                    )
-
                     transaction = DevnetTransaction(
                         internal_tx=self.internal_tx,
                         status=status,
@@ -352,15 +499,70 @@ class StarknetWrapper:
                     self.starknet_wrapper.pending_txs.append(transaction)
                     self.starknet_wrapper._store_transaction(transaction)
 
-                    await self.starknet_wrapper.update_pending_block(state_update)
-
-                    if not self.starknet_wrapper.config.blocks_on_demand:
-                        await self.starknet_wrapper.generate_latest_block()
+                    bulk_declared = self.starknet_wrapper._bulk_declared_contracts
+                    if bulk_declared is None:
+                        await self.starknet_wrapper._commit_pending_transactions(
+                            self.explicitly_declared
+                        )
+                    else:
+                        # committed once the whole bulk is executed
+                        bulk_declared.extend(self.explicitly_declared)
 
                 return True  # indicates the caught exception was handled successfully
 
         return TransactionHandler(self)
 
+    async def _commit_pending_transactions(self, explicitly_declared: List[int]):
+        """
+        Build the state update of the transactions executed since the last commit,
+        add it to the pending block and, unless blocks are created on demand, store the block.
+        """
+        state_update = await self._update_pending_state(
+            explicitly_declared_contracts=explicitly_declared,
+        )
+        if self.blocks.is_block_pending():
+            # the pending block accumulates the changes of all of its transactions
+            pending_state_update = await self.blocks.get_state_update(
+                block_number=PENDING_BLOCK_ID
+            )
+            state_update = BlockStateUpdate(
+                block_hash=None,
+                new_root=DUMMY_STATE_ROOT,
+                old_root=DUMMY_STATE_ROOT,
+                state_diff=merge_state_diffs(
+                    pending_state_update.state_diff, state_update.state_diff
+                ),
+            )
+        await self.update_pending_block(state_update)
+
+        if not self.config.blocks_on_demand:
+            await self.generate_latest_block()
+
+    @asynccontextmanager
+    async def transaction_bulk(self):
+        """
+        Execute the transactions added within this context one after another against
+        the same state, and commit them together: with a single state update and in a single block.
+        """
+        assert (
+            self._bulk_declared_contracts is None
+        ), "Transaction bulks cannot be nested"
+        self._bulk_declared_contracts = []
+        n_pending_txs = len(self.pending_txs)
+        preserved_block_info = self._update_block_number()
+        try:
+            yield
+        finally:
+            bulk_declared, self._bulk_declared_contracts = (
+                self._bulk_declared_contracts,
+                None,
+            )
+            if len(self.pending_txs) > n_pending_txs:
+                await self._commit_pending_transactions(bulk_declared)
+            else:
+                # no transaction was accepted
+                self.get_state().state.block_info = preserved_block_info
+
     async def deploy_account(self, external_tx: DeployAccount):
         """Deploys account and returns (address, tx_hash)"""
 
@@ -378,9 +580,6 @@ class StarknetWrapper:
             )
 
             tx_handler.execution_info = await self.__deploy(tx_handler.internal_tx)
-            tx_handler.internal_calls = (
-                tx_handler.execution_info.call_info.internal_calls
-            )
 
         return (
             account_address,
@@ -418,16 +617,6 @@ class StarknetWrapper:
                 class_hash=internal_tx.class_hash, contract_class=contract_class
             )
             tx_handler.execution_info = await self.__deploy(internal_tx)
-            tx_handler.internal_calls = (
-                tx_handler.execution_info.call_info.internal_calls
-            )
-
-            tx_handler.deployed_contracts.append(
-                DeployedContract(
-                    address=contract_address,
-                    class_hash=int.from_bytes(internal_tx.class_hash, "big"),
-                )
-            )
 
         return contract_address, tx_hash
 
@@ -440,12 +629,6 @@ class StarknetWrapper:
                 external_tx, state.general_config
             )
             tx_handler.execution_info = await state.execute_tx(tx_handler.internal_tx)
-            tx_handler.internal_calls = (
-                tx_handler.execution_info.call_info.internal_calls
-            )
-            tx_handler.visited_storage_entries = (
-                tx_handler.execution_info.get_visited_storage_entries()
-            )
 
         return external_tx.contract_address, tx_handler.internal_tx.hash_value
 
@@ -454,23 +637,42 @@ class StarknetWrapper:
             return self.get_state()
         if block_id == LATEST_BLOCK_ID:
             return self.__latest_state
-        if block_id.isdigit():
-            latest_number = (await self.blocks.get_last_block()).block_number
-            if latest_number == int(block_id):
-                return self.__latest_state
+        if block_id.isdigit() and self.is_state_available(int(block_id)):
+            return self.__state_history[int(block_id)]
 
         raise StarknetDevnetException(
             code=StarknetErrorCode.INVALID_BLOCK_NUMBER,
-            message=f"Invalid block id: {block_id}. Must specify pending or latest block. Reported from instance with port {self.config.args.port}",
+            message=f"Invalid block id: {block_id}. Must specify pending, latest or one of the last "
+            f"{self.config.state_history_depth} blocks. Reported from instance with port {self.config.args.port}",
+        )
+
+    async def __get_read_snapshot(
+        self, block_id: BlockIdentifier = DEFAULT_BLOCK_ID
+    ) -> StarknetState:
+        """
+        Return a private snapshot of the state of `block_id`, which is not affected
+        by later transactions and can be read from another thread.
+        """
+        state = await self.__get_query_state(block_id)
+        return StarknetState(
+            state=CachedState(
+                block_info=state.state.block_info,
+                state_reader=snapshot_cached_state(state.state),
+                contract_class_cache={},
+            ),
+            general_config=state.general_config,
         )
 
     async def call(
         self, transaction: CallFunction, block_id: BlockIdentifier = DEFAULT_BLOCK_ID
     ):
         """Perform call according to specifications in `transaction`."""
-        state = await self.__get_query_state(block_id)
+        snapshot = await self.__get_read_snapshot(block_id)
+        return await self.read_pool.run(self.__execute_call, snapshot, transaction)
 
-        call_info = await state.copy().execute_entry_point_raw(
+    @staticmethod
+    async def __execute_call(state: StarknetState, transaction: CallFunction):
+        call_info = await state.execute_entry_point_raw(
             contract_address=transaction.contract_address,
             selector=transaction.entry_point_selector,
             calldata=transaction.calldata,
@@ -489,32 +691,13 @@ class StarknetWrapper:
         tx_execution_info = await state.execute_tx(tx=deploy_tx)
         return tx_execution_info
 
-    async def _register_new_contracts(
-        self,
-        internal_calls: List[Union[FunctionInvocation, CallInfo]],
-        tx_hash: int,
-        deployed_contracts: List[DeployedContract],
-    ):
-        for internal_call in internal_calls:
-            if internal_call.entry_point_type == EntryPointType.CONSTRUCTOR:
-                class_hash_bytes = to_bytes(internal_call.class_hash)
-                class_hash_int = int.from_bytes(class_hash_bytes, "big")
-
-                deployed_contracts.append(
-                    DeployedContract(
-                        address=internal_call.contract_address,
-                        class_hash=class_hash_int,
-                    )
-                )
-            await self._register_new_contracts(
-                internal_call.internal_calls, tx_hash, deployed_contracts
-            )
-
-    async def get_class_by_hash(self, class_hash: int) -> ContractClass:
+    async def get_class_by_hash(
+        self, class_hash: int, block_id: BlockIdentifier = PENDING_BLOCK_ID
+    ) -> ContractClass:
         """Return contract class given class hash"""
-        cached_state = self.get_state().state
+        state = await self.__get_query_state(block_id)
         class_hash_bytes = to_bytes(class_hash)
-        return await cached_state.get_contract_class(class_hash_bytes)
+        return await state.state.get_contract_class(class_hash_bytes)
 
     async def get_class_hash_at(
         self, contract_address: int, block_id: BlockIdentifier = DEFAULT_BLOCK_ID
@@ -538,7 +721,7 @@ class StarknetWrapper:
         """Return contract class given the contract address"""
         state = await self.__get_query_state(block_id)
         cached_state = state.state
-        class_hash_int = await self.get_class_hash_at(contract_address)
+        class_hash_int = await self.get_class_hash_at(contract_address, block_id)
         class_hash_bytes = to_bytes(class_hash_int)
         return await cached_state.get_contract_class(class_hash_bytes)
 
@@ -606,9 +789,6 @@ class StarknetWrapper:
         async with self.__get_transaction_handler() as tx_handler:
             tx_handler.internal_tx = transaction
             tx_handler.execution_info = await state.execute_tx(tx_handler.internal_tx)
-            tx_handler.internal_calls = (
-                tx_handler.execution_info.call_info.internal_calls
-            )
 
         return transaction.hash_value
 
@@ -626,16 +806,14 @@ class StarknetWrapper:
                 tx_handler.execution_info = await state.execute_tx(
                     tx_handler.internal_tx
                 )
-                tx_handler.internal_calls = (
-                    tx_handler.execution_info.call_info.internal_calls
-                )
 
         return parsed_l1_l2_messages
 
     async def update_pending_block(self, state_update: BlockStateUpdate = None):
-        """Update pending block"""
-        await self.blocks.generate_pending(
-            transactions=self.pending_txs,
+        """Append the pending transactions not yet in the pending block to it"""
+        n_block_txs = self.blocks.get_number_of_pending_transactions()
+        await self.blocks.append_pending(
+            transactions=self.pending_txs[n_block_txs:],
             state=self.get_state(),
             state_update=state_update,
         )
@@ -655,14 +833,55 @@ class StarknetWrapper:
         for transaction in self.pending_txs:
             transaction.status = TransactionStatus.ACCEPTED_ON_L2
             transaction.set_block(block=block)
+            self.transactions.store(transaction.transaction_hash, transaction)
 
         # Update latest state before block generation
-        self.__latest_state = state.copy()
+        self.__latest_state = self.__snapshot_current_state()
+        self.__store_state_version(block.block_number)
 
         self.pending_txs = []
 
         return block
 
+    async def apply_replicated_block(
+        self,
+        block: StarknetBlock,
+        state_update: BlockStateUpdate,
+        contract_classes: Dict[int, ContractClass],
+    ):
+        """
+        Apply the state diff of a block generated by another devnet instance
+        and store the block as the latest. Used by read replicas to follow the primary.
+        """
+        cached_state = self.get_state().state
+        for class_hash, contract_class in contract_classes.items():
+            await cached_state.set_contract_class(to_bytes(class_hash), contract_class)
+
+        state_diff = state_update.state_diff
+        # pylint: disable=protected-access
+        for deployed_contract in state_diff.deployed_contracts:
+            cached_state.cache._class_hash_writes[deployed_contract.address] = to_bytes(
+                deployed_contract.class_hash
+            )
+        cached_state.cache._nonce_writes.update(state_diff.nonces)
+        for address, storage_entries in state_diff.storage_diffs.items():
+            for storage_entry in storage_entries:
+                await cached_state.set_storage_at(
+                    address, storage_entry.key, storage_entry.value
+                )
+
+        cached_state.block_info = BlockInfo(
+            gas_price=block.gas_price,
+            block_number=block.block_number,
+            block_timestamp=block.timestamp,
+            sequencer_address=cached_state.block_info.sequencer_address,
+            starknet_version=cached_state.block_info.starknet_version,
+        )
+
+        self.blocks.insert(block, state_update)
+        self.__latest_state = self.__snapshot_current_state()
+        self.__store_state_version(block.block_number)
+
     async def calculate_trace_and_fee(
         self, external_tx: InvokeFunction, block_id: BlockIdentifier = DEFAULT_BLOCK_ID
     ):
@@ -678,7 +897,15 @@ class StarknetWrapper:
     ):
         """Calculates traces and fees by simulating tx on state copy.
         Uses the resulting state for each consecutive estimation"""
-        state = await self.__get_query_state(block_id)
+        snapshot = await self.__get_read_snapshot(block_id)
+        return await self.read_pool.run(
+            self.__execute_traces_and_fees, snapshot, external_txs
+        )
+
+    @staticmethod
+    async def __execute_traces_and_fees(
+        state: StarknetState, external_txs: List[InvokeFunction]
+    ):
         cached_state_copy = state.state
 
         traces = []
@@ -729,14 +956,17 @@ class StarknetWrapper:
         self, call: CallL1Handler, block_id: BlockIdentifier = DEFAULT_BLOCK_ID
     ):
         """Estimate fee of message from L1 to L2"""
-        state = await self.__get_query_state(block_id)
+        snapshot = await self.__get_read_snapshot(block_id)
+        return await self.read_pool.run(self.__execute_message_fee, snapshot, call)
+
+    @staticmethod
+    async def __execute_message_fee(state: StarknetState, call: CallL1Handler):
         internal_call: InternalL1Handler = call.to_internal(
             state.general_config.chain_id.value
         )
 
         execution_info = await internal_call.apply_state_updates(
-            # pylint: disable=protected-access
-            state.state._copy(),
+            state.state,
             state.general_config,
         )
 
@@ -782,12 +1012,14 @@ class StarknetWrapper:
         else:
             await ChargeableAccount(self).deploy()
 
-    async def is_deployed(self, address: int) -> bool:
+    async def is_deployed(
+        self, address: int, block_id: BlockIdentifier = PENDING_BLOCK_ID
+    ) -> bool:
         """
         Check if the contract is deployed.
         """
         assert isinstance(address, int)
-        cached_state = self.get_state().state
-        class_hash_bytes = await cached_state.get_class_hash_at(address)
+        state = await self.__get_query_state(block_id)
+        class_hash_bytes = await state.state.get_class_hash_at(address)
         class_hash_int = int.from_bytes(class_hash_bytes, "big")
         return bool(class_hash_int)
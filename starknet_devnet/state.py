@@ -3,33 +3,68 @@ Global state singletone
 """
 
 from pickle import UnpicklingError
+from typing import Optional
 
 from starkware.starkware_utils.error_handling import StarkErrorCode
 
 from .devnet_config import DevnetConfig
 from .dump import Dumper
+from .genesis import GenesisCache
+from .replication import ReplicaSubscriber, ReplicationPublisher
 from .starknet_wrapper import StarknetWrapper
 from .util import StarknetDevnetException, check_valid_dump_path
 
 
 class State:
     """
-    Stores starknet wrapper and dumper
+    Stores starknet wrapper, dumper and the replication role of this process
     """
 
     def __init__(self):
-        self.set_starknet_wrapper(StarknetWrapper(DevnetConfig()))
+        self.__starknet_wrapper: Optional[StarknetWrapper] = None
+        self.__dumper: Optional[Dumper] = None
+        # set in the primary if read replicas are used
+        self.replication_publisher: Optional[ReplicationPublisher] = None
+        # set in read replicas
+        self.replica: Optional[ReplicaSubscriber] = None
+        self.genesis_cache = GenesisCache()
+
+    def __ensure_starknet_wrapper(self):
+        """
+        Set a starknet wrapper of the default config if none was set, so that importing
+        this module does not create one; the server sets its own wrapper on startup
+        """
+        if self.__starknet_wrapper is None:
+            self.set_starknet_wrapper(StarknetWrapper(DevnetConfig()))
+
+    @property
+    def starknet_wrapper(self) -> StarknetWrapper:
+        """The current starknet wrapper"""
+        self.__ensure_starknet_wrapper()
+        return self.__starknet_wrapper
+
+    @property
+    def dumper(self) -> Dumper:
+        """The dumper of the current starknet wrapper"""
+        self.__ensure_starknet_wrapper()
+        return self.__dumper
 
     def set_starknet_wrapper(self, starknet_wrapper: StarknetWrapper):
         """Sets starknet wrapper and creates new instance of dumper"""
-        self.starknet_wrapper = starknet_wrapper
-        self.dumper = Dumper(starknet_wrapper)
-
-    async def reset(self):
-        """Reset the starknet wrapper and dumper instances"""
-        previous_config = self.starknet_wrapper.config
-        self.set_starknet_wrapper(StarknetWrapper(previous_config))
-        await self.starknet_wrapper.initialize()
+        if self.__starknet_wrapper:
+            self.__starknet_wrapper.read_pool.shutdown()
+        self.__starknet_wrapper = starknet_wrapper
+        self.__dumper = Dumper(starknet_wrapper)
+
+    async def reset(self, config: DevnetConfig = None):
+        """
+        Reset the starknet wrapper and dumper instances to the genesis state
+        of `config`, which defaults to the config of the current starknet wrapper
+        """
+        config = config or self.starknet_wrapper.config
+        self.set_starknet_wrapper(
+            await self.genesis_cache.create_starknet_wrapper(config)
+        )
 
     def load(self, load_path: str):
         """Load a previously dumped state if specified."""
@@ -2,7 +2,10 @@
 Classes for storing and handling transactions.
 """
 
-from typing import Dict, List
+import inspect
+import zlib
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Type, TypeVar
 
 from services.everest.business_logic.transaction_execution_objects import (
     TransactionFailureReason,
@@ -24,15 +27,68 @@ from starkware.starknet.testing.starknet import (
     StarknetCallInfo,
     TransactionExecutionInfo,
 )
+from starkware.starkware_utils.validated_dataclass import ValidatedMarshmallowDataclass
 from web3 import Web3
 
+from .history import HistoryStore
 from .origin import Origin
 from .util import StarknetDevnetException
 
+# statuses after which a transaction and its receipt do not change (unless reverted)
+FINAL_TX_STATUSES = frozenset(
+    {
+        TransactionStatus.ACCEPTED_ON_L2,
+        TransactionStatus.ACCEPTED_ON_L1,
+        TransactionStatus.REJECTED,
+    }
+)
+
+
+class _BlockReference(NamedTuple):
+    """The attributes of a block read by its transactions"""
+
+    block_hash: int
+    block_number: int
+
+
+SerializableT = TypeVar("SerializableT", bound=ValidatedMarshmallowDataclass)
+
+
+def _compress(obj: ValidatedMarshmallowDataclass) -> bytes:
+    return zlib.compress(obj.dumps().encode("utf-8"))
+
+
+def _decompress(cls: Type[SerializableT], compressed: bytes) -> SerializableT:
+    return cls.loads(zlib.decompress(compressed).decode("utf-8"))
+
+
+class _IndexKeys(NamedTuple):
+    """The attributes a transaction is indexed by"""
+
+    block_number: Optional[int]
+    address: Optional[int]
+    status: TransactionStatus
+
 
 # pylint: disable=too-many-instance-attributes
 class DevnetTransaction:
-    """Represents the devnet transaction"""
+    """
+    Represents the devnet transaction.
+    Once compacted, the execution info is replaced with the compressed execution and trace derived from it.
+    """
+
+    __slots__ = (
+        "block",
+        "execution_info",
+        "internal_tx",
+        "transaction_failure_reason",
+        "transaction_index",
+        "transaction_hash",
+        "_compressed_execution",
+        "_compressed_trace",
+        "_listener",
+        "_status",
+    )
 
     def __init__(
         self,
@@ -41,21 +97,70 @@ class DevnetTransaction:
         execution_info: TransactionExecutionInfo,
         transaction_hash: int = None,
     ):
+        self._listener: Optional[Callable[["DevnetTransaction"], None]] = None
         self.block = None
         self.execution_info = execution_info
-        if status != TransactionStatus.REJECTED and execution_info.call_info:
-            self.execution_resources = execution_info.call_info.execution_resources
-        else:
-            self.execution_resources = None
         self.internal_tx = internal_tx
-        self.status = status
+        self._status = status
         self.transaction_failure_reason = None
         self.transaction_index = 0
         self.transaction_hash = transaction_hash
+        self._compressed_execution: Optional[bytes] = None
+        self._compressed_trace: Optional[bytes] = None
 
         if transaction_hash is None:
             self.transaction_hash = internal_tx.hash_value
 
+    def __getstate__(self):
+        state = {name: getattr(self, name) for name in self.__slots__}
+        # the listener belongs to the storage of the pickled instance
+        state["_listener"] = None
+        # the block is pickled with the blocks, not with each of its transactions
+        if self.block is not None:
+            state["block"] = _BlockReference(
+                block_hash=self.block.block_hash, block_number=self.block.block_number
+            )
+        return state
+
+    def __setstate__(self, state: dict):
+        for name in self.__slots__:
+            setattr(self, name, state.get(name))
+
+    @property
+    def status(self) -> TransactionStatus:
+        """The status of the transaction"""
+        return self._status
+
+    @status.setter
+    def status(self, status: TransactionStatus):
+        self._status = status
+        self.__notify_listener()
+
+    def set_listener(self, listener: Optional[Callable[["DevnetTransaction"], None]]):
+        """Set `listener` to be called with the transaction whenever its status or block is set"""
+        self._listener = listener
+
+    def __notify_listener(self):
+        if self._listener is not None:
+            self._listener(self)
+
+    def is_compact(self) -> bool:
+        """Returns `True` if the execution info was replaced with the details derived from it"""
+        return self.execution_info is None
+
+    def compact(self):
+        """
+        Replace the execution info with the compressed execution and trace derived from it,
+        which are decompressed on each request.
+        To be called once the transaction is final, as the execution info cannot be restored.
+        """
+        if self.is_compact():
+            return
+
+        self._compressed_execution = _compress(self.get_execution())
+        self._compressed_trace = _compress(self.get_trace())
+        self.execution_info = None
+
     def __get_actual_fee(self) -> int:
         """Returns the actual fee"""
         return (
@@ -64,6 +169,12 @@ class DevnetTransaction:
             else 0
         )
 
+    def __get_execution_resources(self):
+        """Returns the execution resources of the call"""
+        if self.status != TransactionStatus.REJECTED and self.execution_info.call_info:
+            return self.execution_info.call_info.execution_resources
+        return None
+
     def __get_events(self) -> List[Event]:
         """Returns the events"""
         if isinstance(self.execution_info, StarknetCallInfo):
@@ -99,9 +210,18 @@ class DevnetTransaction:
         """Returns the block number"""
         return self.block.block_number if self.block else None
 
+    async def wait_for_block(self):
+        """
+        Wait without blocking the event loop until the hash of the block is calculated,
+        if it is calculated in the background; reading it afterwards doesn't block.
+        """
+        if inspect.isawaitable(self.block):
+            self.block = await self.block
+
     def set_block(self, block: StarknetBlock):
         """Sets the block hash and number of the transaction"""
         self.block = block
+        self.__notify_listener()
 
     def set_failure_reason(self, error_message: str):
         """Sets the failure reason of the transaction"""
@@ -109,6 +229,16 @@ class DevnetTransaction:
             code=StarknetErrorCode.TRANSACTION_FAILED.name, error_message=error_message
         )
 
+    def get_address(self) -> Optional[int]:
+        """
+        Returns the address of the account sending the transaction,
+        or of the contract deployed or called by it if not sent by an account
+        """
+        address = getattr(self.internal_tx, "account_contract_address", None)
+        if address is None:
+            address = getattr(self.internal_tx, "contract_address", None)
+        return address
+
     def get_signature(self) -> List[int]:
         """Returns the signature"""
         return (
@@ -129,18 +259,22 @@ class DevnetTransaction:
     def get_receipt(self) -> TransactionReceipt:
         """Returns the transaction receipt"""
         tx_info = self.get_tx_info()
+        execution = self.get_execution()
 
         return TransactionReceipt.from_tx_info(
             transaction_hash=self.transaction_hash,
             tx_info=tx_info,
-            actual_fee=self.__get_actual_fee(),
-            events=self.__get_events(),
-            execution_resources=self.execution_resources,
-            l2_to_l1_messages=self.__get_l2_to_l1_messages(),
+            actual_fee=execution.actual_fee,
+            events=execution.events,
+            execution_resources=execution.execution_resources,
+            l2_to_l1_messages=execution.l2_to_l1_messages,
         )
 
     def get_trace(self) -> TransactionTrace:
         """Returns the transaction trace"""
+        if self.is_compact():
+            return _decompress(TransactionTrace, self._compressed_trace)
+
         validate_invocation = FunctionInvocation.from_optional_internal(
             getattr(self.execution_info, "validate_info", None)
         )
@@ -166,12 +300,15 @@ class DevnetTransaction:
 
     def get_execution(self) -> TransactionExecution:
         """Returns the transaction execution"""
+        if self.is_compact():
+            return _decompress(TransactionExecution, self._compressed_execution)
+
         return TransactionExecution(
             transaction_hash=self.internal_tx.hash_value,
             transaction_index=self.transaction_index,
             actual_fee=self.__get_actual_fee(),
             events=self.__get_events(),
-            execution_resources=self.execution_resources,
+            execution_resources=self.__get_execution_resources(),
             l2_to_l1_messages=self.__get_l2_to_l1_messages(),
             l1_to_l2_consumed_message=None,
         )
@@ -182,9 +319,64 @@ class DevnetTransactions:
     This class is used to store transactions.
     """
 
-    def __init__(self, origin: Origin):
+    def __init__(
+        self,
+        origin: Origin,
+        history_store: HistoryStore = None,
+        keep_execution_info=False,
+    ):
         self.origin = origin
-        self.__instances: Dict[int, DevnetTransaction] = {}
+        self.keep_execution_info = keep_execution_info
+        history_store = history_store or HistoryStore()
+        self.__instances: Dict[int, DevnetTransaction] = history_store.create_dict(
+            "transactions"
+        )
+
+        # secondary indexes of the transaction hashes, kept in memory;
+        # the values are dicts used as ordered sets
+        self.__index_keys: Dict[int, _IndexKeys] = {}
+        self.__by_block: Dict[int, Dict[int, None]] = {}
+        self.__by_address: Dict[int, Dict[int, None]] = {}
+        self.__by_status: Dict[TransactionStatus, Dict[int, None]] = {}
+
+    def __get_indexes(self, index_keys: _IndexKeys) -> Iterable[tuple]:
+        yield self.__by_block, index_keys.block_number
+        yield self.__by_address, index_keys.address
+        yield self.__by_status, index_keys.status
+
+    def __index(self, tx_hash: int, transaction: DevnetTransaction):
+        index_keys = _IndexKeys(
+            block_number=transaction.block.block_number if transaction.block else None,
+            address=transaction.get_address(),
+            status=transaction.status,
+        )
+        previous_index_keys = self.__index_keys.get(tx_hash)
+        if index_keys == previous_index_keys:
+            return
+
+        if previous_index_keys is not None:
+            self.__unindex(tx_hash)
+
+        self.__index_keys[tx_hash] = index_keys
+        for index, key in self.__get_indexes(index_keys):
+            if key is not None:
+                index.setdefault(key, {})[tx_hash] = None
+
+    def __reindex(self, transaction: DevnetTransaction):
+        """Update the indexes of `transaction` after its status or block was set, if still stored"""
+        if transaction.transaction_hash in self.__index_keys:
+            self.__index(transaction.transaction_hash, transaction)
+
+    def __unindex(self, tx_hash: int):
+        index_keys = self.__index_keys.pop(tx_hash)
+        for index, key in self.__get_indexes(index_keys):
+            if key is None:
+                continue
+
+            tx_hashes = index[key]
+            del tx_hashes[tx_hash]
+            if not tx_hashes:
+                del index[key]
 
     def __get_transaction_by_hash(self, tx_hash: str) -> DevnetTransaction or None:
         """
@@ -201,9 +393,92 @@ class DevnetTransactions:
 
     def store(self, tx_hash: int, transaction: DevnetTransaction):
         """
-        Store a transaction.
+        Store a transaction. Unless `keep_execution_info` is set, a final transaction is compacted.
+        Its indexes are updated whenever its status or block is set, but it must be stored again
+        after being modified, as it may have been spilled to disk.
         """
+        if not self.keep_execution_info and transaction.status in FINAL_TX_STATUSES:
+            transaction.compact()
+
         self.__instances[tx_hash] = transaction
+        transaction.set_listener(self.__reindex)
+        self.__index(tx_hash, transaction)
+
+    def get_devnet_transaction(self, tx_hash: int) -> DevnetTransaction:
+        """
+        Get the stored transaction with the provided numeric hash.
+        If it was spilled to disk, a copy is returned, which must be stored again if modified.
+        """
+        return self.__instances[tx_hash]
+
+    def get_status(self, tx_hash: str) -> TransactionStatus:
+        """
+        Get the status of the stored transaction with the provided hash, NOT_RECEIVED if it's not stored.
+        Unlike `get_transaction_status`, the block hash is not needed, so it's not calculated.
+        """
+        transaction = self.__get_transaction_by_hash(tx_hash)
+        if transaction is None:
+            return TransactionStatus.NOT_RECEIVED
+        return transaction.status
+
+    def is_final(self, tx_hash: str) -> bool:
+        """
+        Check if the transaction with the provided hash is stored and won't change anymore.
+        Transactions of the forking origin are not stored, they may still be accepted on L1.
+        """
+        transaction = self.__get_transaction_by_hash(tx_hash)
+        return transaction is not None and transaction.status in FINAL_TX_STATUSES
+
+    def get_stored_since(self, count: int) -> List[DevnetTransaction]:
+        """
+        Get the transactions stored after the first `count` ones, in the storing order.
+        """
+        return self.__instances.values_since(count)
+
+    def truncate(self, count: int):
+        """
+        Remove the transactions stored after the first `count` ones.
+        O(number of removed transactions), as they are the most recently stored.
+        """
+        while len(self.__instances) > count:
+            tx_hash, _ = self.__instances.popitem()
+            self.__unindex(tx_hash)
+
+    # pylint: disable=too-many-arguments
+    def find(
+        self,
+        block_number: Optional[int] = None,
+        address: Optional[int] = None,
+        status: Optional[TransactionStatus] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[DevnetTransaction]:
+        """
+        Get the stored transactions matching all the provided criteria, skipping the first `offset`
+        and returning at most `limit` of them. Without criteria, all are matched in the storing order.
+        Only the transactions of accepted blocks are matched by `block_number`, in the block order.
+        """
+        criteria = [
+            (index, key)
+            for index, key in self.__get_indexes(
+                _IndexKeys(block_number=block_number, address=address, status=status)
+            )
+            if key is not None
+        ]
+
+        # the candidates are taken from the smallest of the queried indexes
+        candidates = min(
+            (index.get(key, {}) for index, key in criteria),
+            key=len,
+            default=self.__index_keys,
+        )
+        matching = (
+            tx_hash
+            for tx_hash in candidates
+            if all(tx_hash in index.get(key, {}) for index, key in criteria)
+        )
+        stop = None if limit is None else offset + limit
+        return [self.__instances[tx_hash] for tx_hash in islice(matching, offset, stop)]
 
     async def get_transaction(self, tx_hash: str):
         """
@@ -214,6 +489,7 @@ class DevnetTransactions:
         if transaction is None:
             return await self.origin.get_transaction(tx_hash)
 
+        await transaction.wait_for_block()
         return transaction.get_tx_info()
 
     async def get_transaction_trace(self, tx_hash: str):
@@ -242,6 +518,7 @@ class DevnetTransactions:
         if transaction is None:
             return await self.origin.get_transaction_receipt(tx_hash)
 
+        await transaction.wait_for_block()
         return transaction.get_receipt()
 
     async def get_transaction_status(self, tx_hash: str):
@@ -253,6 +530,7 @@ class DevnetTransactions:
         if transaction is None:
             return await self.origin.get_transaction_status(tx_hash)
 
+        await transaction.wait_for_block()
         tx_info = transaction.get_tx_info()
 
         status_response = {
@@ -5,18 +5,20 @@ Utility functions used across the project.
 import os
 import sys
 from dataclasses import dataclass
-from typing import Dict, List, Set, Union
+from typing import Dict, List, Union
 
-from starkware.starknet.business_logic.state.state import CachedState
 from starkware.starknet.definitions.error_codes import StarknetErrorCode
 from starkware.starknet.services.api.feeder_gateway.response_objects import (
     DeployedContract,
     FeeEstimationInfo,
+    StateDiff,
     StorageEntry,
 )
 from starkware.starknet.testing.contract import StarknetContract
 from starkware.starkware_utils.error_handling import StarkException
 
+from .layered_state import JournaledCachedState
+
 
 def custom_int(arg: str) -> int:
     """
@@ -108,46 +110,67 @@ def str_to_felt(text: str) -> int:
     return int.from_bytes(bytes(text, "ascii"), "big")
 
 
-async def get_all_declared_contracts(
-    previous_state: CachedState,
-    explicitly_declared_contracts: List[int],
-    deployed_contracts: List[DeployedContract],
-):
-    """Returns a tuple of explicitly and implicitly declared classes"""
-    declared_contracts_set = set(explicitly_declared_contracts)
-    for deployed_contract in deployed_contracts:
-        class_hash_bytes = to_bytes(deployed_contract.class_hash)
-        try:
-            await previous_state.get_contract_class(class_hash_bytes)
-        except StarkException:
-            declared_contracts_set.add(deployed_contract.class_hash)
-    return tuple(declared_contracts_set)
-
-
-async def get_storage_diffs(
-    previous_state: CachedState,
-    current_state: CachedState,
-    visited_storage_entries: Set[StorageEntry],
-):
-    """Returns storages modified from change"""
-    assert previous_state is not current_state
+def get_state_diff(
+    journaled_state: JournaledCachedState, explicitly_declared_contracts: List[int]
+) -> StateDiff:
+    """
+    Returns the state diff built from the writes journaled in `journaled_state`.
+    Writes of values equal to the value initially read are not considered changes.
+    """
+    # pylint: disable=protected-access
+    cache = journaled_state.cache
 
     storage_diffs: Dict[int, List[StorageEntry]] = {}
-
-    for address, key in visited_storage_entries or {}:
-        old_storage_value = await previous_state.get_storage_at(address, key)
-        new_storage_value = await current_state.get_storage_at(address, key)
-        if old_storage_value != new_storage_value:
-            if address not in storage_diffs:
-                storage_diffs[address] = []
-            storage_diffs[address].append(
-                StorageEntry(
-                    key=key,
-                    value=await current_state.get_storage_at(address, key),
-                )
+    for (address, key), value in cache._storage_writes.items():
+        if cache._storage_initial_values.get((address, key)) != value:
+            storage_diffs.setdefault(address, []).append(
+                StorageEntry(key=key, value=value)
             )
 
-    return storage_diffs
+    nonces = {
+        address: nonce
+        for address, nonce in cache._nonce_writes.items()
+        if cache._nonce_initial_values.get(address) != nonce
+    }
+
+    deployed_contracts = [
+        DeployedContract(address=address, class_hash=int.from_bytes(class_hash, "big"))
+        for address, class_hash in cache._class_hash_writes.items()
+    ]
+
+    declared_contracts_set = set(explicitly_declared_contracts)
+    for class_hash in journaled_state.declared_class_hashes:
+        declared_contracts_set.add(int.from_bytes(class_hash, "big"))
+
+    return StateDiff(
+        deployed_contracts=deployed_contracts,
+        declared_contracts=tuple(declared_contracts_set),
+        storage_diffs=storage_diffs,
+        nonces=nonces,
+    )
+
+
+def merge_state_diffs(older: StateDiff, newer: StateDiff) -> StateDiff:
+    """Returns the state diff of applying `older` and then `newer`."""
+    storage_diffs: Dict[int, List[StorageEntry]] = {}
+    for address in {**older.storage_diffs, **newer.storage_diffs}:
+        values = {
+            entry.key: entry.value
+            for state_diff in (older, newer)
+            for entry in state_diff.storage_diffs.get(address, [])
+        }
+        storage_diffs[address] = [
+            StorageEntry(key=key, value=value) for key, value in values.items()
+        ]
+
+    return StateDiff(
+        deployed_contracts=[*older.deployed_contracts, *newer.deployed_contracts],
+        declared_contracts=tuple(
+            {*older.declared_contracts, *newer.declared_contracts}
+        ),
+        storage_diffs=storage_diffs,
+        nonces={**older.nonces, **newer.nonces},
+    )
 
 
 def get_fee_estimation_info(tx_fee: int, gas_price: int):
@@ -0,0 +1,139 @@
+"""
+Tests RPC batch requests
+"""
+
+from __future__ import annotations
+
+from test.rpc.rpc_utils import BackgroundDevnetClient, make_rpc_payload
+from test.rpc.test_rpc_transactions import pad_zero_entry_points
+from test.shared import SUPPORTED_RPC_TX_VERSION
+
+import pytest
+from starkware.starknet.public.abi import get_selector_from_name
+
+from starknet_devnet.blueprints.rpc.structures.payloads import (
+    RpcBroadcastedDeployTxn,
+    RpcContractClass,
+)
+from starknet_devnet.blueprints.rpc.structures.types import PredefinedRpcErrorCode
+from starknet_devnet.blueprints.rpc.utils import rpc_felt
+
+
+def _rpc_batch(*payloads) -> list:
+    resp = BackgroundDevnetClient.post("/rpc", body=list(payloads))
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def _payload(message_id: int, method: str, params=None) -> dict:
+    return {**make_rpc_payload(method, params or {}), "id": message_id}
+
+
+def _call_payload(message_id: int, contract_address: str) -> dict:
+    return _payload(
+        message_id,
+        "starknet_call",
+        {
+            "request": {
+                "contract_address": rpc_felt(contract_address),
+                "entry_point_selector": rpc_felt(get_selector_from_name("get_balance")),
+                "calldata": [],
+            },
+            "block_id": "latest",
+        },
+    )
+
+
+@pytest.mark.usefixtures("run_devnet_in_background")
+@pytest.mark.parametrize(
+    "run_devnet_in_background", [[], ["--read-workers", "2"]], indirect=True
+)
+def test_batch(deploy_info):
+    """
+    Responses should be returned in the order of the calls, with errors of single calls
+    """
+    contract_address = deploy_info["address"]
+    responses = _rpc_batch(
+        _payload(1, "starknet_blockNumber"),
+        _call_payload(2, contract_address),
+        _call_payload(3, contract_address),
+        _payload(4, "starknet_unknownMethod"),
+        42,
+        _payload(
+            6, "starknet_getBlocks", {"from_block": "latest", "to_block": "latest"}
+        ),
+    )
+
+    assert [response.get("id") for response in responses] == [1, 2, 3, None, None, 6]
+    assert isinstance(responses[0]["result"], int)
+    assert responses[1]["result"] == responses[2]["result"] == ["0x045"]
+    assert (
+        responses[3]["error"]["code"] == PredefinedRpcErrorCode.METHOD_NOT_FOUND.value
+    )
+    assert responses[4]["error"]["code"] == PredefinedRpcErrorCode.INVALID_REQUEST.value
+    assert responses[5]["result"][0]["block"]["block_number"] == responses[0]["result"]
+
+
+@pytest.mark.usefixtures("run_devnet_in_background")
+def test_batch_with_write(deploy_content):
+    """
+    A write should be handled after the preceding calls and before the following ones
+    """
+    contract_definition = deploy_content["contract_definition"]
+    pad_zero_entry_points(contract_definition["entry_points_by_type"])
+    deploy_transaction = RpcBroadcastedDeployTxn(
+        contract_class=RpcContractClass(
+            program=contract_definition["program"],
+            entry_points_by_type=contract_definition["entry_points_by_type"],
+            abi=contract_definition["abi"],
+        ),
+        version=hex(SUPPORTED_RPC_TX_VERSION),
+        type=deploy_content["type"],
+        contract_address_salt=rpc_felt(deploy_content["contract_address_salt"]),
+        constructor_calldata=[
+            rpc_felt(data) for data in deploy_content["constructor_calldata"]
+        ],
+    )
+
+    responses = _rpc_batch(
+        _payload(1, "starknet_blockNumber"),
+        _payload(
+            2,
+            "starknet_addDeployTransaction",
+            {"deploy_transaction": deploy_transaction},
+        ),
+        _payload(3, "starknet_blockNumber"),
+    )
+
+    assert set(responses[1]["result"]) == {"transaction_hash", "contract_address"}
+    assert responses[2]["result"] == responses[0]["result"] + 1
+
+
+@pytest.mark.usefixtures("run_devnet_in_background")
+def test_empty_batch():
+    """
+    An empty batch should be rejected
+    """
+    resp = BackgroundDevnetClient.post("/rpc", body=[]).json()
+    assert resp["error"]["code"] == PredefinedRpcErrorCode.INVALID_REQUEST.value
+
+
+@pytest.mark.usefixtures("run_devnet_in_background")
+def test_batch_with_malformed_calls():
+    """
+    Malformed calls and notifications (calls without an id) should be rejected one by one
+    """
+    notification = make_rpc_payload("starknet_blockNumber", {})
+    del notification["id"]
+    responses = _rpc_batch(
+        _payload(1, "starknet_blockNumber"),
+        {"jsonrpc": "2.0", "id": 2},
+        {**_payload(3, "starknet_blockNumber"), "method": 42},
+        notification,
+        _payload(5, "starknet_blockNumber"),
+    )
+
+    assert [response.get("id") for response in responses] == [1, None, None, None, 5]
+    assert responses[4]["result"] == responses[0]["result"]
+    for response in responses[1:4]:
+        assert response["error"]["code"] == PredefinedRpcErrorCode.INVALID_REQUEST.value
@@ -1,7 +1,7 @@
 """
 Tests RPC contract class
 """
-from test.rpc.rpc_utils import rpc_call
+from test.rpc.rpc_utils import BackgroundDevnetClient, gateway_call, rpc_call
 
 import pytest
 from starkware.starknet.services.api.gateway.transaction_utils import decompress_program
@@ -127,3 +127,30 @@ def test_get_class_at(deploy_info):
     assert isinstance(contract_class["program"], str)
     decompress_program({"contract_class": contract_class}, False)
     assert contract_class["abi"] == EXPECTED_ABI
+
+
+@pytest.mark.usefixtures("run_devnet_in_background")
+def test_declared_class_cached(declare_info):
+    """
+    The serialized forms of a declared class should be cached when it is declared,
+    and served from the cache through RPC and the feeder gateway
+    """
+    class_cache = BackgroundDevnetClient.get("/memory_usage").json()["class_cache"]
+    assert class_cache["entries"] == 2
+
+    class_hash = rpc_felt(declare_info["class_hash"])
+    responses = [
+        rpc_call(
+            "starknet_getClass", params={"block_id": "latest", "class_hash": class_hash}
+        )["result"]
+        for _ in range(2)
+    ]
+    assert responses[0] == responses[1]
+    assert responses[0]["entry_points_by_type"] == EXPECTED_ENTRY_POINTS
+
+    contract_class = gateway_call("get_class_by_hash", classHash=class_hash)
+    assert contract_class["abi"] == declare_info["contract_class"]["abi"]
+
+    class_cache = BackgroundDevnetClient.get("/memory_usage").json()["class_cache"]
+    assert class_cache["entries"] == 2
+    assert class_cache["hits"] == 3
@@ -7,9 +7,12 @@ from __future__ import annotations
 from test.account import declare, invoke
 from test.rpc.rpc_utils import deploy_and_invoke_storage_contract, rpc_call
 from test.rpc.test_data.get_events import (
+    BLOCK_FROM_0_TO_LATEST_CHUNK_SIZE_1,
     BLOCK_FROM_0_TO_LATEST_MALFORMED_REQUEST,
     BLOCK_FROM_0_TO_LATEST_MISSING_PARAMETER,
     BLOCK_FROM_0_TO_LATEST_WRONG_BLOCK_TYPE,
+    FEE_CHARGING_IN_BLOCK_2_EVENT,
+    FEE_CHARGING_IN_BLOCK_3_EVENT,
     GET_EVENTS_TEST_DATA,
     create_get_events_rpc,
 )
@@ -234,6 +237,58 @@ def test_get_events(input_data, expected_data):
         assert expected_continuation_token == int(resp["result"]["continuation_token"])
 
 
+def _invoke_events_contract(contract_address: str, value: int):
+    invoke(
+        calls=[(contract_address, "increase_balance", [value])],
+        account_address=PREDEPLOYED_ACCOUNT_ADDRESS,
+        private_key=PREDEPLOYED_ACCOUNT_PRIVATE_KEY,
+    )
+
+
+@pytest.mark.usefixtures("devnet_with_account")
+def test_get_events_with_cursor():
+    """
+    Test RPC get_events paginated with cursors, resuming where the previous chunk stopped
+    """
+    contract_address = deploy(EVENTS_CONTRACT_PATH)["address"]
+    for i in range(2):
+        _invoke_events_contract(contract_address, i)
+
+    def get_events(**params):
+        filter_data = {**BLOCK_FROM_0_TO_LATEST_CHUNK_SIZE_1, **params}
+        return rpc_call("starknet_getEvents", params={"filter": filter_data})
+
+    first_chunk = get_events()["result"]
+    assert [event["data"] for event in first_chunk["events"]] == [
+        FEE_CHARGING_IN_BLOCK_2_EVENT
+    ]
+
+    # a new block does not shift the chunks
+    _invoke_events_contract(contract_address, 2)
+    second_chunk = get_events(continuation_token=first_chunk["continuation_token"])[
+        "result"
+    ]
+    assert [event["data"] for event in second_chunk["events"]] == [
+        FEE_CHARGING_IN_BLOCK_3_EVENT
+    ]
+
+    third_chunk = get_events(continuation_token=second_chunk["continuation_token"])[
+        "result"
+    ]
+    assert [event["block_number"] for event in third_chunk["events"]] == [4]
+
+    last_chunk = get_events(continuation_token=third_chunk["continuation_token"])[
+        "result"
+    ]
+    assert last_chunk == {
+        "events": [],
+        "continuation_token": third_chunk["continuation_token"],
+    }
+
+    resp = get_events(continuation_token="invalid")
+    assert resp["error"]["code"] == 33
+
+
 @pytest.mark.usefixtures("devnet_with_account")
 def test_get_nonce():
     """Test get_nonce"""
@@ -0,0 +1,79 @@
+"""
+Test sampled and background validation of RPC responses
+"""
+
+from test.rpc.rpc_utils import rpc_call
+from test.settings import APP_URL
+from test.util import devnet_in_background
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from starknet_devnet.blueprints.rpc.schema import (
+    ResponseValidationErrorWrapper,
+    ResponseValidator,
+)
+
+INVALID_BLOCK_NUMBER = "0x1"
+
+
+def _config(sampling=1, background=False):
+    return SimpleNamespace(
+        rpc_response_validation_sampling=sampling,
+        background_rpc_response_validation=background,
+    )
+
+
+def test_full_validation_raises():
+    """Violations should be returned as errors if every response is validated"""
+    validator = ResponseValidator()
+    validator.validate(1, "blockNumber", _config())
+    with pytest.raises(ResponseValidationErrorWrapper):
+        validator.validate(INVALID_BLOCK_NUMBER, "blockNumber", _config())
+
+    assert validator.get_metrics() == {
+        "responses": 2,
+        "validated": 2,
+        "violations": 1,
+        "pending": 0,
+        "dropped": 0,
+    }
+
+
+def test_sampled_validation_counts_violations():
+    """1 in N responses should be validated, with violations counted instead of raised"""
+    validator = ResponseValidator()
+    for _ in range(5):
+        validator.validate(INVALID_BLOCK_NUMBER, "blockNumber", _config(sampling=2))
+
+    metrics = validator.get_metrics()
+    assert metrics["responses"] == 5
+    assert metrics["validated"] == metrics["violations"] == 3
+
+
+def test_background_validation_counts_violations():
+    """Responses should be validated in the background, with violations counted"""
+    validator = ResponseValidator()
+    for result in [1, INVALID_BLOCK_NUMBER, INVALID_BLOCK_NUMBER]:
+        validator.validate(result, "blockNumber", _config(background=True))
+    validator.wait()
+
+    metrics = validator.get_metrics()
+    assert metrics["validated"] == 3
+    assert metrics["violations"] == 2
+    assert metrics["pending"] == 0
+
+
+@devnet_in_background(
+    "--rpc-response-validation-sampling", "2", "--background-rpc-response-validation"
+)
+def test_validation_metrics():
+    """The metrics should count the responses of the served requests"""
+    for _ in range(3):
+        assert "result" in rpc_call("starknet_blockNumber", params={})
+
+    metrics = requests.get(f"{APP_URL}/rpc_response_validation_metrics").json()
+    assert metrics["responses"] == 3
+    assert metrics["validated"] + metrics["pending"] == 2
+    assert metrics["violations"] == 0
@@ -6,9 +6,13 @@ from test.util import devnet_in_background
 from unittest.mock import MagicMock, patch
 
 import pytest
+from jsonschema.exceptions import ValidationError
 from starkware.starknet.public.abi import get_selector_from_name
 
-from starknet_devnet.blueprints.rpc.schema import _assert_valid_rpc_request
+from starknet_devnet.blueprints.rpc.schema import (
+    _assert_valid_rpc_request,
+    _request_validators_for_method,
+)
 from starknet_devnet.blueprints.rpc.structures.types import PredefinedRpcErrorCode
 from starknet_devnet.blueprints.rpc.utils import rpc_felt
 
@@ -333,3 +337,19 @@ def test_schema_with_optional_values():
 
         params = {"key": "0x01"}
         _assert_valid_rpc_request(**params, method_name="starknet_method")
+
+
+def test_validators_are_reused():
+    """
+    Validators should be compiled once per method and parameter, and reject invalid values
+    """
+    validators = _request_validators_for_method("starknet_getStorageAt")
+    assert validators is _request_validators_for_method("starknet_getStorageAt")
+    assert list(validators) == ["contract_address", "key", "block_id"]
+
+    params = {"contract_address": "0x01", "key": "0x01", "block_id": "latest"}
+    _assert_valid_rpc_request(**params, method_name="getStorageAt")
+    with pytest.raises(ValidationError):
+        _assert_valid_rpc_request(
+            **{**params, "key": "0x1"}, method_name="getStorageAt"
+        )
@@ -1,13 +1,20 @@
 """
 Tests RPC storage
 """
-from test.rpc.rpc_utils import rpc_call
+from test.rpc.rpc_utils import (
+    deploy_and_invoke_storage_contract,
+    gateway_call,
+    get_latest_block,
+    rpc_call,
+)
+from test.shared import PREDEPLOY_ACCOUNT_CLI_ARGS
 
 import pytest
 from starkware.starknet.public.abi import get_storage_var_address
 
 from starknet_devnet.blueprints.rpc.structures.types import PredefinedRpcErrorCode
 from starknet_devnet.blueprints.rpc.utils import rpc_felt
+from starknet_devnet.devnet_config import parse_args
 
 
 @pytest.mark.usefixtures("run_devnet_in_background")
@@ -92,7 +99,78 @@ def test_get_storage_at_raises_on_incorrect_block_id(deploy_info):
         },
     )
 
+    assert ex["error"] == {"code": 24, "message": "Block not found"}
+
+    ex = rpc_call(
+        "starknet_getStorageAt",
+        params={
+            "contract_address": rpc_felt(contract_address),
+            "key": rpc_felt(key),
+            "block_id": {"block_hash": rpc_felt(0x1234)},
+        },
+    )
+
+    assert ex["error"] == {"code": 24, "message": "Block not found"}
+
+
+def _get_storage_var_at(contract_address: str, block_id) -> dict:
+    return rpc_call(
+        "starknet_getStorageAt",
+        params={
+            "contract_address": rpc_felt(contract_address),
+            "key": rpc_felt(get_storage_var_address("storage")),
+            "block_id": block_id,
+        },
+    )
+
+
+@pytest.mark.usefixtures("devnet_with_account")
+@pytest.mark.parametrize("block_id_key", ["block_number", "block_hash"])
+def test_get_storage_at_historical_block(block_id_key):
+    """
+    Get storage at a block older than the latest block
+    """
+    contract_address, _ = deploy_and_invoke_storage_contract(value=30)
+
+    # the contract was deployed in the block before the invoke block
+    deploy_block = gateway_call(
+        "get_block", blockNumber=get_latest_block()["block_number"] - 1
+    )
+    historical_block_id = {
+        "block_number": {"block_number": deploy_block["block_number"]},
+        "block_hash": {"block_hash": rpc_felt(deploy_block["block_hash"])},
+    }[block_id_key]
+
+    resp = _get_storage_var_at(contract_address, historical_block_id)
+    assert resp["result"] == rpc_felt(0)
+
+    resp = _get_storage_var_at(contract_address, "latest")
+    assert resp["result"] == rpc_felt(30)
+
+
+@pytest.mark.parametrize(
+    "run_devnet_in_background",
+    [[*PREDEPLOY_ACCOUNT_CLI_ARGS, "--state-history-depth", "1"]],
+    indirect=True,
+)
+@pytest.mark.usefixtures("run_devnet_in_background")
+def test_get_storage_at_block_out_of_history():
+    """
+    Get storage at a block whose state is no longer kept
+    """
+    contract_address, _ = deploy_and_invoke_storage_contract(value=30)
+
+    historical_block_id = {"block_number": get_latest_block()["block_number"] - 1}
+    ex = _get_storage_var_at(contract_address, historical_block_id)
+
     assert ex["error"] == {
         "code": PredefinedRpcErrorCode.INVALID_PARAMS.value,
-        "message": "Invalid value for block id.",
+        "message": "The state of the block is no longer kept in history; "
+        "see --state-history-depth.",
     }
+
+
+def test_state_history_depth_must_be_positive():
+    """No state could be queried with the depth of 0, so it should be rejected"""
+    with pytest.raises(SystemExit):
+        parse_args(["--state-history-depth", "0"])
@@ -10,6 +10,7 @@ from test.rpc.rpc_utils import (
     deploy_and_invoke_storage_contract,
     gateway_call,
     get_block_with_transaction,
+    get_latest_block,
     is_felt,
     rpc_call,
 )
@@ -49,7 +50,11 @@ from starknet_devnet.blueprints.rpc.structures.payloads import (
     RpcBroadcastedInvokeTxnV1,
     RpcContractClass,
 )
-from starknet_devnet.blueprints.rpc.structures.types import Signature, rpc_txn_type
+from starknet_devnet.blueprints.rpc.structures.types import (
+    PredefinedRpcErrorCode,
+    Signature,
+    rpc_txn_type,
+)
 from starknet_devnet.blueprints.rpc.utils import rpc_felt
 from starknet_devnet.constants import LEGACY_RPC_TX_VERSION
 
@@ -764,3 +769,100 @@ def test_add_deploy_account_transaction(deploy_account_details):
         function="get_balance", address=contract_address, abi_path=ABI_PATH
     )
     assert balance_after == "40"
+
+
+def _get_rpc_deploy_transaction(deploy_content: dict, salt: int) -> dict:
+    contract_definition = deploy_content["contract_definition"]
+    pad_zero_entry_points(contract_definition["entry_points_by_type"])
+
+    return RpcBroadcastedDeployTxn(
+        contract_class=RpcContractClass(
+            program=contract_definition["program"],
+            entry_points_by_type=contract_definition["entry_points_by_type"],
+            abi=contract_definition["abi"],
+        ),
+        version=hex(SUPPORTED_RPC_TX_VERSION),
+        type=deploy_content["type"],
+        contract_address_salt=rpc_felt(salt),
+        constructor_calldata=[
+            rpc_felt(data) for data in deploy_content["constructor_calldata"]
+        ],
+    )
+
+
+@pytest.mark.usefixtures("run_devnet_in_background")
+def test_add_transaction_bulk(deploy_content):
+    """
+    Add transactions in bulk
+    """
+    deploy_transactions = [
+        _get_rpc_deploy_transaction(deploy_content, salt) for salt in range(3)
+    ]
+
+    resp = rpc_call(
+        "starknet_addTransactionBulk", params={"transactions": deploy_transactions}
+    )
+    results = resp["result"]
+
+    assert len(results) == len(deploy_transactions)
+    for result in results:
+        assert set(result.keys()) == {"transaction_hash", "contract_address", "status"}
+        assert result["status"] == "ACCEPTED_ON_L2"
+
+    block = get_latest_block()
+    assert [rpc_felt(tx["transaction_hash"]) for tx in block["transactions"]] == [
+        result["transaction_hash"] for result in results
+    ]
+
+
+@pytest.mark.usefixtures("run_devnet_in_background")
+def test_add_transaction_bulk_with_failing_transaction(
+    deploy_content, deploy_account_details
+):
+    """
+    A transaction failing in a bulk should be answered with its error, the others should be added
+    """
+    deploy_account_tx, address = prepare_deploy_account_tx(**deploy_account_details)
+    rpc_deploy_account_tx = rpc_deploy_account_from_gateway(deploy_account_tx)
+    rpc_deploy_account_tx["class_hash"] = rpc_felt(1337)
+    mint(hex(address), amount=int(1e18))
+
+    resp = rpc_call(
+        "starknet_addTransactionBulk",
+        params={
+            "transactions": [
+                _get_rpc_deploy_transaction(deploy_content, salt=0),
+                rpc_deploy_account_tx,
+                _get_rpc_deploy_transaction(deploy_content, salt=1),
+            ]
+        },
+    )
+    results = resp["result"]
+
+    assert results[1] == {"error": {"code": 28, "message": "Class hash not found"}}
+    for result in [results[0], results[2]]:
+        assert result["status"] == "ACCEPTED_ON_L2"
+
+    block = get_latest_block()
+    assert [rpc_felt(tx["transaction_hash"]) for tx in block["transactions"]] == [
+        results[0]["transaction_hash"],
+        results[2]["transaction_hash"],
+    ]
+
+
+@pytest.mark.usefixtures("run_devnet_in_background")
+def test_add_transaction_bulk_with_invalid_transaction(deploy_content):
+    """
+    Add transactions in bulk with one of them invalid
+    """
+    deploy_transaction = _get_rpc_deploy_transaction(deploy_content, salt=0)
+    invalid_deploy_transaction = {**deploy_transaction, "constructor_calldata": "0x1"}
+    block_number_before = get_latest_block()["block_number"]
+
+    ex = rpc_call(
+        "starknet_addTransactionBulk",
+        params={"transactions": [deploy_transaction, invalid_deploy_transaction]},
+    )
+
+    assert ex["error"]["code"] == PredefinedRpcErrorCode.INVALID_PARAMS.value
+    assert get_latest_block()["block_number"] == block_number_before
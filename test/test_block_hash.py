@@ -0,0 +1,60 @@
+"""
+Test the batched block hash calculation against cairo-lang
+"""
+
+import pytest
+from starkware.starknet.core.os.block_hash.block_hash import (
+    calculate_block_hash as cairo_lang_calculate_block_hash,
+)
+from starkware.starknet.core.os.block_hash.block_hash import calculate_event_hash
+from starkware.starknet.definitions.general_config import StarknetGeneralConfig
+from starkware.starknet.services.api.feeder_gateway.response_objects import Event
+
+from starknet_devnet.block_hash import calculate_block_hash
+
+STATE_ROOT = (0x1234).to_bytes(32, "big")
+
+
+def _create_events(n_events: int):
+    return [
+        Event(
+            from_address=0x100 + i,
+            keys=[0x99] * (i % 3),
+            data=[i, 2 * i, 3 * i][: i % 4],
+        )
+        for i in range(n_events)
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "n_txs, n_events",
+    [(0, 0), (1, 0), (1, 1), (2, 3), (5, 37), (40, 70)],
+)
+async def test_block_hash_equals_cairo_lang(n_txs, n_events):
+    """The block hash should be the same as calculated by cairo-lang"""
+    general_config = StarknetGeneralConfig()
+    tx_hashes = [0x5000 + i for i in range(n_txs)]
+    tx_signatures = [[i, i + 1][: i % 3] for i in range(n_txs)]
+    events = _create_events(n_events)
+    block_info = {
+        "general_config": general_config,
+        "parent_hash": 0x42,
+        "block_number": 7,
+        "global_state_root": STATE_ROOT,
+        "sequencer_address": 0x321,
+        "block_timestamp": 1_000_000,
+        "tx_hashes": tx_hashes,
+        "tx_signatures": tx_signatures,
+    }
+
+    expected = await cairo_lang_calculate_block_hash(
+        **block_info,
+        event_hashes=[
+            calculate_event_hash(
+                from_address=event.from_address, keys=event.keys, data=event.data
+            )
+            for event in events
+        ],
+    )
+    assert await calculate_block_hash(**block_info, events=events) == expected
@@ -216,6 +216,28 @@ def test_pending_block():
     assert pending_block["transactions"] == latest_block_after["transactions"]
 
 
+@devnet_in_background("--blocks-on-demand")
+def test_pending_block_grows_with_each_transaction():
+    """Test that transactions are appended to the pending block read in between"""
+    tx_hashes = []
+    for salt in range(3):
+        deploy_info = deploy(CONTRACT_PATH, inputs=["0"], salt=hex(salt))
+        tx_hashes.append(deploy_info["tx_hash"])
+
+        pending_block = get_block(block_number="pending", parse=True)
+        _assert_block_is_pending(pending_block)
+        assert [tx["transaction_hash"] for tx in pending_block["transactions"]] == (
+            tx_hashes
+        )
+
+    _demand_block_creation()
+    latest_block = get_block(block_number="latest", parse=True)
+    assert latest_block["transactions"] == pending_block["transactions"]
+    assert [
+        receipt["transaction_hash"] for receipt in latest_block["transaction_receipts"]
+    ] == tx_hashes
+
+
 @devnet_in_background("--blocks-on-demand")
 def test_pending_block_traces():
     """Test that pending block traces contain pending data"""
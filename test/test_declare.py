@@ -44,6 +44,10 @@ def test_declare_max_fee_too_low():
     assert resp.json()["code"] == str(StarknetErrorCode.UNDECLARED_CLASS)
     assert resp.status_code == 500
 
+    # the class of a rejected declaration should not be cached
+    class_cache = requests.get(f"{APP_URL}/memory_usage").json()["class_cache"]
+    assert class_cache["entries"] == 0
+
 
 @pytest.mark.declare
 @devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS)
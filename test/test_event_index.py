@@ -0,0 +1,97 @@
+"""
+Test the index of emitted events
+"""
+
+from types import SimpleNamespace
+
+from starkware.starknet.business_logic.execution.objects import Event
+
+from starknet_devnet.event_index import (
+    EventIndex,
+    EventPosition,
+    create_bloom_matcher,
+    create_event_bloom,
+)
+
+START = EventPosition(0, 0, 0)
+
+
+def _receipt(*events: Event):
+    return SimpleNamespace(events=list(events))
+
+
+def _create_index() -> EventIndex:
+    event_index = EventIndex()
+    event_index.add_block(
+        0,
+        [
+            _receipt(Event(from_address=1, keys=[10], data=[])),
+            _receipt(
+                Event(from_address=2, keys=[10], data=[]),
+                Event(from_address=1, keys=[11, 10], data=[]),
+            ),
+        ],
+    )
+    event_index.add_block(1, [])
+    event_index.add_block(2, [_receipt(Event(from_address=1, keys=[11], data=[]))])
+    return event_index
+
+
+def test_events_found_in_order():
+    """Events should be found by address and any of the keys, in the order of emission"""
+    event_index = _create_index()
+
+    assert list(event_index.find(1, [10, 11], START, to_block_number=2)) == [
+        EventPosition(0, 0, 0),
+        EventPosition(0, 1, 1),
+        EventPosition(2, 0, 0),
+    ]
+    assert list(event_index.find(1, [11], START, to_block_number=1)) == [
+        EventPosition(0, 1, 1)
+    ]
+    assert not list(event_index.find(2, [10], EventPosition(0, 1, 1), 2))
+    assert not list(event_index.find(3, [10], START, 2))
+    assert not list(event_index.find(1, [], START, 2))
+
+
+def test_removed_block_not_found():
+    """Events of removed blocks should no longer be found"""
+    event_index = _create_index()
+    event_index.remove_block([_receipt(Event(from_address=1, keys=[11], data=[]))])
+
+    assert list(event_index.find(1, [11], START, to_block_number=2)) == [
+        EventPosition(0, 1, 1)
+    ]
+
+
+def test_bloom_rules_out_missing_events():
+    """A bloom filter should match the addresses and keys of its events, and rule out others"""
+    bloom = create_event_bloom(
+        [_receipt(Event(from_address=1, keys=[10, 11], data=[]))]
+    )
+
+    assert create_bloom_matcher(1, [10])(bloom)
+    assert create_bloom_matcher(1, [12, 11])(bloom)
+    assert not create_bloom_matcher(1, [])(bloom)
+    assert not create_bloom_matcher(1, [10])(create_event_bloom([]))
+
+    # with at most 6 of 2048 bits set, false positives should be rare
+    n_false_positives = sum(
+        create_bloom_matcher(address, [10])(bloom) for address in range(2, 1002)
+    )
+    assert n_false_positives < 5
+
+
+def test_blocks_ruled_out_are_skipped():
+    """The candidates in blocks ruled out by `may_match_block` should not be searched for"""
+    event_index = _create_index()
+    checked_block_numbers = []
+
+    def may_match_block(block_number: int) -> bool:
+        checked_block_numbers.append(block_number)
+        return block_number != 0
+
+    assert list(
+        event_index.find(1, [10, 11], START, 2, may_match_block=may_match_block)
+    ) == [EventPosition(2, 0, 0)]
+    assert checked_block_numbers == [0, 2]
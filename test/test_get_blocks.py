@@ -0,0 +1,180 @@
+"""
+Test streaming ranges of blocks
+"""
+
+import json
+
+import pytest
+import requests
+
+from starknet_devnet.server import app
+
+from .rpc.rpc_utils import rpc_call
+from .settings import APP_URL
+from .shared import CONTRACT_PATH, GENESIS_BLOCK_NUMBER
+from .util import deploy, devnet_in_background, mint
+
+N_TRANSACTIONS = 3
+LATEST_BLOCK_NUMBER = GENESIS_BLOCK_NUMBER + N_TRANSACTIONS
+
+
+def _generate_blocks():
+    deploy(CONTRACT_PATH, inputs=["0"])
+    for _ in range(N_TRANSACTIONS - 1):
+        mint("0x42", 10)
+
+
+def _get(path: str, **params) -> dict:
+    resp = requests.get(f"{APP_URL}/feeder_gateway/{path}", params=params)
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def _get_blocks(**params) -> requests.Response:
+    return requests.get(
+        f"{APP_URL}/feeder_gateway/get_blocks", params=params, stream=True
+    )
+
+
+@pytest.mark.get_blocks
+@devnet_in_background()
+def test_get_blocks():
+    """Blocks should be streamed as newline-delimited JSON, optionally with state updates"""
+    _generate_blocks()
+
+    resp = _get_blocks(**{"from": GENESIS_BLOCK_NUMBER})
+    assert resp.status_code == 200
+    assert resp.headers["Content-Type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in resp.iter_lines()]
+    assert lines == [
+        {"block": _get("get_block", blockNumber=block_number)}
+        for block_number in range(GENESIS_BLOCK_NUMBER, LATEST_BLOCK_NUMBER + 1)
+    ]
+
+    resp = _get_blocks(
+        **{"from": GENESIS_BLOCK_NUMBER + 1, "to": GENESIS_BLOCK_NUMBER + 2},
+        includeStateUpdates="true",
+    )
+    lines = [json.loads(line) for line in resp.iter_lines()]
+    assert lines == [
+        {
+            "block": _get("get_block", blockNumber=block_number),
+            "state_update": _get("get_state_update", blockNumber=block_number),
+        }
+        for block_number in [GENESIS_BLOCK_NUMBER + 1, GENESIS_BLOCK_NUMBER + 2]
+    ]
+
+
+@pytest.mark.get_blocks
+@devnet_in_background()
+def test_get_blocks_invalid_range():
+    """Invalid ranges should be rejected before streaming"""
+    _generate_blocks()
+
+    assert _get_blocks().status_code == 400
+    assert _get_blocks(**{"from": 2, "to": 1}).status_code == 400
+
+    resp = _get_blocks(**{"from": 0, "to": LATEST_BLOCK_NUMBER + 1})
+    assert resp.status_code == 500
+    assert resp.json()["code"] == "StarknetErrorCode.BLOCK_NOT_FOUND"
+
+
+@pytest.mark.get_blocks
+@devnet_in_background()
+def test_rpc_get_blocks():
+    """Blocks should be streamed as the result array, optionally with receipts and state updates"""
+    _generate_blocks()
+
+    resp = rpc_call(
+        "starknet_getBlocks",
+        {
+            "from_block": {"block_number": GENESIS_BLOCK_NUMBER + 1},
+            "to_block": "latest",
+            "include_receipts": True,
+            "include_state_updates": True,
+        },
+    )
+    assert resp["id"] == 0
+
+    items = resp["result"]
+    assert len(items) == N_TRANSACTIONS
+    for block_number, item in enumerate(items, start=GENESIS_BLOCK_NUMBER + 1):
+        block_id = {"block_number": block_number}
+        block = rpc_call("starknet_getBlockWithTxs", {"block_id": block_id})["result"]
+        assert item["block"] == block
+        assert item["receipts"] == [
+            rpc_call(
+                "starknet_getTransactionReceipt",
+                {"transaction_hash": tx["transaction_hash"]},
+            )["result"]
+            for tx in block["transactions"]
+        ]
+        assert (
+            item["state_update"]
+            == rpc_call("starknet_getStateUpdate", {"block_id": block_id})["result"]
+        )
+
+    resp = rpc_call(
+        "starknet_getBlocks", {"from_block": "latest", "to_block": "latest"}
+    )
+    assert [set(item) for item in resp["result"]] == [{"block"}]
+
+    resp = rpc_call(
+        "starknet_getBlocks",
+        {"from_block": "latest", "to_block": {"block_number": GENESIS_BLOCK_NUMBER}},
+    )
+    assert resp["error"]["code"] == -32602
+
+
+@pytest.mark.get_blocks
+def test_get_blocks_reverted_while_streaming():
+    """If blocks are reverted while streamed, the stream should end with the last remaining block"""
+    client = app.test_client()
+    first_block_number = client.get("/feeder_gateway/get_block").json["block_number"]
+    snapshot_id = client.post("/snapshot").json["snapshot_id"]
+    for _ in range(2):
+        assert (
+            client.post("/mint", json={"address": "0x42", "amount": 10}).status_code
+            == 200
+        )
+
+    resp = client.get(
+        "/feeder_gateway/get_blocks",
+        query_string={"from": first_block_number},
+        buffered=False,
+    )
+    assert resp.status_code == 200
+    lines = resp.iter_encoded()
+    first_line = next(lines)
+    assert client.post("/revert", json={"snapshot_id": snapshot_id}).status_code == 200
+    assert not list(lines)
+    assert json.loads(first_line)["block"]["block_number"] == first_block_number
+
+    snapshot_id = client.post("/snapshot").json["snapshot_id"]
+    for _ in range(2):
+        assert (
+            client.post("/mint", json={"address": "0x42", "amount": 10}).status_code
+            == 200
+        )
+
+    resp = client.post(
+        "/rpc",
+        json={
+            "jsonrpc": "2.0",
+            "method": "starknet_getBlocks",
+            "params": {
+                "from_block": {"block_number": first_block_number},
+                "to_block": "latest",
+            },
+            "id": 0,
+        },
+        buffered=False,
+    )
+    assert resp.status_code == 200
+    chunks = resp.iter_encoded()
+    # the head of the response and the first block
+    streamed = next(chunks) + next(chunks)
+    assert client.post("/revert", json={"snapshot_id": snapshot_id}).status_code == 200
+    streamed += b"".join(chunks)
+    items = json.loads(streamed)["result"]
+    assert [item["block"]["block_number"] for item in items] == [first_block_number]
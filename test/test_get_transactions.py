@@ -0,0 +1,120 @@
+"""
+Test querying transactions by their indexes
+"""
+
+from types import SimpleNamespace
+
+import pytest
+import requests
+from starkware.starknet.services.api.feeder_gateway.response_objects import (
+    TransactionStatus,
+)
+
+from starknet_devnet.origin import NullOrigin
+from starknet_devnet.transactions import DevnetTransaction, DevnetTransactions
+
+from .account import invoke
+from .settings import APP_URL
+from .shared import (
+    CONTRACT_PATH,
+    GENESIS_BLOCK_NUMBER,
+    PREDEPLOY_ACCOUNT_CLI_ARGS,
+    PREDEPLOYED_ACCOUNT_ADDRESS,
+    PREDEPLOYED_ACCOUNT_PRIVATE_KEY,
+)
+from .util import deploy, devnet_in_background
+
+
+def _get_transactions(**params) -> requests.Response:
+    return requests.get(f"{APP_URL}/feeder_gateway/get_transactions", params=params)
+
+
+def _get_transaction_hashes(**params) -> list:
+    resp = _get_transactions(**params)
+    assert resp.status_code == 200
+    return [tx["transaction"]["transaction_hash"] for tx in resp.json()["transactions"]]
+
+
+def _invoke(contract_address: str, function_name="increase_balance", max_fee=None):
+    return invoke(
+        calls=[(contract_address, function_name, [10, 20])],
+        account_address=PREDEPLOYED_ACCOUNT_ADDRESS,
+        private_key=PREDEPLOYED_ACCOUNT_PRIVATE_KEY,
+        max_fee=max_fee,
+    )
+
+
+@pytest.mark.get_transactions
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS)
+def test_get_transactions():
+    """Transactions should be found by block number, address and status, page by page"""
+    deploy_info = deploy(CONTRACT_PATH, inputs=["0"])
+    contract_address = deploy_info["address"]
+    invoke_tx_hashes = [_invoke(contract_address) for _ in range(3)]
+    rejected_tx_hash = _invoke(contract_address, "nonexistent", max_fee=10**18)
+
+    assert _get_transaction_hashes(blockNumber=GENESIS_BLOCK_NUMBER + 2) == [
+        invoke_tx_hashes[0]
+    ]
+    assert _get_transaction_hashes(address=contract_address) == [deploy_info["tx_hash"]]
+    assert _get_transaction_hashes(
+        address=PREDEPLOYED_ACCOUNT_ADDRESS
+    ) == invoke_tx_hashes + [rejected_tx_hash]
+    assert _get_transaction_hashes(status="REJECTED") == [rejected_tx_hash]
+    assert (
+        _get_transaction_hashes(
+            address=PREDEPLOYED_ACCOUNT_ADDRESS, status="ACCEPTED_ON_L2"
+        )
+        == invoke_tx_hashes
+    )
+    assert _get_transaction_hashes(blockNumber=GENESIS_BLOCK_NUMBER + 10) == []
+
+    first_page = _get_transactions(address=PREDEPLOYED_ACCOUNT_ADDRESS, limit=3).json()
+    assert first_page["next_offset"] == 3
+    second_page = _get_transactions(
+        address=PREDEPLOYED_ACCOUNT_ADDRESS, limit=3, offset=3
+    ).json()
+    assert second_page["next_offset"] is None
+    assert second_page["transactions"][0]["status"] == "REJECTED"
+    assert second_page["transactions"][0]["transaction"]["transaction_hash"] == (
+        rejected_tx_hash
+    )
+
+
+@pytest.mark.get_transactions
+@devnet_in_background()
+def test_get_transactions_invalid_params():
+    """Invalid filters and pages should be rejected"""
+    for params in [
+        {"status": "UNKNOWN"},
+        {"blockNumber": "latest"},
+        {"limit": 0},
+        {"limit": 1001},
+        {"offset": -1},
+    ]:
+        assert _get_transactions(**params).status_code == 400
+
+
+def test_indexes_updated_on_status_and_block_change():
+    """Setting the status or the block of a stored transaction should update its indexes"""
+    transactions = DevnetTransactions(NullOrigin())
+    transaction = DevnetTransaction(
+        internal_tx=SimpleNamespace(account_contract_address=0x42),
+        status=TransactionStatus.PENDING,
+        execution_info=None,
+        transaction_hash=0x1,
+    )
+    transactions.store(transaction.transaction_hash, transaction)
+    assert transactions.find(status=TransactionStatus.PENDING) == [transaction]
+
+    transaction.status = TransactionStatus.ACCEPTED_ON_L2
+    transaction.set_block(SimpleNamespace(block_number=5, block_hash=0x5))
+
+    assert not transactions.find(status=TransactionStatus.PENDING)
+    assert transactions.find(
+        block_number=5, address=0x42, status=TransactionStatus.ACCEPTED_ON_L2
+    ) == [transaction]
+
+    transactions.truncate(0)
+    transaction.status = TransactionStatus.REJECTED
+    assert not transactions.find()
@@ -0,0 +1,109 @@
+"""
+Test the bounded-memory history
+"""
+
+import pickle
+
+import pytest
+import requests
+
+from starknet_devnet.devnet_config import parse_args
+from starknet_devnet.history import HistoryStore
+
+from .settings import APP_URL
+from .shared import GENESIS_BLOCK_NUMBER
+from .util import devnet_in_background, get_transaction_receipt, mint
+
+MAX_IN_MEMORY = 3
+
+
+def _create_dict(n_entries: int):
+    spilling_dict = HistoryStore(MAX_IN_MEMORY).create_dict("entries")
+    for key in range(n_entries):
+        spilling_dict[key] = {"value": key}
+    return spilling_dict
+
+
+def test_spilled_entries_are_loaded_on_lookup():
+    """Entries beyond the in-memory limit should be moved to disk and still be found"""
+    spilling_dict = _create_dict(10)
+
+    assert len(spilling_dict) == 10
+    assert spilling_dict.get_metrics() == {"in_memory": MAX_IN_MEMORY, "on_disk": 7}
+    assert all(spilling_dict[key] == {"value": key} for key in range(10))
+    assert 0 in spilling_dict
+    assert 10 not in spilling_dict
+    assert spilling_dict.get(10) is None
+
+    spilling_dict[0] = {"value": "updated"}
+    assert spilling_dict[0] == {"value": "updated"}
+    assert spilling_dict.values_since(6) == [{"value": key} for key in range(6, 10)]
+
+
+def test_spilled_entry_mutated_only_when_stored_again():
+    """A value looked up from disk is a copy, whose mutation is kept only once it is stored again"""
+    spilling_dict = _create_dict(10)
+
+    value = spilling_dict[0]
+    value["value"] = "mutated"
+    assert spilling_dict[0] == {"value": 0}
+
+    spilling_dict[0] = value
+    assert spilling_dict[0] == {"value": "mutated"}
+    assert spilling_dict.get_metrics() == {"in_memory": MAX_IN_MEMORY, "on_disk": 7}
+
+
+def test_spilled_entries_are_popped_in_reverse_order():
+    """Popping should remove the most recent entries, first from memory, then from disk"""
+    spilling_dict = _create_dict(5)
+
+    assert [spilling_dict.popitem()[0] for _ in range(5)] == [4, 3, 2, 1, 0]
+    assert len(spilling_dict) == 0
+    with pytest.raises(KeyError):
+        spilling_dict.popitem()
+
+
+def test_spilling_dict_pickled_with_spilled_entries():
+    """Pickling should include the entries on disk"""
+    spilling_dict = pickle.loads(pickle.dumps(_create_dict(10)))
+
+    assert list(spilling_dict.items()) == [(key, {"value": key}) for key in range(10)]
+    assert spilling_dict.get_metrics() == {"in_memory": MAX_IN_MEMORY, "on_disk": 7}
+
+
+def test_history_size_must_be_positive():
+    """An empty history would spill every entry right after storing it, so it is rejected"""
+    with pytest.raises(SystemExit):
+        parse_args(["--history-size", "0"])
+    assert parse_args(["--history-size", "1"]).history_size == 1
+
+
+@pytest.mark.history
+@devnet_in_background("--history-size", str(MAX_IN_MEMORY))
+def test_memory_usage_with_history_on_disk():
+    """Old blocks and transactions should be moved to disk and still be served"""
+    tx_hashes = [mint("0x42", 10)["tx_hash"] for _ in range(6)]
+
+    resp = requests.get(f"{APP_URL}/memory_usage")
+    assert resp.status_code == 200
+    memory_usage = resp.json()
+    assert memory_usage["rss"] > 0
+    assert memory_usage["history"]["blocks"] == {
+        "in_memory": MAX_IN_MEMORY,
+        "on_disk": 4,
+    }
+    assert memory_usage["history"]["transactions"] == {
+        "in_memory": MAX_IN_MEMORY,
+        "on_disk": 3,
+    }
+    assert memory_usage["history"]["store_size"] > 0
+
+    receipt = get_transaction_receipt(tx_hashes[0])
+    assert receipt["status"] == "ACCEPTED_ON_L2"
+    assert receipt["block_number"] == GENESIS_BLOCK_NUMBER + 1
+
+    resp = requests.get(
+        f"{APP_URL}/feeder_gateway/get_block",
+        params={"blockHash": receipt["block_hash"]},
+    )
+    assert resp.json()["transactions"][0]["transaction_hash"] == tx_hashes[0]
@@ -0,0 +1,179 @@
+"""
+Test copy-on-write state layers
+"""
+
+import json
+
+import pytest
+from services.external_api.client import BadRequest
+from starkware.starknet.business_logic.state.state_api_objects import BlockInfo
+from starkware.starknet.services.api.feeder_gateway.response_objects import (
+    DeployedContract,
+    StorageEntry,
+)
+from starkware.starknet.testing.state import StarknetState
+
+from starknet_devnet.forked_state import ForkedStateReader
+from starknet_devnet.layered_state import (
+    FrozenStateLayer,
+    JournaledCachedState,
+    freeze_cached_state,
+    snapshot_cached_state,
+)
+from starknet_devnet.util import get_state_diff
+
+ADDRESS = 0x123
+KEY = 0x42
+CLASS_HASH = (0x987).to_bytes(32, "big")
+OTHER_CLASS_HASH = (0x654).to_bytes(32, "big")
+
+
+def _depth(layer) -> int:
+    depth = 0
+    while isinstance(layer, FrozenStateLayer):
+        depth += 1
+        layer = layer.parent
+    return depth
+
+
+@pytest.mark.asyncio
+async def test_frozen_layer_is_not_affected_by_later_writes():
+    """Values read from a frozen layer should not change after further writes"""
+    cached_state = (await StarknetState.empty()).state
+    await cached_state.set_storage_at(ADDRESS, KEY, 1)
+    await cached_state.increment_nonce(ADDRESS)
+
+    frozen_state, cached_state = freeze_cached_state(cached_state)
+    await cached_state.set_storage_at(ADDRESS, KEY, 2)
+    await cached_state.increment_nonce(ADDRESS)
+
+    assert await frozen_state.get_storage_at(ADDRESS, KEY) == 1
+    assert await frozen_state.get_nonce_at(ADDRESS) == 1
+    assert await cached_state.get_storage_at(ADDRESS, KEY) == 2
+    assert await cached_state.get_nonce_at(ADDRESS) == 2
+
+    newer_frozen_state, _ = freeze_cached_state(cached_state)
+    assert await newer_frozen_state.get_storage_at(ADDRESS, KEY) == 2
+    assert await newer_frozen_state.get_storage_at(ADDRESS, KEY + 1) == 0
+    assert await frozen_state.get_storage_at(ADDRESS, KEY) == 1
+
+
+@pytest.mark.asyncio
+async def test_freezing_without_writes_creates_no_layer():
+    """Freezing a state without writes should reuse its reader"""
+    cached_state = (await StarknetState.empty()).state
+    await cached_state.set_storage_at(ADDRESS, KEY, 1)
+
+    frozen_state, cached_state = freeze_cached_state(cached_state)
+    assert freeze_cached_state(cached_state)[0] is frozen_state
+
+
+@pytest.mark.asyncio
+async def test_snapshot_is_not_affected_by_later_writes():
+    """A snapshot should contain the current writes, but not the later ones"""
+    cached_state = (await StarknetState.empty()).state
+    await cached_state.set_storage_at(ADDRESS, KEY, 1)
+    frozen_state, cached_state = freeze_cached_state(cached_state)
+    assert snapshot_cached_state(cached_state) is frozen_state
+
+    await cached_state.set_storage_at(ADDRESS, KEY + 1, 2)
+    snapshot = snapshot_cached_state(cached_state)
+    await cached_state.set_storage_at(ADDRESS, KEY + 1, 3)
+
+    assert await snapshot.get_storage_at(ADDRESS, KEY) == 1
+    assert await snapshot.get_storage_at(ADDRESS, KEY + 1) == 2
+    assert await cached_state.get_storage_at(ADDRESS, KEY + 1) == 3
+
+
+@pytest.mark.asyncio
+async def test_layer_chain_is_compacted():
+    """The chain of layers should stay shallow while preserving all the writes"""
+    cached_state = (await StarknetState.empty()).state
+
+    n_writes = 1000
+    for i in range(n_writes):
+        await cached_state.set_storage_at(ADDRESS, i, i + 1)
+        frozen_state, cached_state = freeze_cached_state(cached_state)
+
+    assert _depth(frozen_state) <= 2 * n_writes.bit_length()
+    for i in range(n_writes):
+        assert await frozen_state.get_storage_at(ADDRESS, i) == i + 1
+
+
+@pytest.mark.asyncio
+async def test_state_diff_is_built_from_journal():
+    """The state diff should contain only the journaled changes"""
+    cached_state = (await StarknetState.empty()).state
+    await cached_state.set_storage_at(ADDRESS, KEY, 1)
+    await cached_state.set_contract_class(CLASS_HASH, None)
+    _, cached_state = freeze_cached_state(cached_state)
+
+    # a write of the initially read value is not a change
+    assert await cached_state.get_storage_at(ADDRESS, KEY) == 1
+    await cached_state.set_storage_at(ADDRESS, KEY, 1)
+    await cached_state.set_storage_at(ADDRESS, KEY + 1, 2)
+    await cached_state.increment_nonce(ADDRESS)
+    await cached_state.deploy_contract(ADDRESS + 1, CLASS_HASH)
+    # already declared in a frozen layer
+    await cached_state.set_contract_class(CLASS_HASH, None)
+
+    state_diff = get_state_diff(cached_state, explicitly_declared_contracts=[0xABC])
+    assert state_diff.storage_diffs == {ADDRESS: [StorageEntry(key=KEY + 1, value=2)]}
+    assert state_diff.nonces == {ADDRESS: 1}
+    assert state_diff.deployed_contracts == [
+        DeployedContract(address=ADDRESS + 1, class_hash=0x987)
+    ]
+    assert state_diff.declared_contracts == (0xABC,)
+
+
+@pytest.mark.asyncio
+async def test_declarations_are_journaled_through_child_states():
+    """Classes declared in a child state should be journaled once it is applied"""
+    _, cached_state = freeze_cached_state((await StarknetState.empty()).state)
+
+    with cached_state.copy_and_apply() as child_state:
+        await child_state.set_contract_class(CLASS_HASH, None)
+
+    state_diff = get_state_diff(cached_state, explicitly_declared_contracts=[])
+    assert state_diff.declared_contracts == (0x987,)
+
+
+class _OriginClient:
+    """Feeder gateway client of a forking origin with only `CLASS_HASH` declared"""
+
+    def __init__(self):
+        self.n_requests = 0
+
+    async def get_class_by_hash(self, class_hash: str) -> dict:
+        """Return the class or raise as the feeder gateway does"""
+        self.n_requests += 1
+        if class_hash == "0x" + CLASS_HASH.hex():
+            return {}
+        raise BadRequest(
+            status_code=500,
+            text=json.dumps(
+                {
+                    "code": "StarknetErrorCode.UNDECLARED_CLASS",
+                    "message": "Class is not declared.",
+                }
+            ),
+        )
+
+
+@pytest.mark.asyncio
+async def test_classes_of_origin_are_not_journaled():
+    """Classes declared in the forking origin should not be journaled, asking the origin once"""
+    origin_client = _OriginClient()
+    cached_state = JournaledCachedState(
+        block_info=BlockInfo.empty(sequencer_address=None),
+        state_reader=ForkedStateReader(origin_client, block_number=1),
+        contract_class_cache={},
+    )
+
+    for _ in range(2):
+        await cached_state.set_contract_class(CLASS_HASH, None)
+        await cached_state.set_contract_class(OTHER_CLASS_HASH, None)
+
+    state_diff = get_state_diff(cached_state, explicitly_declared_contracts=[])
+    assert state_diff.declared_contracts == (0x654,)
+    assert origin_client.n_requests == 2
@@ -0,0 +1,143 @@
+"""
+Test the calculation of block hashes in the background
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+import requests
+from starkware.starknet.core.os.block_hash.block_hash import (
+    calculate_block_hash,
+    calculate_event_hash,
+)
+from starkware.starknet.definitions.general_config import StarknetGeneralConfig
+
+from starknet_devnet import blocks
+from starknet_devnet.devnet_config import DevnetConfig, parse_args
+from starknet_devnet.starknet_wrapper import StarknetWrapper
+
+from .account import invoke
+from .settings import APP_URL
+from .shared import (
+    CONTRACT_PATH,
+    GENESIS_BLOCK_NUMBER,
+    PREDEPLOY_ACCOUNT_CLI_ARGS,
+    PREDEPLOYED_ACCOUNT_ADDRESS,
+    PREDEPLOYED_ACCOUNT_PRIVATE_KEY,
+)
+from .test_deploy import get_deploy_transaction
+from .util import deploy, devnet_in_background, get_transaction_receipt
+
+
+def _get_block(**params) -> dict:
+    resp = requests.get(f"{APP_URL}/feeder_gateway/get_block", params=params)
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def _calculate_block_hash(block: dict) -> int:
+    """Calculate the hash of `block` with cairo-lang"""
+    return asyncio.run(
+        calculate_block_hash(
+            general_config=StarknetGeneralConfig(),
+            parent_hash=int(block["parent_block_hash"], 16),
+            block_number=block["block_number"],
+            global_state_root=bytes.fromhex(block["state_root"]),
+            sequencer_address=int(block["sequencer_address"], 16),
+            block_timestamp=block["timestamp"],
+            tx_hashes=[int(tx["transaction_hash"], 16) for tx in block["transactions"]],
+            tx_signatures=[
+                [int(value, 16) for value in tx.get("signature", [])]
+                for tx in block["transactions"]
+            ],
+            event_hashes=[
+                calculate_event_hash(
+                    from_address=int(event["from_address"], 16),
+                    keys=[int(key, 16) for key in event["keys"]],
+                    data=[int(value, 16) for value in event["data"]],
+                )
+                for receipt in block["transaction_receipts"]
+                for event in receipt["events"]
+            ],
+        )
+    )
+
+
+@pytest.mark.lazy_block_hash
+@devnet_in_background("--lazy-block-hash", *PREDEPLOY_ACCOUNT_CLI_ARGS)
+def test_lazy_block_hashes_are_calculated():
+    """The blocks should get the same hashes as when calculated immediately"""
+    contract_address = deploy(CONTRACT_PATH, inputs=["0"])["address"]
+    tx_hash = invoke(
+        calls=[(contract_address, "increase_balance", [10, 20])],
+        account_address=PREDEPLOYED_ACCOUNT_ADDRESS,
+        private_key=PREDEPLOYED_ACCOUNT_PRIVATE_KEY,
+    )
+
+    latest_block = _get_block(blockNumber="latest")
+    assert latest_block["block_number"] == GENESIS_BLOCK_NUMBER + 2
+
+    parent_block = _get_block(blockNumber=GENESIS_BLOCK_NUMBER)
+    for block_number in range(GENESIS_BLOCK_NUMBER + 1, GENESIS_BLOCK_NUMBER + 3):
+        block = _get_block(blockNumber=block_number)
+        assert block["parent_block_hash"] == parent_block["block_hash"]
+        assert int(block["block_hash"], 16) == _calculate_block_hash(block)
+        assert _get_block(blockHash=block["block_hash"]) == block
+        parent_block = block
+
+    assert get_transaction_receipt(tx_hash)["block_hash"] == latest_block["block_hash"]
+
+
+@pytest.mark.lazy_block_hash
+@devnet_in_background("--lazy-block-hash")
+def test_lazy_block_hash_in_state_update():
+    """The state update of a block should contain its hash"""
+    deploy(CONTRACT_PATH, inputs=["0"])
+    block_number = GENESIS_BLOCK_NUMBER + 1
+
+    state_update = requests.get(
+        f"{APP_URL}/feeder_gateway/get_state_update",
+        params={"blockNumber": block_number},
+    ).json()
+    assert (
+        state_update["block_hash"] == _get_block(blockNumber=block_number)["block_hash"]
+    )
+
+    state_update_by_hash = requests.get(
+        f"{APP_URL}/feeder_gateway/get_state_update",
+        params={"blockHash": state_update["block_hash"]},
+    ).json()
+    assert state_update_by_hash == state_update
+
+
+@pytest.mark.lazy_block_hash
+@pytest.mark.asyncio
+async def test_lazy_block_hash_awaited_without_blocking():
+    """Waiting for the hash of the block of a transaction should not block the event loop"""
+    devnet = StarknetWrapper(config=DevnetConfig(parse_args(["--lazy-block-hash"])))
+    await devnet.initialize()
+    original_calculate_block_hash = blocks.calculate_block_hash
+
+    async def slowly_calculate_block_hash(**kwargs):
+        time.sleep(1)
+        return await original_calculate_block_hash(**kwargs)
+
+    n_ticks = 0
+
+    async def tick():
+        nonlocal n_ticks
+        while True:
+            n_ticks += 1
+            await asyncio.sleep(0.01)
+
+    with patch.object(blocks, "calculate_block_hash", slowly_calculate_block_hash):
+        _, tx_hash = await devnet.deploy(deploy_transaction=get_deploy_transaction([0]))
+        ticker = asyncio.create_task(tick())
+        tx_status = await devnet.transactions.get_transaction_status(hex(tx_hash))
+        ticker.cancel()
+
+    latest_block = await devnet.blocks.get_last_block()
+    assert tx_status["block_hash"] == hex(latest_block.block_hash)
+    assert n_ticks > 10
@@ -0,0 +1,101 @@
+"""
+Test executing calls and fee estimations in the read pool
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+from starkware.starknet.public.abi import get_selector_from_name
+
+from .account import invoke
+from .settings import APP_URL
+from .shared import (
+    CONTRACT_PATH,
+    PREDEPLOY_ACCOUNT_CLI_ARGS,
+    PREDEPLOYED_ACCOUNT_ADDRESS,
+    PREDEPLOYED_ACCOUNT_PRIVATE_KEY,
+)
+from .util import deploy, devnet_in_background
+
+N_CONCURRENT_CALLS = 8
+INITIAL_BALANCE = 10
+
+
+def _call_get_balance(address: str, block_number="pending") -> int:
+    resp = requests.post(
+        f"{APP_URL}/feeder_gateway/call_contract",
+        params={"blockNumber": block_number},
+        json={
+            "contract_address": address,
+            "entry_point_selector": hex(get_selector_from_name("get_balance")),
+            "calldata": [],
+            "signature": [],
+        },
+    )
+    assert resp.status_code == 200, resp.text
+    return int(resp.json()["result"][0], 16)
+
+
+def _get_read_pool_metrics() -> dict:
+    resp = requests.get(f"{APP_URL}/read_pool_metrics")
+    assert resp.status_code == 200
+    return resp.json()
+
+
+@pytest.mark.read_pool
+@devnet_in_background("--read-workers", "2")
+def test_concurrent_calls():
+    """Concurrent calls should all be executed in the pool"""
+    address = deploy(CONTRACT_PATH, inputs=[str(INITIAL_BALANCE)])["address"]
+
+    with ThreadPoolExecutor(max_workers=N_CONCURRENT_CALLS) as executor:
+        balances = list(
+            executor.map(
+                lambda _: _call_get_balance(address), range(N_CONCURRENT_CALLS)
+            )
+        )
+    assert balances == [INITIAL_BALANCE] * N_CONCURRENT_CALLS
+
+    metrics = _get_read_pool_metrics()
+    assert metrics["workers"] == 2
+    assert metrics["completed"] == N_CONCURRENT_CALLS
+    assert metrics["queue_depth"] == metrics["active"] == 0
+    assert 1 <= metrics["max_queue_depth"] <= N_CONCURRENT_CALLS
+    assert metrics["max_snapshot_age"] >= metrics["last_snapshot_age"] >= 0
+
+
+@pytest.mark.read_pool
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS, "--read-workers", "1")
+def test_calls_in_pool_read_block_states():
+    """Reads executed in the pool should read the state of the requested block"""
+    deploy_info = deploy(CONTRACT_PATH, inputs=[str(INITIAL_BALANCE)])
+    address = deploy_info["address"]
+    deploy_block_number = requests.get(
+        f"{APP_URL}/feeder_gateway/get_block", params={"blockNumber": "latest"}
+    ).json()["block_number"]
+
+    # the fee of the invocation is estimated in the pool as well
+    invoke(
+        calls=[(address, "increase_balance", [1, 2])],
+        account_address=PREDEPLOYED_ACCOUNT_ADDRESS,
+        private_key=PREDEPLOYED_ACCOUNT_PRIVATE_KEY,
+    )
+
+    assert _call_get_balance(address) == INITIAL_BALANCE + 3
+    assert _call_get_balance(address, block_number="latest") == INITIAL_BALANCE + 3
+    assert _call_get_balance(address, block_number=deploy_block_number) == (
+        INITIAL_BALANCE
+    )
+    assert _get_read_pool_metrics()["completed"] == 4
+
+
+@devnet_in_background()
+def test_read_pool_disabled_by_default():
+    """Without workers, reads should not be counted in the metrics"""
+    address = deploy(CONTRACT_PATH, inputs=[str(INITIAL_BALANCE)])["address"]
+    assert _call_get_balance(address) == INITIAL_BALANCE
+
+    metrics = _get_read_pool_metrics()
+    assert metrics["workers"] == 0
+    assert metrics["completed"] == 0
@@ -0,0 +1,102 @@
+"""
+Test read replicas following the primary
+"""
+
+import pytest
+import requests
+from starkware.starknet.public.abi import get_selector_from_name
+
+from starknet_devnet.blueprints.rpc.structures.types import PredefinedRpcErrorCode
+
+from .settings import APP_URL, HOST, bind_free_port
+from .shared import CONTRACT_PATH, GENESIS_BLOCK_NUMBER
+from .util import deploy, devnet_in_background
+
+REPLICA_PORT, REPLICA_URL = bind_free_port(HOST)
+INITIAL_BALANCE = 10
+
+
+def _replica_get(path: str, **params) -> requests.Response:
+    return requests.get(f"{REPLICA_URL}{path}", params=params)
+
+
+def _replica_get_balance(contract_address: str, min_block_number: int) -> str:
+    resp = requests.post(
+        f"{REPLICA_URL}/feeder_gateway/call_contract",
+        params={"blockNumber": "latest", "minBlockNumber": min_block_number},
+        json={
+            "contract_address": contract_address,
+            "entry_point_selector": hex(get_selector_from_name("get_balance")),
+            "calldata": [],
+            "signature": [],
+        },
+    )
+    return resp.json()["result"][0]
+
+
+@pytest.mark.read_replicas
+@devnet_in_background("--read-replicas", "2", "--replica-port", REPLICA_PORT)
+def test_replicas_follow_primary():
+    """Replicas should serve the blocks, transactions and state of the primary"""
+    deploy_info = deploy(CONTRACT_PATH, inputs=[str(INITIAL_BALANCE)])
+    block_number = GENESIS_BLOCK_NUMBER + 1
+
+    # each request may be served by a different replica
+    for _ in range(4):
+        block = _replica_get(
+            "/feeder_gateway/get_block", minBlockNumber=block_number
+        ).json()
+        assert block["block_number"] == block_number
+        assert block["transactions"][0]["transaction_hash"] == deploy_info["tx_hash"]
+
+        receipt = _replica_get(
+            "/feeder_gateway/get_transaction_receipt",
+            transactionHash=deploy_info["tx_hash"],
+            minBlockNumber=block_number,
+        ).json()
+        assert receipt["status"] == "ACCEPTED_ON_L2"
+
+        balance = _replica_get_balance(deploy_info["address"], block_number)
+        assert balance == hex(INITIAL_BALANCE)
+
+
+@pytest.mark.read_replicas
+@devnet_in_background(
+    "--read-replicas", "1", "--replica-port", REPLICA_PORT, "--blocks-on-demand"
+)
+def test_replicas_follow_blocks_on_demand():
+    """Replicas should apply the changes of all the transactions of a block created on demand"""
+    deploy_infos = [
+        deploy(CONTRACT_PATH, inputs=[str(INITIAL_BALANCE + i)], salt=hex(i))
+        for i in range(2)
+    ]
+    requests.post(f"{APP_URL}/create_block_on_demand")
+    block_number = GENESIS_BLOCK_NUMBER + 1
+
+    for i, deploy_info in enumerate(deploy_infos):
+        balance = _replica_get_balance(deploy_info["address"], block_number)
+        assert balance == hex(INITIAL_BALANCE + i)
+
+
+@pytest.mark.read_replicas
+@devnet_in_background("--read-replicas", "1", "--replica-port", REPLICA_PORT)
+def test_replicas_reject_writes():
+    """Replicas should serve only read-only requests"""
+    resp = requests.post(
+        f"{REPLICA_URL}/mint", json={"address": "0x1", "amount": INITIAL_BALANCE}
+    )
+    assert resp.status_code == 405
+
+    resp = requests.post(
+        f"{REPLICA_URL}/rpc",
+        json={
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "starknet_addInvokeTransaction",
+            "params": {},
+        },
+    )
+    assert resp.json()["error"]["code"] == PredefinedRpcErrorCode.METHOD_NOT_FOUND.value
+
+    resp = _replica_get("/feeder_gateway/get_block", minBlockNumber="latest")
+    assert resp.status_code == 400
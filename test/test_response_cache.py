@@ -0,0 +1,138 @@
+"""
+Test the cache of serialized responses
+"""
+
+from types import SimpleNamespace
+
+import pytest
+import requests
+from starkware.starknet.services.api.feeder_gateway.response_objects import BlockStatus
+
+from starknet_devnet.response_cache import (
+    ResponseCache,
+    get_block_cache_key,
+    get_transaction_cache_key,
+)
+
+from .rpc.rpc_utils import rpc_call
+from .settings import APP_URL
+from .shared import GENESIS_BLOCK_NUMBER
+from .test_snapshot import revert, take_snapshot
+from .util import devnet_in_background, get_transaction_receipt, mint
+
+
+def test_least_recently_used_responses_are_evicted():
+    """Responses exceeding the size of the cache should be evicted, oldest access first"""
+    response_cache = ResponseCache(max_size=10)
+    response_cache.put("a", b"1234")
+    response_cache.put("b", b"5678")
+    assert response_cache.get("a") == b"1234"
+
+    response_cache.put("c", b"90")
+    response_cache.put("d", b"12")
+    assert response_cache.get("b") is None
+    assert response_cache.get("a") == b"1234"
+    assert response_cache.get_metrics() == {
+        "max_size": 10,
+        "size": 8,
+        "entries": 3,
+        "hits": 2,
+        "misses": 1,
+    }
+
+    response_cache.put("e", b"too long to cache")
+    assert response_cache.get("e") is None
+
+
+def test_mutable_responses_are_not_cached():
+    """Responses without a key should be serialized on each call"""
+    response_cache = ResponseCache(max_size=100)
+    values = iter(["1", "2"])
+    assert response_cache.get_or_create(None, lambda: next(values)) == b"1"
+    assert response_cache.get_or_create(None, lambda: next(values)) == b"2"
+    assert response_cache.get_metrics()["entries"] == 0
+
+
+def test_only_accepted_local_blocks_are_cached():
+    """Pending blocks and blocks of the forking origin may still change, so they have no key"""
+    number_of_origin_blocks = 5
+
+    def _cache_key(block_number: int, status: BlockStatus):
+        block = SimpleNamespace(block_number=block_number, status=status)
+        return get_block_cache_key("get_block", block, number_of_origin_blocks)
+
+    assert _cache_key(5, BlockStatus.ACCEPTED_ON_L2) == ("get_block", 5)
+    assert _cache_key(4, BlockStatus.ACCEPTED_ON_L2) is None
+    assert _cache_key(5, BlockStatus.PENDING) is None
+
+
+def test_transaction_hashes_normalized_in_cache_keys():
+    """Equal hashes should share the key, malformed hashes should have none"""
+    assert get_transaction_cache_key("get_transaction_trace", "0x01") == (
+        "get_transaction_trace",
+        1,
+    )
+    assert get_transaction_cache_key(
+        "get_transaction_trace", "0x1"
+    ) == get_transaction_cache_key("get_transaction_trace", "0x0001")
+    assert get_transaction_cache_key("get_transaction_trace", "0xz") is None
+    assert get_transaction_cache_key("get_transaction_trace", None) is None
+
+
+def _get_block(block_number: int) -> dict:
+    resp = requests.get(
+        f"{APP_URL}/feeder_gateway/get_block", params={"blockNumber": block_number}
+    )
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def _get_cache_metrics() -> dict:
+    return requests.get(f"{APP_URL}/memory_usage").json()["response_cache"]
+
+
+@pytest.mark.response_cache
+@devnet_in_background()
+def test_cached_responses():
+    """Accepted blocks and receipts should be served from the cache until reverted"""
+    tx_hash = mint("0x42", 10)["tx_hash"]
+    block_number = GENESIS_BLOCK_NUMBER + 1
+
+    block = _get_block(block_number)
+    assert _get_block(block_number) == block
+    assert get_transaction_receipt(tx_hash) == get_transaction_receipt(tx_hash)
+    padded_tx_hash = "0x00" + tx_hash[2:]
+    traces = [
+        requests.get(
+            f"{APP_URL}/feeder_gateway/get_transaction_trace",
+            params={"transactionHash": transaction_hash},
+        ).json()
+        for transaction_hash in [tx_hash, padded_tx_hash]
+    ]
+    assert traces[0] == traces[1]
+
+    rpc_blocks = [
+        rpc_call("starknet_getBlockWithTxHashes", {"block_id": "latest"})
+        for _ in range(2)
+    ]
+    assert rpc_blocks[0] == rpc_blocks[1]
+    assert rpc_blocks[0]["id"] == 0
+    rpc_block = rpc_blocks[0]["result"]
+    assert int(rpc_block["block_hash"], 16) == int(block["block_hash"], 16)
+    assert [int(tx, 16) for tx in rpc_block["transactions"]] == [int(tx_hash, 16)]
+
+    metrics = _get_cache_metrics()
+    assert metrics["entries"] == 4
+    assert metrics["hits"] == 4
+
+    snapshot_id = take_snapshot()
+    mint("0x42", 20)
+    reverted_block = _get_block(block_number + 1)
+
+    assert revert(snapshot_id).status_code == 200
+    assert _get_cache_metrics()["entries"] == 0
+
+    other_tx_hash = mint("0x42", 30)["tx_hash"]
+    other_block = _get_block(block_number + 1)
+    assert other_block["block_hash"] != reverted_block["block_hash"]
+    assert other_block["transactions"][0]["transaction_hash"] == other_tx_hash
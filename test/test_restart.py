@@ -2,6 +2,10 @@
 Test restart endpoint
 """
 
+import os
+import tempfile
+import time
+
 import pytest
 import requests
 
@@ -15,6 +19,7 @@ from .shared import (
     PREDEPLOYED_ACCOUNT_ADDRESS,
     PREDEPLOYED_ACCOUNT_PRIVATE_KEY,
 )
+from .test_account import get_account_balance
 from .util import (
     assert_transaction_not_received,
     assert_tx_status,
@@ -22,6 +27,9 @@ from .util import (
     deploy,
     devnet_in_background,
     get_block,
+    mint,
+    run_devnet_in_background,
+    terminate_and_wait,
 )
 
 
@@ -131,3 +139,50 @@ def test_gas_price_unaffected_by_restart():
     assert block_after["block_hash"] != block_before["block_hash"]
     gas_price_after = str(int(block_after["gas_price"], 16))
     assert gas_price_after == GAS_PRICE
+
+
+def get_predeployed_accounts():
+    """Get predeployed accounts"""
+    return requests.get(f"{APP_URL}/predeployed_accounts").json()
+
+
+GENESIS_CLI_ARGS = ("--seed", "42", "--accounts", "2", "--initial-balance", "100")
+
+
+@pytest.mark.restart
+@devnet_in_background(*GENESIS_CLI_ARGS)
+def test_restart_with_seed_restores_genesis():
+    """Checks that restarting with a seed restores the same accounts and balances"""
+    accounts_before = get_predeployed_accounts()
+    address = accounts_before[0]["address"]
+    mint(address, amount=10, lite=True)
+    assert get_account_balance(address) == 110
+
+    restart_time = int(time.time())
+    restart()
+
+    assert get_predeployed_accounts() == accounts_before
+    assert get_account_balance(address) == 100
+
+    genesis_block = get_block(parse=True)
+    assert genesis_block["block_hash"] == GENESIS_BLOCK_HASH
+    assert genesis_block["timestamp"] >= restart_time
+
+
+@pytest.mark.restart
+def test_genesis_cache_dir():
+    """Checks that the genesis state is cached in and reused from --genesis-cache-dir"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        accounts = []
+        for _ in range(2):
+            proc = run_devnet_in_background(
+                *GENESIS_CLI_ARGS, "--genesis-cache-dir", cache_dir
+            )
+            try:
+                assert len(os.listdir(cache_dir)) == 1
+                accounts.append(get_predeployed_accounts())
+                assert get_account_balance(accounts[-1][0]["address"]) == 100
+            finally:
+                terminate_and_wait(proc)
+
+        assert accounts[0] == accounts[1]
@@ -0,0 +1,127 @@
+"""
+Test snapshot and revert endpoints
+"""
+
+import pytest
+import requests
+
+from .account import invoke
+from .settings import APP_URL
+from .shared import (
+    ABI_PATH,
+    CONTRACT_PATH,
+    GENESIS_BLOCK_NUMBER,
+    PREDEPLOY_ACCOUNT_CLI_ARGS,
+    PREDEPLOYED_ACCOUNT_ADDRESS,
+    PREDEPLOYED_ACCOUNT_PRIVATE_KEY,
+)
+from .util import (
+    assert_transaction_not_received,
+    assert_tx_status,
+    call,
+    deploy,
+    devnet_in_background,
+    get_block,
+)
+
+
+def take_snapshot() -> int:
+    """Take a snapshot and return its id"""
+    resp = requests.post(f"{APP_URL}/snapshot")
+    assert resp.status_code == 200
+    return resp.json()["snapshot_id"]
+
+
+def revert(snapshot_id) -> requests.Response:
+    """Get revert response"""
+    return requests.post(f"{APP_URL}/revert", json={"snapshot_id": snapshot_id})
+
+
+def increase_balance(contract_address: str):
+    """Increase the balance of the contract by 30"""
+    invoke(
+        calls=[(contract_address, "increase_balance", [10, 20])],
+        account_address=PREDEPLOYED_ACCOUNT_ADDRESS,
+        private_key=PREDEPLOYED_ACCOUNT_PRIVATE_KEY,
+    )
+
+
+@pytest.mark.snapshot
+@devnet_in_background(*PREDEPLOY_ACCOUNT_CLI_ARGS)
+def test_revert_state_blocks_and_transactions():
+    """Changes made after the snapshot should be reverted"""
+    contract_address = deploy(CONTRACT_PATH, inputs=["0"])["address"]
+    block_before = get_block(parse=True)
+    snapshot_id = take_snapshot()
+
+    increase_balance(contract_address)
+    deploy_info = deploy(CONTRACT_PATH, inputs=["0"], salt="0x42")
+    assert call("get_balance", contract_address, ABI_PATH) == "30"
+
+    resp = revert(snapshot_id)
+    assert resp.status_code == 200
+
+    assert call("get_balance", contract_address, ABI_PATH) == "0"
+    assert get_block(parse=True) == block_before
+    assert_transaction_not_received(deploy_info["tx_hash"])
+
+    # the snapshot can be reverted to again
+    increase_balance(contract_address)
+    assert get_block(parse=True)["block_number"] == block_before["block_number"] + 1
+
+    revert(snapshot_id)
+    assert call("get_balance", contract_address, ABI_PATH) == "0"
+    assert get_block(parse=True) == block_before
+
+
+@pytest.mark.snapshot
+@devnet_in_background()
+def test_later_snapshots_are_discarded():
+    """Reverting should discard the snapshots taken after the reverted one"""
+    first_snapshot_id = take_snapshot()
+    deploy(CONTRACT_PATH, inputs=["0"])
+    second_snapshot_id = take_snapshot()
+    assert second_snapshot_id != first_snapshot_id
+
+    assert revert(first_snapshot_id).status_code == 200
+    assert get_block(parse=True)["block_number"] == GENESIS_BLOCK_NUMBER
+
+    resp = revert(second_snapshot_id)
+    assert resp.status_code == 400
+    assert resp.json()["message"] == f"No snapshot with id {second_snapshot_id}."
+
+
+@pytest.mark.snapshot
+@devnet_in_background()
+def test_revert_invalid_snapshot_id():
+    """Reverting to an invalid snapshot id should fail"""
+    assert revert("invalid").status_code == 400
+    assert requests.post(f"{APP_URL}/revert").status_code == 400
+
+
+@pytest.mark.snapshot
+@devnet_in_background("--blocks-on-demand")
+def test_revert_pending_block():
+    """The pending block and the status of its transactions should be reverted"""
+    deploy_info = deploy(CONTRACT_PATH, inputs=["0"])
+    snapshot_id = take_snapshot()
+
+    requests.post(f"{APP_URL}/create_block_on_demand")
+    assert_tx_status(deploy_info["tx_hash"], "ACCEPTED_ON_L2")
+
+    revert(snapshot_id)
+    assert_tx_status(deploy_info["tx_hash"], "PENDING")
+    assert (
+        get_block(block_number="latest", parse=True)["block_number"]
+        == GENESIS_BLOCK_NUMBER
+    )
+
+    pending_block = get_block(block_number="pending", parse=True)
+    assert [tx["transaction_hash"] for tx in pending_block["transactions"]] == [
+        deploy_info["tx_hash"]
+    ]
+
+    requests.post(f"{APP_URL}/create_block_on_demand")
+    block = get_block(block_number="latest", parse=True)
+    assert block["block_number"] == GENESIS_BLOCK_NUMBER + 1
+    assert block["transactions"] == pending_block["transactions"]
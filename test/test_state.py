@@ -0,0 +1,30 @@
+"""
+Test the global state
+"""
+
+import subprocess
+import sys
+
+from starknet_devnet.state import State
+
+IMPORT_SCRIPT = """
+from unittest.mock import patch
+
+from starknet_devnet.starknet_wrapper import StarknetWrapper
+
+with patch.object(StarknetWrapper, "__init__", side_effect=AssertionError):
+    import starknet_devnet.server
+"""
+
+
+def test_import_creates_no_starknet_wrapper():
+    """Importing the server should not create a starknet wrapper"""
+    subprocess.run([sys.executable, "-c", IMPORT_SCRIPT], check=True)
+
+
+def test_default_starknet_wrapper_created_on_first_use():
+    """The state should create a starknet wrapper of the default config when first used"""
+    state = State()
+    assert state.starknet_wrapper.config.accounts == 0
+    assert state.dumper is not None
+    assert state.starknet_wrapper is state.starknet_wrapper
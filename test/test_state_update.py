@@ -27,6 +27,7 @@ from .util import (
     assert_equal,
     assert_hex_equal,
     assert_transaction,
+    assert_tx_status,
     deploy,
     devnet_in_background,
     get_block,
@@ -238,3 +239,18 @@ def test_declaration_and_deployment():
 
     # deployer expected to be declared
     assert diff_after_deploy["declared_contracts"] == [deployer_class_hash]
+
+
+@pytest.mark.state_update
+@devnet_in_background()
+def test_rejected_deployment_declares_nothing():
+    """The class of a rejected deployment should not be reported as declared later"""
+    # the constructor of the contract expects calldata
+    rejected_deploy_info = deploy(CONTRACT_PATH)
+    assert_tx_status(rejected_deploy_info["tx_hash"], "REJECTED")
+
+    deploy_empty_contract()
+    storage_class_hash = hex(get_class_hash_at_path(STORAGE_CONTRACT_PATH))
+
+    diff_after_deploy = get_state_update()["state_diff"]
+    assert diff_after_deploy["declared_contracts"] == [storage_class_hash]
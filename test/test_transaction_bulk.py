@@ -0,0 +1,130 @@
+"""
+Test adding transactions in bulk
+"""
+
+from unittest.mock import patch
+
+import pytest
+import requests
+from starkware.starknet.definitions.error_codes import StarknetErrorCode
+from starkware.starknet.definitions.transaction_type import TransactionType
+from starkware.starknet.services.api.gateway.transaction import Deploy
+
+from starknet_devnet.constants import SUPPORTED_TX_VERSION
+from starknet_devnet.server import app
+from starknet_devnet.starknet_wrapper import StarknetWrapper
+from starknet_devnet.util import StarknetDevnetException
+
+from .settings import APP_URL
+from .shared import GENESIS_BLOCK_NUMBER, STORAGE_CONTRACT_PATH
+from .util import devnet_in_background, get_block, load_contract_class
+
+N_TRANSACTIONS = 3
+
+
+def _get_deploy_tx_dicts():
+    contract_class = load_contract_class(STORAGE_CONTRACT_PATH)
+    return [
+        {
+            **Deploy(
+                contract_address_salt=salt,
+                contract_definition=contract_class,
+                constructor_calldata=[],
+                version=SUPPORTED_TX_VERSION,
+            ).dump(),
+            "type": TransactionType.DEPLOY.name,
+        }
+        for salt in range(N_TRANSACTIONS)
+    ]
+
+
+def _add_transaction_bulk(tx_dicts) -> requests.Response:
+    return requests.post(f"{APP_URL}/gateway/add_transaction_bulk", json=tx_dicts)
+
+
+def _get_latest_block_number() -> int:
+    resp = requests.get(
+        f"{APP_URL}/feeder_gateway/get_block", params={"blockNumber": "latest"}
+    )
+    return resp.json()["block_number"]
+
+
+@pytest.mark.transaction_bulk
+@devnet_in_background()
+def test_add_transaction_bulk():
+    """Transactions added in bulk should be stored in a single block"""
+    resp = _add_transaction_bulk(_get_deploy_tx_dicts())
+    assert resp.status_code == 200
+
+    response_list = resp.json()
+    assert len(response_list) == N_TRANSACTIONS
+    for response_dict in response_list:
+        assert response_dict["code"] == "TRANSACTION_RECEIVED"
+        assert response_dict["status"] == "ACCEPTED_ON_L2"
+
+    block = get_block(parse=True)
+    assert block["block_number"] == GENESIS_BLOCK_NUMBER + 1
+    assert [tx["transaction_hash"] for tx in block["transactions"]] == [
+        response_dict["transaction_hash"] for response_dict in response_list
+    ]
+
+    state_update = requests.get(f"{APP_URL}/feeder_gateway/get_state_update").json()
+    assert len(state_update["state_diff"]["deployed_contracts"]) == N_TRANSACTIONS
+
+
+@pytest.mark.transaction_bulk
+@devnet_in_background("--blocks-on-demand")
+def test_add_transaction_bulk_on_demand():
+    """Transactions added in bulk should be pending if blocks are created on demand"""
+    response_list = _add_transaction_bulk(_get_deploy_tx_dicts()).json()
+    for response_dict in response_list:
+        assert response_dict["status"] == "PENDING"
+
+    assert _get_latest_block_number() == GENESIS_BLOCK_NUMBER
+
+
+@pytest.mark.transaction_bulk
+@devnet_in_background()
+def test_add_invalid_transaction_bulk():
+    """No transaction should be executed if any of them is invalid"""
+    tx_dicts = _get_deploy_tx_dicts()
+    tx_dicts[-1]["constructor_calldata"] = "invalid"
+
+    resp = _add_transaction_bulk(tx_dicts)
+    assert resp.status_code == 400
+    assert _get_latest_block_number() == GENESIS_BLOCK_NUMBER
+
+    resp = requests.post(
+        f"{APP_URL}/gateway/add_transaction_bulk", json=_get_deploy_tx_dicts()[0]
+    )
+    assert resp.status_code == 400
+
+
+@pytest.mark.transaction_bulk
+def test_add_transaction_bulk_with_failing_transaction():
+    """A transaction failing in a bulk should be answered with its error, the others committed"""
+    error = StarknetDevnetException(
+        code=StarknetErrorCode.OUT_OF_RANGE_FEE, message="Fee out of range."
+    )
+    original_deploy = StarknetWrapper.deploy
+
+    async def deploy(starknet_wrapper, deploy_transaction):
+        if deploy_transaction.contract_address_salt == 1:
+            raise error
+        return await original_deploy(starknet_wrapper, deploy_transaction)
+
+    client = app.test_client()
+    with patch.object(StarknetWrapper, "deploy", deploy):
+        resp = client.post("/gateway/add_transaction_bulk", json=_get_deploy_tx_dicts())
+    assert resp.status_code == 200
+
+    response_list = resp.json
+    assert response_list[1] == {"code": str(error.code), "message": error.message}
+    for response_dict in [response_list[0], response_list[2]]:
+        assert response_dict["status"] == "ACCEPTED_ON_L2"
+
+    block = client.get("/feeder_gateway/get_block").json
+    assert [tx["transaction_hash"] for tx in block["transactions"]] == [
+        response_list[0]["transaction_hash"],
+        response_list[2]["transaction_hash"],
+    ]
@@ -0,0 +1,44 @@
+"""
+Test compacting the execution info of final transactions
+"""
+
+import pickle
+
+import pytest
+
+from starknet_devnet.devnet_config import DevnetConfig, parse_args
+from starknet_devnet.starknet_wrapper import StarknetWrapper
+
+from .test_deploy import get_deploy_transaction
+
+
+async def _deploy(*args: str):
+    devnet = StarknetWrapper(config=DevnetConfig(parse_args(args)))
+    await devnet.initialize()
+    _, tx_hash = await devnet.deploy(deploy_transaction=get_deploy_transaction([0]))
+    return devnet.transactions.get_devnet_transaction(tx_hash)
+
+
+def _dump_receipt(transaction) -> dict:
+    receipt = transaction.get_receipt().dump()
+    # the timestamps, and so the hashes, of the blocks of different devnets differ
+    del receipt["block_hash"]
+    return receipt
+
+
+@pytest.mark.asyncio
+async def test_accepted_transaction_compacted():
+    """The details of a compacted transaction should equal those derived from its execution info"""
+    kept = await _deploy("--keep-execution-info")
+    assert not kept.is_compact()
+
+    compacted = await _deploy()
+    assert compacted.is_compact()
+    assert _dump_receipt(compacted) == _dump_receipt(kept)
+    assert compacted.get_trace() == kept.get_trace()
+    assert compacted.get_execution() == kept.get_execution()
+
+    unpickled = pickle.loads(pickle.dumps(compacted))
+    assert unpickled.is_compact()
+    assert _dump_receipt(unpickled) == _dump_receipt(kept)
+    assert len(pickle.dumps(compacted)) < len(pickle.dumps(kept))